@@ -0,0 +1,4 @@
+"""
+Performance benchmarks of the VRPLIB parsers, distance computations and
+writers. Run ``python -m benchmarks --help`` for usage.
+"""
@@ -0,0 +1,215 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from . import cases
+from .measure import measure_case
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks the VRPLIB parsers, distances and writers.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument(
+        "-o", "--output", type=Path, help="Write the results to this file."
+    )
+    run_parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="Only run the cases whose name matches this regular expression.",
+    )
+    run_parser.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=cases.DEFAULT_SIZES,
+        help="Comma-separated sizes of the synthetic instances.",
+    )
+    run_parser.add_argument(
+        "--max-matrix-size",
+        type=int,
+        default=cases.DEFAULT_MAX_MATRIX_SIZE,
+        help="Largest size of cases that produce a dense distance matrix.",
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=5, help="Maximum number of timed runs."
+    )
+    run_parser.add_argument(
+        "--max-time",
+        type=float,
+        default=1.0,
+        help="Stop repeating a case once its total time exceeds this.",
+    )
+    run_parser.add_argument(
+        "--list", action="store_true", help="Only list the selected cases."
+    )
+    run_parser.add_argument(
+        "--baseline", type=Path, help="Compare the results to this file."
+    )
+    _add_threshold_arguments(run_parser)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare results to a baseline."
+    )
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    _add_threshold_arguments(compare_parser)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+        return compare(baseline, current, args)
+
+    names = [
+        name
+        for name in {
+            **cases.corpus_cases(),
+            **cases.synthetic_cases(args.sizes, args.max_matrix_size),
+        }
+        if re.search(args.filter, name)
+    ]
+
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = run(names, args)
+    text = json.dumps(results, indent=2)
+
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        return compare(baseline, results, args)
+
+    return 0
+
+
+def run(names: list[str], args: argparse.Namespace) -> dict[str, Any]:
+    """
+    Runs the given cases, each in a fresh process, and returns the results
+    together with metadata about the environment.
+    """
+    results = {}
+    context = multiprocessing.get_context("spawn")
+
+    for name in names:
+        print(f"Running {name}", file=sys.stderr)
+
+        # A new process per case, so that the peak RSS of one case does not
+        # carry over to the next one.
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            future = pool.submit(
+                measure_case,
+                name,
+                args.sizes,
+                args.max_matrix_size,
+                args.repeat,
+                args.max_time,
+            )
+            results[name] = future.result()
+
+    return {"metadata": _metadata(), "results": results}
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    args: argparse.Namespace,
+) -> int:
+    """
+    Prints the ratio of the current to the baseline minimum wall time and
+    peak allocated memory of each case in both results. Returns 1 if any of
+    these ratios exceeds its threshold, and 0 otherwise. Wall time increases
+    smaller than the minimum time difference are ignored as noise.
+    """
+    regressions = 0
+    print(f"{'case':<60} {'time':>8} {'memory':>8}")
+
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        base = baseline["results"][name]
+        time = result["time_min"] / max(base["time_min"], 1e-9)
+        memory = result["peak_alloc"] / max(base["peak_alloc"], 1)
+        delta = result["time_min"] - base["time_min"]
+        flag = ""
+
+        slower = time > args.time_ratio and delta > args.min_time_delta
+        if slower or memory > args.memory_ratio:
+            regressions += 1
+            flag = "  REGRESSION"
+
+        print(f"{name:<60} {time:>8.2f} {memory:>8.2f}{flag}")
+
+    print(f"{regressions} regression(s) found.")
+    return int(regressions > 0)
+
+
+def _add_threshold_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--time-ratio",
+        type=float,
+        default=1.25,
+        help="Maximum allowed ratio of current to baseline wall time.",
+    )
+    parser.add_argument(
+        "--memory-ratio",
+        type=float,
+        default=1.1,
+        help="Maximum allowed ratio of current to baseline allocations.",
+    )
+    parser.add_argument(
+        "--min-time-delta",
+        type=float,
+        default=1e-3,
+        help="Minimum wall time increase in seconds to count as regression.",
+    )
+
+
+def _sizes(text: str) -> tuple[int, ...]:
+    return tuple(int(size) for size in text.split(","))
+
+
+def _metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
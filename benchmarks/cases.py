@@ -0,0 +1,221 @@
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from vrplib.evaluate import evaluate_solutions
+from vrplib.parse import parse_solomon, parse_solution, parse_vrplib
+from vrplib.parse.distances import edge_weight_types, nearest_neighbours
+from vrplib.parse.parse_distances import EXPLICIT_FORMATS, parse_distances
+from vrplib.read.read_instances import detect_format
+from vrplib.write import write_instance, write_solution
+
+from . import instances
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "tests" / "data"
+
+# Writer cases write to this file in the given output directory.
+OUTPUT_FILE = "output.txt"
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 50_000)
+
+# Cases that produce a dense n-by-n edge weight matrix are only run up to
+# this size by default, since a 50k-by-50k float64 matrix takes 20GB.
+DEFAULT_MAX_MATRIX_SIZE = 10_000
+
+# A case maps to a function that prepares the inputs, which is not measured,
+# and returns the function that is measured.
+Case = Callable[[], Callable[[], Any]]
+
+
+def corpus_cases() -> dict[str, Case]:
+    """
+    Returns the parse cases of the instance and solution files in the
+    bundled test data.
+    """
+    cases: dict[str, Case] = {}
+
+    for path in sorted(DATA_DIR.rglob("*")):
+        if not path.is_file():
+            continue
+
+        name = path.relative_to(DATA_DIR).as_posix()
+
+        if path.suffix == ".sol":
+            cases[f"parse_solution[{name}]"] = _text_case(parse_solution, path)
+        elif detect_format(path) == "solomon":
+            cases[f"parse_solomon[{name}]"] = _text_case(parse_solomon, path)
+        elif name != "NoColonSpecification.txt":  # invalid instance
+            cases[f"parse_vrplib[{name}]"] = _text_case(parse_vrplib, path)
+
+    return cases
+
+
+def synthetic_cases(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    max_matrix_size: int = DEFAULT_MAX_MATRIX_SIZE,
+    output_dir: Path = Path(tempfile.gettempdir()),
+) -> dict[str, Case]:
+    """
+    Returns the cases on synthetic instances of the given sizes. Writer cases
+    write to a file in the given output directory, which defaults to the
+    temporary directory of the system.
+    """
+    output_path = output_dir / OUTPUT_FILE
+    cases: dict[str, Case] = {}
+
+    for n in sizes:
+        dense = n <= max_matrix_size
+
+        cases[f"parse_vrplib[n={n}]"] = _synthetic_parse(
+            parse_vrplib, instances.vrplib_text, n, compute_edge_weights=False
+        )
+        if dense:
+            cases[f"parse_vrplib[n={n},edge_weights]"] = _synthetic_parse(
+                parse_vrplib, instances.vrplib_text, n
+            )
+
+        cases[f"parse_vrplib[n={n},neighbours]"] = _synthetic_parse(
+            parse_vrplib, instances.vrplib_text, n, neighbours=10
+        )
+
+        key = f"nearest_neighbours[outlier,n={n}]"
+        cases[key] = _outlier_neighbours_case(n)
+
+        cases[f"parse_solomon[n={n}]"] = _synthetic_parse(
+            parse_solomon,
+            instances.solomon_text,
+            n,
+            compute_edge_weights=False,
+        )
+        cases[f"parse_solution[n={n}]"] = _synthetic_parse(
+            parse_solution, instances.solution_text, n
+        )
+
+        for ew_type in edge_weight_types():
+            cases[f"parse_distances[{ew_type},lazy,n={n}]"] = _lazy_case(
+                ew_type, n
+            )
+            if dense:
+                cases[f"parse_distances[{ew_type},n={n}]"] = _coordinate_case(
+                    ew_type, n
+                )
+
+        if dense:
+            for fmt in EXPLICIT_FORMATS:
+                key = f"parse_distances[EXPLICIT,{fmt},n={n}]"
+                cases[key] = _explicit_case(fmt, n)
+
+        cases[f"evaluate_solutions[n={n}]"] = _evaluate_case(n)
+
+        cases[f"write_instance[n={n}]"] = _write_instance_case(
+            n, False, output_path
+        )
+        if dense:
+            key = f"write_instance[n={n},edge_weights]"
+            cases[key] = _write_instance_case(n, True, output_path)
+
+        cases[f"write_solution[n={n}]"] = _write_solution_case(n, output_path)
+
+    return cases
+
+
+def _text_case(parse: Callable, path: Path) -> Case:
+    def setup():
+        text = path.read_text()
+        return lambda: parse(text)
+
+    return setup
+
+
+def _synthetic_parse(
+    parse: Callable, make_text: Callable[[int], str], n: int, **kwargs
+) -> Case:
+    def setup():
+        text = make_text(n)
+        return lambda: parse(text, **kwargs)
+
+    return setup
+
+
+def _coordinate_case(edge_weight_type: str, n: int) -> Case:
+    def setup():
+        coords = instances.node_coord(n)
+        return lambda: parse_distances([], edge_weight_type, node_coord=coords)
+
+    return setup
+
+
+def _outlier_neighbours_case(n: int) -> Case:
+    def setup():
+        coords = instances.node_coord(n)
+        coords[-1] = 10**9  # one far away location
+        return lambda: nearest_neighbours(coords, 10)
+
+    return setup
+
+
+def _lazy_case(edge_weight_type: str, n: int) -> Case:
+    def setup():
+        coords = instances.node_coord(n)
+        rows = np.random.default_rng(instances.SEED).integers(n, size=10)
+
+        def run():
+            weights = parse_distances(
+                [], edge_weight_type, node_coord=coords, lazy=True
+            )
+            return [weights[row] for row in rows]  # type: ignore
+
+        return run
+
+    return setup
+
+
+def _explicit_case(edge_weight_format: str, n: int) -> Case:
+    def setup():
+        data = instances.explicit_data(n, edge_weight_format)
+        return lambda: parse_distances(
+            data,  # type: ignore
+            "EXPLICIT",
+            edge_weight_format,
+        )
+
+    return setup
+
+
+def _write_instance_case(n: int, edge_weights: bool, path: Path) -> Case:
+    def setup():
+        text = instances.vrplib_text(n)
+        instance = parse_vrplib(text, compute_edge_weights=edge_weights)
+        data = {}
+
+        for key, value in instance.items():
+            if isinstance(value, np.ndarray):
+                data[f"{key.upper()}_SECTION"] = value
+            else:
+                data[key.upper()] = value
+
+        return lambda: write_instance(path, data)
+
+    return setup
+
+
+def _evaluate_case(n: int, num_solutions: int = 100) -> Case:
+    def setup():
+        text = instances.solomon_text(n)
+        instance = parse_solomon(text, lazy_edge_weights=True)
+        solutions = [
+            instances.routes(n, seed) for seed in range(num_solutions)
+        ]
+        return lambda: evaluate_solutions(instance, solutions)
+
+    return setup
+
+
+def _write_solution_case(n: int, path: Path) -> Case:
+    def setup():
+        routes = instances.routes(n)
+        return lambda: write_solution(path, routes, {"Cost": 12345})
+
+    return setup
@@ -0,0 +1,126 @@
+import numpy as np
+
+from vrplib.parse.parse_distances import ROW_FORMATS
+
+# Fixed seed so that the synthetic instances are identical between runs.
+SEED = 42
+
+
+def vrplib_text(n: int, seed: int = SEED) -> str:
+    """
+    Returns the text of a synthetic CVRP instance in VRPLIB format with n
+    locations, of which the first is the depot.
+    """
+    rng = np.random.default_rng(seed)
+    coords = rng.integers(0, 10_000, size=(n, 2))
+    demands = rng.integers(1, 100, size=n)
+    demands[0] = 0
+
+    lines = [
+        f"NAME : Synthetic-n{n}",
+        "COMMENT : Generated for benchmarking",
+        "TYPE : CVRP",
+        f"DIMENSION : {n}",
+        "EDGE_WEIGHT_TYPE : EUC_2D",
+        "CAPACITY : 1000",
+        "NODE_COORD_SECTION",
+        *(f"{idx}\t{x}\t{y}" for idx, (x, y) in enumerate(coords, 1)),
+        "DEMAND_SECTION",
+        *(f"{idx}\t{dem}" for idx, dem in enumerate(demands, 1)),
+        "DEPOT_SECTION",
+        "1",
+        "-1",
+        "EOF",
+    ]
+
+    return "\n".join(lines) + "\n"
+
+
+def solomon_text(n: int, seed: int = SEED) -> str:
+    """
+    Returns the text of a synthetic VRPTW instance in Solomon format with n
+    locations, of which the first is the depot.
+    """
+    rng = np.random.default_rng(seed)
+    coords = rng.integers(0, 100, size=(n, 2))
+    demands = rng.integers(1, 50, size=n)
+    ready = rng.integers(0, 1000, size=n)
+    due = ready + rng.integers(10, 200, size=n)
+
+    header = [
+        f"Synthetic-n{n}",
+        "",
+        "VEHICLE",
+        "NUMBER     CAPACITY",
+        f"  {max(n // 10, 1)}         200",
+        "",
+        "CUSTOMER",
+        "CUST NO.  XCOORD.   YCOORD.    DEMAND   READY TIME  DUE DATE   "
+        "SERVICE   TIME",
+        "",
+    ]
+    rows = [
+        f"{idx:5d} {x:8d} {y:8d} {dem:8d} {rt:8d} {dd:8d} {10:8d}"
+        for idx, (x, y, dem, rt, dd) in enumerate(
+            zip(*coords.T, demands, ready, due)
+        )
+    ]
+
+    return "\n".join(header + rows) + "\n"
+
+
+def routes(n: int, seed: int = SEED) -> list[list[int]]:
+    """
+    Returns a synthetic solution that visits the n - 1 clients in routes of
+    at most 10 clients.
+    """
+    rng = np.random.default_rng(seed)
+    clients = rng.permutation(np.arange(1, n)).tolist()
+    return [clients[idx : idx + 10] for idx in range(0, len(clients), 10)]
+
+
+def solution_text(n: int, seed: int = SEED) -> str:
+    """
+    Returns the text of a synthetic solution file for n locations.
+    """
+    lines = [
+        f"Route #{idx}: " + " ".join(map(str, route))
+        for idx, route in enumerate(routes(n, seed), 1)
+    ]
+    return "\n".join([*lines, "Cost 12345"]) + "\n"
+
+
+def node_coord(n: int, seed: int = SEED) -> np.ndarray:
+    """
+    Returns n random node coordinates.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 10_000, size=(n, 2)).astype(np.float64)
+
+
+def explicit_data(n: int, fmt: str, seed: int = SEED) -> list | np.ndarray:
+    """
+    Returns the edge weight data of a symmetric n-by-n matrix in the given
+    explicit edge weight format, laid out in rows as they are parsed from an
+    edge weight section.
+    """
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(0, 1000, size=(n, n), dtype=np.int32)
+    matrix = np.triu(matrix, 1) + np.triu(matrix, 1).T
+
+    if fmt == "FULL_MATRIX":
+        return matrix
+
+    # Column formats of symmetric matrices have the same layout as the
+    # corresponding row formats.
+    row_fmt = ROW_FORMATS[fmt]
+    if row_fmt == "LOWER_ROW":
+        rows = [matrix[idx, :idx] for idx in range(n)]
+    elif row_fmt == "LOWER_DIAG_ROW":
+        rows = [matrix[idx, : idx + 1] for idx in range(n)]
+    elif row_fmt == "UPPER_ROW":
+        rows = [matrix[idx, idx + 1 :] for idx in range(n)]
+    else:
+        rows = [matrix[idx, idx:] for idx in range(n)]
+
+    return [row for row in rows if len(row) > 0]
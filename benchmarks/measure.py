@@ -0,0 +1,97 @@
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from . import cases
+
+
+def measure_case(
+    name: str,
+    sizes: tuple[int, ...],
+    max_matrix_size: int,
+    repeat: int,
+    max_time: float,
+) -> dict[str, Any]:
+    """
+    Measures the given case. Meant to be run in a fresh process, so that the
+    peak RSS is not affected by earlier cases.
+
+    The measured function is run once to measure the peak RSS, then up to
+    ``repeat`` times to measure the wall time, stopping early once the total
+    time exceeds ``max_time`` seconds, and once more with tracemalloc to
+    measure the peak size of the allocated memory.
+
+    Returns
+    -------
+    dict[str, Any]
+        The minimum and median wall time and the number of timed runs, the
+        peak RSS of the process in bytes (including the inputs and the
+        interpreter itself), and the peak allocated memory in bytes.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        registry = {
+            **cases.corpus_cases(),
+            **cases.synthetic_cases(sizes, max_matrix_size, Path(tmp_dir)),
+        }
+        return _measure(registry[name](), repeat, max_time)
+
+
+def _measure(run, repeat: int, max_time: float) -> dict[str, Any]:
+    _reset_peak_rss()
+    run()
+    peak_rss = _peak_rss()
+
+    times: list[float] = []
+    while len(times) < repeat and (not times or sum(times) < max_time):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "time_min": min(times),
+        "time_median": statistics.median(times),
+        "runs": len(times),
+        "peak_rss": peak_rss,
+        "peak_alloc": peak_alloc,
+    }
+
+
+def _reset_peak_rss():
+    """
+    Resets the peak RSS of this process, which is only supported on Linux.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss() -> int | None:
+    """
+    Returns the peak RSS of this process in bytes, or None if unsupported.
+    """
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:  # e.g., on Windows
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
@@ -0,0 +1,129 @@
+import os
+import shutil
+from pathlib import Path
+
+from numpy.testing import assert_, assert_equal, assert_raises
+from pytest import fixture
+
+from vrplib import Catalogue, read_solution
+
+DATA_DIR = Path("tests/data/")
+
+
+@fixture
+def root(tmp_path):
+    """
+    A directory tree with a few instances and solutions.
+    """
+    for name in ["X-n101-k25.vrp", "X-n101-k25.sol", "E-n13-k4.vrp"]:
+        shutil.copy(DATA_DIR / name, tmp_path)
+
+    (tmp_path / "solomon").mkdir()
+    for name in ["C101.txt", "C101.sol"]:
+        shutil.copy(DATA_DIR / name, tmp_path / "solomon")
+
+    return tmp_path
+
+
+def test_catalogue_records(root):
+    """
+    Tests that the catalogue records the specifications, section shapes,
+    statistics and solution cost of each instance.
+    """
+    with Catalogue(root) as catalogue:
+        counts = catalogue.refresh()
+        assert_equal(counts["added"], 3)
+        assert_equal(len(catalogue), 3)
+
+        records = {Path(rec["path"]).name: rec for rec in catalogue}
+        assert_equal(
+            sorted(records), ["C101.txt", "E-n13-k4.vrp", "X-n101-k25.vrp"]
+        )
+
+    x = records["X-n101-k25.vrp"]
+    assert_equal(x["format"], "vrplib")
+    assert_equal(x["specifications"]["dimension"], 101)
+    assert_equal(x["specifications"]["edge_weight_type"], "EUC_2D")
+    assert_equal(x["shapes"]["node_coord"], [101, 2])
+    assert_equal(x["stats"]["num_clients"], 100)
+    assert_equal(x["cost"], read_solution(DATA_DIR / "X-n101-k25.sol")["cost"])
+    assert_equal(x["solution_path"], str(root / "X-n101-k25.sol"))
+    assert_(x["error"] is None)
+
+    e = records["E-n13-k4.vrp"]
+    assert_equal(e["shapes"]["edge_weight"], [13, 13])
+    assert_(e["cost"] is None)
+    assert_(e["solution_path"] is None)
+
+    c = records["C101.txt"]
+    assert_equal(c["format"], "solomon")
+    assert_equal(
+        c["specifications"], {"name": "C101", "vehicles": 25, "capacity": 200}
+    )
+    assert_(c["stats"]["has_time_windows"])
+
+
+def test_catalogue_query(root):
+    """
+    Tests queries on specifications, statistics and record fields.
+    """
+    catalogue = Catalogue(root)
+    catalogue.refresh()
+
+    def names(**filters):
+        return [Path(rec["path"]).name for rec in catalogue.query(**filters)]
+
+    assert_equal(names(type="CVRP"), ["E-n13-k4.vrp", "X-n101-k25.vrp"])
+    assert_equal(names(dimension=(50, 200)), ["X-n101-k25.vrp"])
+    assert_equal(names(dimension=(None, 50)), ["E-n13-k4.vrp"])
+    assert_equal(names(edge_weight_type=["EXPLICIT", "GEO"]), ["E-n13-k4.vrp"])
+    assert_equal(names(has_time_windows=True), ["C101.txt"])
+    assert_equal(names(num_clients=100), ["X-n101-k25.vrp", "C101.txt"])
+    assert_equal(names(cost=None), ["E-n13-k4.vrp"])
+    assert_equal(names(format="solomon", cost=(800, 900)), ["C101.txt"])
+
+    with assert_raises(ValueError):
+        catalogue.query(**{"type') OR 1=1 --": "CVRP"})
+
+
+def test_catalogue_persists(root, tmp_path_factory):
+    """
+    Tests that the index is stored on disk and reused by a new catalogue.
+    """
+    path = tmp_path_factory.mktemp("store") / "catalogue.sqlite"
+
+    with Catalogue(root, path) as catalogue:
+        catalogue.refresh()
+
+    with Catalogue(root, path) as catalogue:
+        assert_equal(len(catalogue), 3)
+        assert_equal(catalogue.refresh()["unchanged"], 3)
+
+
+def test_catalogue_incremental_refresh(root):
+    """
+    Tests that refresh only re-indexes changed files, and removes deleted
+    files from the index.
+    """
+    catalogue = Catalogue(root)
+    catalogue.refresh()
+
+    # Changes the cost of the solution, and deletes an instance.
+    sol_path = root / "solomon" / "C101.sol"
+    sol_path.write_text(sol_path.read_text().replace("827.3", "800"))
+    os.utime(sol_path, ns=(0, 10**9))
+    (root / "E-n13-k4.vrp").unlink()
+
+    counts = catalogue.refresh()
+    assert_equal(
+        counts, {"added": 0, "updated": 1, "removed": 1, "unchanged": 1}
+    )
+    assert_equal(catalogue.query(name="C101")[0]["cost"], 800)
+
+    # Invalid instances are indexed with their error, and not read again.
+    (root / "invalid.txt").write_text("invalid")
+    catalogue.refresh()
+
+    record = catalogue.query(error=("", None))[0]
+    assert_equal(Path(record["path"]).name, "invalid.txt")
+    assert_equal(catalogue.refresh()["unchanged"], 3)
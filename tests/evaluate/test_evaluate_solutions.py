@@ -0,0 +1,158 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+from numpy.testing import assert_, assert_almost_equal, assert_equal
+from pytest import mark, raises
+
+from vrplib import (
+    evaluate_solution,
+    evaluate_solutions,
+    read_instance,
+    read_solution,
+)
+from vrplib.parse import CompactRoutes
+
+DATA_DIR = Path("tests/data/")
+
+
+@mark.parametrize(
+    "name", ["X-n101-k25", "ORTEC-n242-k12", "P-n16-k8", "E-n13-k4"]
+)
+def test_evaluate_solution_cost(name):
+    """
+    Tests that the evaluated cost of the reference solutions equals the
+    reported cost, with distances rounded to the nearest integer as is the
+    convention for these benchmark sets.
+    """
+    instance = read_instance(DATA_DIR / f"{name}.vrp")
+    instance["edge_weight"] = np.round(instance["edge_weight"])
+    solution = read_solution(DATA_DIR / f"{name}.sol")
+
+    result = evaluate_solution(instance, solution)
+
+    assert_almost_equal(result["cost"], solution["cost"])
+    assert_equal(result["distance"].sum(), result["cost"])
+    assert_equal(len(result["distance"]), len(solution["routes"]))
+    assert_(result["feasible"])
+    assert_(result["complete"])
+
+
+def test_evaluate_solomon_solution():
+    """
+    Tests that the reference solution of a Solomon instance is feasible
+    with respect to the capacity and time windows, and that its cost equals
+    the reported cost when distances are truncated to one decimal.
+    """
+    instance = read_instance(DATA_DIR / "C101.txt", "solomon")
+    instance["edge_weight"] = np.floor(10 * instance["edge_weight"]) / 10
+    solution = read_solution(DATA_DIR / "C101.sol")
+
+    result = evaluate_solution(instance, solution)
+
+    assert_almost_equal(result["cost"], solution["cost"])
+    assert_(result["feasible"])
+    assert_(result["complete"])
+    assert_(np.all(result["load"] <= instance["capacity"]))
+    assert_(np.all(result["duration"] <= instance["time_window"][0, 1]))
+
+
+def test_evaluate_solution_statistics():
+    """
+    Tests the per-route statistics on a small instance, including excess
+    load, waiting and time window violations.
+    """
+    instance = {
+        "capacity": 10,
+        "edge_weight": np.array([[0, 2, 3], [2, 0, 4], [3, 4, 0]]),
+        "depot": np.array([0]),
+        "demand": np.array([0, 6, 7]),
+        "time_window": np.array([[0, 20], [5, 6], [0, 3]]),
+        "service_time": np.array([0, 1, 1]),
+    }
+
+    # Route 1 waits until 5 at location 1, and returns at 5 + 1 + 2 = 8.
+    # Route 2 visits location 1 at 5 as well, but then reaches location 2
+    # at 5 + 1 + 4 = 10, which is 7 after its time window closes. It
+    # returns at 10 + 1 + 3 = 14 with an excess load of 6 + 7 - 10 = 3.
+    result = evaluate_solution(instance, [[1], [1, 2]])
+
+    assert_equal(result["distance"], [4, 9])
+    assert_equal(result["load"], [6, 13])
+    assert_equal(result["excess_load"], [0, 3])
+    assert_equal(result["duration"], [8, 14])
+    assert_equal(result["tw_violation"], [0, 7])
+    assert_equal(result["cost"], 13)
+    assert_(not result["feasible"])
+    assert_(not result["complete"])  # location 1 is visited twice
+
+
+def test_evaluate_solution_without_edge_weights():
+    """
+    Tests that edge weights are computed from the node coordinates if the
+    instance has no (dense) edge weights.
+    """
+    path = DATA_DIR / "X-n101-k25.vrp"
+    solution = read_solution(DATA_DIR / "X-n101-k25.sol")
+    desired = evaluate_solution(read_instance(path), solution)
+
+    lazy = read_instance(path, lazy_edge_weights=True)
+    assert_almost_equal(
+        evaluate_solution(lazy, solution)["cost"], desired["cost"]
+    )
+
+    coords = read_instance(path, compute_edge_weights=False)
+    assert_almost_equal(
+        evaluate_solution(coords, solution)["distance"], desired["distance"]
+    )
+
+
+def test_evaluate_solutions(tmp_path):
+    """
+    Tests that evaluating solutions in a batch gives the same results as
+    evaluating them one by one, also when read from a directory.
+    """
+    instance = read_instance(DATA_DIR / "C101.txt", "solomon")
+    solution = read_solution(DATA_DIR / "C101.sol")
+    routes = solution["routes"]
+
+    solutions = [
+        solution,
+        routes[:3],  # incomplete
+        CompactRoutes.from_routes(routes[::-1]),
+        [],
+    ]
+    results = evaluate_solutions(instance, solutions)
+
+    assert_equal(len(results), len(solutions))
+    for result, sol in zip(results, solutions):
+        assert_equal(result, evaluate_solution(instance, sol))
+
+    assert_equal([result["complete"] for result in results], [1, 0, 1, 0])
+    assert_almost_equal(results[2]["cost"], results[0]["cost"])
+    assert_equal(results[3]["cost"], 0)
+
+    shutil.copy(DATA_DIR / "C101.sol", tmp_path / "a.sol")
+    shutil.copy(DATA_DIR / "C101.sol", tmp_path / "b.sol")
+    from_files = evaluate_solutions(instance, tmp_path / "*.sol")
+
+    assert_equal(len(from_files), 2)
+    assert_equal(from_files[0]["path"], str(tmp_path / "a.sol"))
+    assert_almost_equal(from_files[1]["cost"], results[0]["cost"])
+
+    # Recursive patterns match the solutions in all subdirectories.
+    (tmp_path / "sub").mkdir()
+    shutil.copy(DATA_DIR / "C101.sol", tmp_path / "sub" / "c.sol")
+    recursive = evaluate_solutions(instance, tmp_path / "**" / "*.sol")
+    assert_equal(len(recursive), 3)
+
+
+def test_evaluate_solution_raises_unknown_locations():
+    """
+    Tests that an error is raised if a route visits a location that is not
+    in the instance.
+    """
+    instance = read_instance(DATA_DIR / "E-n13-k4.vrp")
+
+    with raises(ValueError):
+        evaluate_solution(instance, [[1, 13]])
@@ -0,0 +1,207 @@
+import math
+
+import numpy as np
+import pytest
+from numpy.testing import (
+    assert_,
+    assert_almost_equal,
+    assert_equal,
+    assert_raises,
+)
+
+from vrplib.parse import parse_vrplib
+from vrplib.parse.distances import (
+    LazyEdgeWeight,
+    edge_weight_dtype,
+    edge_weight_types,
+    get_kernel,
+    pairwise,
+    register_edge_weight_type,
+)
+from vrplib.parse.parse_distances import pairwise_distances
+
+
+@pytest.fixture
+def coords():
+    return np.random.default_rng(1).uniform(-90, 90, size=(30, 2))
+
+
+def _geo(coord_from, coord_to) -> float:
+    """
+    Reference implementation of TSPLIB's GEO distance.
+    """
+
+    def radians(value):
+        degrees = int(value)
+        return 3.141592 * (degrees + 5.0 * (value - degrees) / 3.0) / 180.0
+
+    lat_i, lon_i = map(radians, coord_from)
+    lat_j, lon_j = map(radians, coord_to)
+    q1 = math.cos(lon_i - lon_j)
+    q2 = math.cos(lat_i - lat_j)
+    q3 = math.cos(lat_i + lat_j)
+    arg = 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)
+    return int(6378.388 * math.acos(min(max(arg, -1), 1)) + 1.0)
+
+
+def _att(coord_from, coord_to) -> float:
+    """
+    Reference implementation of TSPLIB's ATT distance.
+    """
+    xd = coord_from[0] - coord_to[0]
+    yd = coord_from[1] - coord_to[1]
+    rij = math.sqrt((xd * xd + yd * yd) / 10.0)
+    tij = int(rij + 0.5)
+    return tij + 1 if tij < rij else tij
+
+
+@pytest.mark.parametrize(
+    "edge_weight_type, reference",
+    [
+        ("GEO", _geo),
+        ("ATT", _att),
+        ("MAN_2D", lambda a, b: np.abs(a - b).sum()),
+        ("MAX_2D", lambda a, b: np.abs(a - b).max()),
+    ],
+)
+def test_tsplib_kernels(coords, edge_weight_type, reference):
+    """
+    Tests that the vectorized kernels match the scalar TSPLIB definitions.
+    """
+    desired = [[reference(a, b) for b in coords] for a in coords]
+    assert_equal(pairwise(coords, coords, edge_weight_type), desired)
+
+
+def test_att_known_values():
+    actual = pairwise([[0, 0]], [[10, 0], [0, 0], [1, 3]], "ATT")
+    assert_equal(actual, [[4, 0, 1]])
+
+
+@pytest.mark.parametrize("edge_weight_type", ["EUC_3D", "MAN_3D", "MAX_3D"])
+def test_3d_kernels(edge_weight_type):
+    """
+    Tests the three-dimensional kernels, which do not round like EUC_2D.
+    """
+    desired = {"EUC_3D": np.sqrt(14), "MAN_3D": 6, "MAX_3D": 3}
+    actual = pairwise([[0, 0, 0]], [[1, -2, 3]], edge_weight_type)
+    assert_equal(actual, [[desired[edge_weight_type]]])
+
+
+@pytest.mark.parametrize("edge_weight_type", edge_weight_types())
+def test_blocks_and_lazy_equal_dense(coords, edge_weight_type):
+    """
+    Tests that the blocked and lazy computations do not depend on the block
+    size, for every registered kernel.
+    """
+    desired = pairwise(coords, coords, edge_weight_type)
+    blocked = pairwise_distances(coords, edge_weight_type, memory_limit=0)
+    lazy = LazyEdgeWeight(coords, edge_weight_type, block_size=7)
+
+    assert_equal(blocked, desired)
+    assert_equal(np.asarray(lazy), desired)
+    assert_equal(lazy[[1, 2], [3, 4]], desired[[1, 2], [3, 4]])
+
+
+@pytest.mark.parametrize(
+    "edge_weight_type, dtype",
+    [
+        ("GEO", np.int32),
+        ("ATT", np.int32),
+        ("MAN_2D", np.float64),
+        ("EUC_3D", np.float64),
+    ],
+)
+def test_edge_weight_dtype(coords, edge_weight_type, dtype):
+    assert_equal(edge_weight_dtype(coords, edge_weight_type), dtype)
+
+
+def test_parse_geo_instance():
+    """
+    Tests that a TSPLIB instance with GEO edge weights is parsed, and that
+    the "auto" dtype stores its distances as int32.
+    """
+    text = """
+        NAME: geo
+        TYPE: TSP
+        DIMENSION: 3
+        EDGE_WEIGHT_TYPE: GEO
+        NODE_COORD_SECTION
+        1 38.24 20.42
+        2 39.57 26.15
+        3 40.56 25.32
+        EOF
+    """
+    instance = parse_vrplib(text, dtype="auto")
+    coords = instance["node_coord"]
+    desired = [[_geo(a, b) for b in coords] for a in coords]
+
+    assert_equal(instance["edge_weight"], desired)
+    assert_equal(instance["edge_weight"].dtype, np.int32)
+
+
+def _haversine(coords_from, coords_to):
+    lat_from, lon_from = (
+        np.radians(coords_from[..., 0]),
+        np.radians(coords_from[..., 1]),
+    )
+    lat_to, lon_to = (
+        np.radians(coords_to[..., 0]),
+        np.radians(coords_to[..., 1]),
+    )
+    dlat = np.sin((lat_to - lat_from) / 2) ** 2
+    dlon = np.sin((lon_to - lon_from) / 2) ** 2
+    cos = np.cos(lat_from) * np.cos(lat_to)
+    return 2 * 6371 * np.arcsin(np.sqrt(dlat + cos * dlon))
+
+
+def test_register_custom_kernel():
+    """
+    Tests that a custom kernel is used to parse instances of its edge weight
+    type, both densely and lazily.
+    """
+    register_edge_weight_type("HAVERSINE", _haversine, overwrite=True)
+    assert_("HAVERSINE" in edge_weight_types())
+
+    text = """
+        NAME: haversine
+        TYPE: CVRP
+        DIMENSION: 2
+        EDGE_WEIGHT_TYPE: HAVERSINE
+        NODE_COORD_SECTION
+        1 0 0
+        2 0 90
+        EOF
+    """
+    quarter = 2 * math.pi * 6371 / 4
+
+    instance = parse_vrplib(text)
+    assert_almost_equal(instance["edge_weight"], [[0, quarter], [quarter, 0]])
+
+    lazy = parse_vrplib(text, lazy_edge_weights=True)["edge_weight"]
+    assert_equal(lazy[0, 1], instance["edge_weight"][0, 1])
+
+
+def test_register_raises_existing_type():
+    """
+    Tests that registered kernels are only replaced when asked to.
+    """
+    with assert_raises(ValueError):
+        register_edge_weight_type("GEO", _haversine)
+
+    original = get_kernel("GEO")
+    register_edge_weight_type("GEO", _haversine, overwrite=True)
+
+    try:
+        assert_equal(pairwise([[0, 0]], [[0, 0]], "GEO"), [[0]])
+    finally:
+        register_edge_weight_type("GEO", *original, overwrite=True)
+
+
+def test_integer_dtype_requires_integral_kernel(coords):
+    register_edge_weight_type("HAVERSINE", _haversine, overwrite=True)
+
+    with assert_raises(ValueError):
+        pairwise_distances(coords, "HAVERSINE", dtype=np.int32)
+
+    with assert_raises(ValueError):
+        LazyEdgeWeight(coords, "MAN_2D", dtype=np.int32)
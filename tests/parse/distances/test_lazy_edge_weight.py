@@ -0,0 +1,161 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from numpy.testing import assert_, assert_equal, assert_raises
+
+from vrplib.parse.distances import LazyEdgeWeight, pairwise
+
+
+@pytest.fixture
+def coords():
+    return np.random.default_rng(1).uniform(0, 100, size=(50, 2))
+
+
+@pytest.mark.parametrize(
+    "edge_weight_type", ["EUC_2D", "FLOOR_2D", "CEIL_2D", "EXACT_2D"]
+)
+def test_materializes_rounded_distances(coords, edge_weight_type):
+    """
+    Tests that the lazy edge weights equal the dense, rounded distances.
+    """
+    lazy = LazyEdgeWeight(coords, edge_weight_type, block_size=7)
+    desired = pairwise(coords, coords, edge_weight_type)
+
+    assert_equal(lazy.shape, (50, 50))
+    assert_equal(np.asarray(lazy), desired)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        3,
+        -1,
+        (3, 4),
+        (slice(None), 4),
+        (slice(2, 20, 3),),
+        (slice(5, 10), slice(1, 3)),
+        ([1, 40, 3],),
+        ([1, 40, 3], [2, 2, 49]),
+        (np.array([[1], [2]]), np.array([3, 4, 5])),
+        (7, [1, 2, 3]),
+        ([7, 9], slice(None, 5)),
+        (slice(None), [4, 1]),
+        (slice(None), slice(None, None, -1)),
+        (2, slice(None)),
+        np.arange(50) < 3,
+    ],
+)
+def test_indexing(coords, key):
+    """
+    Tests that indexing the lazy edge weights behaves like indexing the
+    dense matrix.
+    """
+    lazy = LazyEdgeWeight(coords, "FLOOR_2D", block_size=8)
+    dense = pairwise(coords, coords, "FLOOR_2D")
+
+    assert_equal(lazy[key], dense[key])
+    assert_equal(np.shape(lazy[key]), np.shape(dense[key]))
+
+
+def test_columns_are_not_cached(coords):
+    """
+    Tests that selecting columns computes only the selected entries, and
+    that only full rows are cached.
+    """
+    lazy = LazyEdgeWeight(coords, block_size=8)
+    dense = pairwise(coords, coords, "EUC_2D")
+
+    assert_equal(lazy[:, 4], dense[:, 4])
+    assert_equal(lazy[:, [1, 2]], dense[:, [1, 2]])
+    assert_equal(lazy[3, :10], dense[3, :10])
+    assert_equal(lazy.cached_bytes, 0)
+
+    assert_equal(lazy[3, :], dense[3])
+    assert_equal(lazy.cached_bytes, 8 * 50 * 8)
+
+
+@pytest.mark.parametrize("dtype", ["int32", "auto", "float32", None])
+def test_materializes_with_dtype(coords, dtype):
+    """
+    Tests that materializing the lazy edge weights keeps their dtype, and
+    that a requested dtype is respected.
+    """
+    lazy = LazyEdgeWeight(coords, "FLOOR_2D", dtype)
+    desired = pairwise(coords, coords, "FLOOR_2D")
+
+    assert_equal(np.asarray(lazy).dtype, lazy.dtype)
+    assert_equal(np.asarray(lazy), desired)
+    assert_equal(np.asarray(lazy, dtype=np.int64).dtype, np.int64)
+
+
+def test_scalar_indexing_returns_float(coords):
+    lazy = LazyEdgeWeight(coords)
+    assert_(isinstance(lazy[0, 1], float))
+    assert_equal(lazy[1, 1], 0)
+
+
+def test_raises_out_of_bounds(coords):
+    lazy = LazyEdgeWeight(coords)
+
+    with assert_raises(IndexError):
+        lazy[50]
+
+    with assert_raises(IndexError):
+        lazy[0, 50]
+
+
+def test_cache_size_bounds_cached_blocks(coords):
+    """
+    Tests that the cached row blocks do not exceed the cache size, but
+    that at least one block is always kept.
+    """
+    block_bytes = 10 * 50 * 8
+    lazy = LazyEdgeWeight(coords, block_size=10, cache_size=2 * block_bytes)
+    np.asarray(lazy)
+
+    assert_equal(lazy.cached_bytes, 2 * block_bytes)
+
+    lazy = LazyEdgeWeight(coords, block_size=10, cache_size=0)
+    np.asarray(lazy)
+
+    assert_equal(lazy.cached_bytes, block_bytes)
+
+
+@pytest.mark.parametrize("edge_weight_type", ["EXPLICIT", "XRAY1", "2D"])
+def test_raises_unknown_edge_weight_type(coords, edge_weight_type):
+    with assert_raises(ValueError):
+        LazyEdgeWeight(coords, edge_weight_type)
+
+
+def test_shared_across_threads(coords):
+    """
+    Tests that concurrent reads from many threads return the correct rows,
+    while the block cache is repeatedly evicted.
+    """
+    lazy = LazyEdgeWeight(coords, block_size=5, cache_size=5 * 50 * 8)
+    desired = np.asarray(LazyEdgeWeight(coords))
+
+    def read_rows(seed):
+        rng = np.random.default_rng(seed)
+        for row in rng.integers(0, 50, size=200):
+            assert_equal(lazy[row], desired[row])
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(read_rows, range(16)))
+
+
+def test_pickle(coords):
+    """
+    Tests that lazy edge weights can be pickled, e.g., to send them to other
+    processes, without the cached row blocks.
+    """
+    lazy = LazyEdgeWeight(coords, "FLOOR_2D")
+    np.asarray(lazy)
+
+    unpickled = pickle.loads(pickle.dumps(lazy))
+
+    assert_equal(unpickled.cached_bytes, 0)
+    assert_equal(unpickled.edge_weight_type, "FLOOR_2D")
+    assert_equal(np.asarray(unpickled), np.asarray(lazy))
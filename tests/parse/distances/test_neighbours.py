@@ -0,0 +1,164 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_, assert_equal, assert_raises
+
+from vrplib.parse.distances import (
+    LazyEdgeWeight,
+    nearest_neighbours,
+    neighbours_from_matrix,
+    pairwise,
+)
+
+
+def _brute_force(matrix: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the k nearest neighbours of each location in the matrix, sorted
+    by distance, and ties by index.
+    """
+    matrix = matrix.astype(float)
+    np.fill_diagonal(matrix, np.inf)
+
+    keys = np.broadcast_to(np.arange(len(matrix)), matrix.shape)
+    return np.lexsort((keys, matrix), axis=-1)[:, :k]
+
+
+@pytest.mark.parametrize(
+    "edge_weight_type", ["EUC_2D", "FLOOR_2D", "ATT", "MAN_2D", "MAX_2D"]
+)
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_nearest_neighbours(edge_weight_type, k):
+    """
+    Tests that the grid search finds the same neighbours as a brute-force
+    search of the full distance matrix, for clustered locations with many
+    ties.
+    """
+    rng = np.random.default_rng(1)
+    coords = rng.integers(0, 100, size=(300, 2)).astype(float)
+    coords[:100] /= 20  # a dense cluster
+
+    indptr, indices, weights = nearest_neighbours(coords, k, edge_weight_type)
+    dense = pairwise(coords, coords, edge_weight_type)
+    desired = _brute_force(pairwise(coords, coords, "EUC_2D"), k)
+
+    if edge_weight_type in ("MAN_2D", "MAX_2D"):
+        desired = _brute_force(dense, k)
+
+    assert_equal(indptr, np.arange(0, 300 * k + 1, k))
+    assert_equal(indices.reshape(300, k), desired)
+    assert_equal(weights, dense[np.arange(300).repeat(k), indices])
+
+
+@pytest.mark.parametrize("memory_limit", [1, 1_000, 2**27])
+def test_nearest_neighbours_memory_limit(memory_limit):
+    """
+    Tests that the neighbours do not depend on the memory limit, also in
+    one and three dimensions.
+    """
+    rng = np.random.default_rng(2)
+
+    for dim in (1, 2, 3):
+        coords = rng.uniform(0, 10, size=(200, dim))
+        _, indices, _ = nearest_neighbours(
+            coords, 4, memory_limit=memory_limit
+        )
+        desired = _brute_force(pairwise(coords, coords, "EUC_2D"), 4)
+        assert_equal(indices.reshape(200, 4), desired)
+
+
+def _far_apart_clusters() -> np.ndarray:
+    rng = np.random.default_rng(6)
+    centres = rng.uniform(0, 1e5, size=(10, 2)).repeat(2_000, axis=0)
+    return centres + rng.normal(size=(20_000, 2))
+
+
+def _far_away_outlier() -> np.ndarray:
+    rng = np.random.default_rng(5)
+    return np.vstack([rng.uniform(0, 1_000, size=(20_000, 2)), [[1e7, 1e7]]])
+
+
+@pytest.mark.parametrize(
+    "coords",
+    [
+        _far_away_outlier(),
+        _far_apart_clusters(),
+        np.array([[0, 0], [1e12, 1e-6]] + [[i / 1e3, 0] for i in range(8)]),
+    ],
+)
+def test_nearest_neighbours_outliers_and_clusters(coords):
+    """
+    Tests that the grid search stays correct when most of the bounding box
+    of the locations is empty, e.g., due to far away outliers or clusters,
+    or when the coordinates have an extreme range.
+    """
+    _, indices, _ = nearest_neighbours(coords, 10)
+
+    n = len(coords)
+    k = min(10, n - 1)
+    sample = np.random.default_rng(8).choice(n, min(n, 100), replace=False)
+    sample = np.union1d(sample, [0, 1, n - 1])
+
+    dist = pairwise(coords[sample], coords, "EUC_2D")
+    dist[np.arange(len(sample)), sample] = np.inf
+    keys = np.broadcast_to(np.arange(n), dist.shape)
+    desired = np.lexsort((keys, dist), axis=-1)[:, :k]
+    assert_equal(indices.reshape(n, k)[sample], desired)
+
+
+@pytest.mark.parametrize("n, k", [(0, 3), (1, 3), (4, 3), (4, 10), (5, 0)])
+def test_nearest_neighbours_few_locations(n, k):
+    """
+    Tests that at most n - 1 neighbours are returned per location.
+    """
+    coords = np.random.default_rng(3).uniform(size=(n, 2))
+    indptr, indices, weights = nearest_neighbours(coords, k)
+    num = min(k, max(n - 1, 0))
+
+    assert_equal(indptr, np.arange(n + 1) * num)
+    assert_equal(len(indices), n * num)
+    assert_equal(len(weights), n * num)
+
+
+def test_nearest_neighbours_identical_locations():
+    coords = np.zeros((10, 2))
+    _, indices, weights = nearest_neighbours(coords, 3)
+
+    assert_equal(indices[:3], [1, 2, 3])
+    assert_equal(indices[3:6], [0, 2, 3])
+    assert_equal(weights, 0)
+
+
+def test_nearest_neighbours_dtype():
+    coords = np.random.default_rng(4).uniform(0, 100, size=(50, 2))
+
+    _, indices, weights = nearest_neighbours(coords, 3, "FLOOR_2D", "auto")
+    assert_equal(indices.dtype, np.int32)
+    assert_equal(weights.dtype, np.int32)
+
+    with assert_raises(ValueError):
+        nearest_neighbours(coords, 3, "EUC_2D", np.int32)
+
+
+@pytest.mark.parametrize("edge_weight_type", ["GEO", "EXPLICIT", "UNKNOWN"])
+def test_nearest_neighbours_raises_unsupported_type(edge_weight_type):
+    with assert_raises(ValueError):
+        nearest_neighbours(np.zeros((3, 2)), 1, edge_weight_type)
+
+
+@pytest.mark.parametrize("memory_limit", [1, 2**27])
+def test_neighbours_from_matrix(memory_limit):
+    """
+    Tests that the neighbours from a matrix, or from lazy edge weights, are
+    the same as those of a brute-force search.
+    """
+    matrix = np.random.default_rng(5).integers(0, 10, size=(40, 40))
+    indptr, indices, weights = neighbours_from_matrix(matrix, 6, memory_limit)
+
+    assert_equal(indptr, np.arange(0, 40 * 6 + 1, 6))
+    assert_equal(indices.reshape(40, 6), _brute_force(matrix, 6))
+    assert_equal(weights, matrix[np.arange(40).repeat(6), indices])
+
+    coords = np.random.default_rng(6).uniform(size=(40, 2))
+    lazy = LazyEdgeWeight(coords, "EUC_2D")
+    _, indices, _ = neighbours_from_matrix(lazy, 6)
+    assert_equal(indices, nearest_neighbours(coords, 6)[1])
+    assert_(lazy.cached_bytes <= 40 * 40 * 8)
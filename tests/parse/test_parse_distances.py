@@ -1,11 +1,20 @@
 import numpy as np
 import pytest
-from numpy.testing import assert_almost_equal, assert_equal, assert_raises
+from numpy.testing import (
+    assert_,
+    assert_almost_equal,
+    assert_equal,
+    assert_raises,
+)
 
 from vrplib.parse.parse_distances import (
     from_eilon,
+    from_explicit,
+    from_explicit_lines,
     from_lower_row,
+    is_eilon_layout,
     is_triangular_number,
+    pairwise_euclidean,
     parse_distances,
 )
 
@@ -67,26 +76,370 @@ def test_parse_euclidean_distances(edge_weight_type, desired):
     assert_almost_equal(actual, desired)
 
 
+@pytest.mark.parametrize("memory_limit", [0, 100, 1_000, 2**27])
+def test_pairwise_euclidean_memory_limit(memory_limit):
+    """
+    Tests that the blocked computation of the pairwise Euclidean distances
+    does not depend on the memory limit, i.e., the number of rows per block.
+    """
+    coords = np.random.default_rng(2).uniform(0, 1000, size=(25, 2))
+    desired = np.linalg.norm(coords[:, None] - coords[None, :], axis=-1)
+    actual = pairwise_euclidean(coords, memory_limit=memory_limit)
+
+    assert_almost_equal(actual, desired)
+    assert_equal(np.diag(actual), 0)
+
+
+@pytest.mark.parametrize(
+    "edge_weight_type, dtype",
+    [
+        ("EUC_2D", np.float32),
+        ("FLOOR_2D", np.int32),
+        ("CEIL_2D", np.int32),
+        ("EXACT_2D", np.int64),
+        ("EXACT_2D", np.float32),
+    ],
+)
+def test_parse_euclidean_distances_dtype(edge_weight_type, dtype):
+    """
+    Tests that the Euclidean distances are returned in the requested dtype,
+    and that the values match the default float64 computation.
+    """
+    coords = np.random.default_rng(3).integers(0, 100, size=(20, 2))
+    actual = parse_distances(
+        [], edge_weight_type, node_coord=coords, dtype=dtype
+    )
+    desired = parse_distances([], edge_weight_type, node_coord=coords)
+
+    assert_equal(actual.dtype, dtype)
+    assert_almost_equal(actual, desired.astype(dtype))
+
+
+def test_raise_integer_dtype_unrounded_euclidean():
+    """
+    Tests that an integer dtype is not allowed for the EUC_2D edge weight
+    type, because those distances are not rounded.
+    """
+    with assert_raises(ValueError):
+        parse_distances(
+            [], "EUC_2D", node_coord=np.array([[0, 0]]), dtype=np.int32
+        )
+
+
+def test_parse_explicit_distances_dtype():
+    """
+    Tests that explicit edge weights are converted to the requested dtype.
+    """
+    actual = parse_distances(
+        [[0, 1], [1, 0]], "EXPLICIT", "FULL_MATRIX", dtype=np.int16
+    )
+
+    assert_equal(actual.dtype, np.int16)
+    assert_equal(actual, [[0, 1], [1, 0]])
+
+
+def test_raise_integer_dtype_overflow():
+    """
+    Tests that computed distances that do not fit in the requested integer
+    dtype raise instead of wrapping around.
+    """
+    coords = np.array([[0, 0], [3e9, 0]])
+
+    with assert_raises(ValueError):
+        parse_distances([], "FLOOR_2D", node_coord=coords, dtype=np.int32)
+
+    actual = parse_distances([], "FLOOR_2D", node_coord=coords, dtype="int64")
+    assert_equal(actual, [[0, 3e9], [3e9, 0]])
+
+
+@pytest.mark.parametrize(
+    "data, dtype",
+    [
+        ([2.5, 3, 4], np.int32),  # not integral
+        ([1, 2, 3e10], np.int32),  # too large
+        ([-1, 2, 3], np.uint8),  # negative
+    ],
+)
+def test_raise_explicit_integer_dtype_invalid_values(tmp_path, data, dtype):
+    """
+    Tests that explicit edge weights that are not integers, or that do not
+    fit in the requested integer dtype, raise instead of being truncated or
+    wrapping around.
+    """
+    with assert_raises(ValueError):
+        from_explicit(data, "LOWER_ROW", dtype)
+
+    lines = [" ".join(map(str, data))]
+    with assert_raises(ValueError):
+        from_explicit_lines(lines, "LOWER_ROW", 3, tmp_path / "ew.npy", dtype)
+
+
 @pytest.mark.parametrize(
-    "comment, func", [("Eilon", from_eilon), (None, from_lower_row)]
+    "edge_weight_type, extent, dtype",
+    [
+        ("EUC_2D", 100, np.float64),  # not rounded
+        ("FLOOR_2D", 100, np.int32),
+        ("CEIL_2D", 2**30, np.int32),
+        ("CEIL_2D", 2**31, np.int64),  # too large for int32
+        ("EXACT_2D", 10**6, np.int32),
+        ("EXACT_2D", 10**7, np.int64),  # scaled by 1000 for three decimals
+    ],
 )
-def test_parse_lower_row(comment, func):
+def test_parse_euclidean_distances_auto_dtype(edge_weight_type, extent, dtype):
+    """
+    Tests that the "auto" dtype is the smallest dtype that holds the (rounded)
+    Euclidean distances without overflow.
+    """
+    coords = np.array([[0, 0], [extent, 0], [extent, extent]])
+    actual = parse_distances(
+        [], edge_weight_type, node_coord=coords, dtype="auto"
+    )
+    desired = parse_distances([], edge_weight_type, node_coord=coords)
+
+    assert_equal(actual.dtype, dtype)
+    assert_equal(actual, desired)
+
+    lazy = parse_distances(
+        [], edge_weight_type, node_coord=coords, lazy=True, dtype="auto"
+    )
+    assert_equal(lazy.dtype, dtype)
+
+
+@pytest.mark.parametrize(
+    "data, edge_weight_format, dtype",
+    [
+        ([[1], [2, 3]], "LOWER_ROW", np.int32),
+        ([[1.0], [2.0, 3.0]], "LOWER_ROW", np.int32),  # integral floats
+        ([[1.5], [2.0, 3.0]], "LOWER_ROW", np.float64),
+        ([[0, 2**31], [2**31, 0]], "FULL_MATRIX", np.int64),
+        (np.array([[0, 1], [1, 0]], dtype=np.int16), "FULL_MATRIX", np.int32),
+    ],
+)
+def test_parse_explicit_distances_auto_dtype(data, edge_weight_format, dtype):
+    """
+    Tests that explicit edge weights are stored in the smallest integer dtype
+    that holds the values when the "auto" dtype is used, if integer-valued.
+    """
+    actual = parse_distances(
+        data, "EXPLICIT", edge_weight_format, dtype="auto"
+    )
+    desired = parse_distances(data, "EXPLICIT", edge_weight_format)
+
+    assert_equal(actual.dtype, dtype)
+    assert_equal(actual, desired)
+
+
+@pytest.mark.parametrize(
+    "data, func",
+    [
+        ([[1], [2, 3], [4, 5, 6]], from_lower_row),  # row layout
+        ([[1, 2, 3], [4, 5], [6]], from_eilon),  # column layout
+        ([1, 2, 3, 4, 5, 6], from_lower_row),  # flat, so no layout
+        ([[1, 2, 3, 4, 5, 6]], from_lower_row),  # single line
+        ([[1, 2], [3, 4], [5, 6]], from_lower_row),  # wrapped lines
+        (np.array([[1, 2, 3], [4, 5, 6]]), from_lower_row),  # wrapped lines
+        ([[1, 2, 3, 4], [5, 6]], from_lower_row),  # wrapped lines
+    ],
+)
+def test_parse_lower_row(data, func):
     """
     Tests if a ``LOWER ROW`` instance is parsed as Eilon instance or regular
     instance. Eilon instances do not contain a proper lower row matrix, but
-    a lower column matrix instead. The current way of detecting an Eilon
-    instance is by means of the ``COMMENT`` field, which is checked for
-    including "Eilon".
+    a lower column matrix instead. Eilon instances are detected from the
+    line layout of the data: line i of an n-dimensional Eilon matrix has
+    n - 1 - i values. Any other layout is a regular lower row matrix, since
+    its line breaks need not match the rows.
     """
     instance = {
-        "data": np.array([[1], [2, 3], [4, 5, 6]], dtype=object),
+        "data": data,
         "edge_weight_type": "EXPLICIT",
         "edge_weight_format": "LOWER_ROW",
-        "comment": comment,
+        "comment": "Eilon",  # ignored
     }
 
     assert_equal(parse_distances(**instance), func(instance["data"]))
 
+    if func is from_lower_row:  # the lines do not change the matrix
+        flat = np.ravel(np.concatenate([np.ravel(row) for row in data]))
+        assert_equal(parse_distances(**instance), from_lower_row(flat))
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ([[1, 2, 3], [4, 5], [6]], True),
+        ([[1, 2], [3]], True),
+        ([[1], [2, 3], [4, 5, 6]], False),  # row layout
+        ([[1, 2], [3, 4, 5, 6]], False),
+        ([[1, 2, 3, 4, 5, 6]], False),
+        ([[1]], False),  # row and column layout are the same
+        (np.array([[1]]), False),
+        (np.array([[1, 2], [3, 4]]), False),
+        (np.array([1, 2, 3]), False),
+        ([], False),
+    ],
+)
+def test_is_eilon_layout(data, expected):
+    assert_equal(is_eilon_layout(data), expected)
+
+
+def _explicit_values(matrix: np.ndarray, edge_weight_format: str) -> list:
+    """
+    Lists the matrix values in the order of the given explicit edge weight
+    format, following the TSPLIB definitions.
+    """
+    n = len(matrix)
+    include_diag = "DIAG" in edge_weight_format
+
+    def in_triangle(i, j, lower):
+        if i == j:
+            return include_diag
+        return i > j if lower else i < j
+
+    if edge_weight_format == "FULL_MATRIX":
+        return matrix.ravel().tolist()
+
+    lower = edge_weight_format.startswith("LOWER")
+    if edge_weight_format.endswith("ROW"):
+        pairs = [(i, j) for i in range(n) for j in range(n)]
+    else:  # column-wise, so iterate columns first
+        pairs = [(i, j) for j in range(n) for i in range(n)]
+
+    return [matrix[i, j] for i, j in pairs if in_triangle(i, j, lower)]
+
+
+@pytest.mark.parametrize(
+    "edge_weight_format",
+    [
+        "FULL_MATRIX",
+        "LOWER_ROW",
+        "UPPER_ROW",
+        "LOWER_DIAG_ROW",
+        "UPPER_DIAG_ROW",
+        "LOWER_COL",
+        "UPPER_COL",
+        "LOWER_DIAG_COL",
+        "UPPER_DIAG_COL",
+    ],
+)
+@pytest.mark.parametrize("n", [1, 2, 7])
+def test_from_explicit(edge_weight_format, n):
+    """
+    Tests that all explicit edge weight formats are correctly transformed
+    into a full matrix, regardless of how the values are split over lines.
+    """
+    matrix = np.random.default_rng(n).integers(1, 100, size=(n, n))
+    matrix = matrix + matrix.T
+
+    if "DIAG" not in edge_weight_format:
+        np.fill_diagonal(matrix, 0)
+
+    values = _explicit_values(matrix, edge_weight_format)
+    lines = [values[idx : idx + 4] for idx in range(0, len(values), 4)]
+
+    assert_equal(from_explicit(values, edge_weight_format), matrix)
+    assert_equal(from_explicit(lines, edge_weight_format), matrix)
+
+    # Also through parse_distances, with explicit dtype, where the wrapped
+    # lines are not mistaken for the column layout of Eilon instances.
+    for data in (values, lines):
+        actual = parse_distances(
+            data, "EXPLICIT", edge_weight_format, dtype=np.int32
+        )
+        assert_equal(actual, matrix)
+        assert_equal(actual.dtype, np.int32)
+
+
+@pytest.mark.parametrize(
+    "edge_weight_format, num_values",
+    [("FULL_MATRIX", 5), ("LOWER_ROW", 4), ("UPPER_DIAG_ROW", 5)],
+)
+def test_from_explicit_raises_wrong_number_of_values(
+    edge_weight_format, num_values
+):
+    """
+    Tests that a ValueError is raised when the number of values does not
+    match any dimension of the given format.
+    """
+    with assert_raises(ValueError):
+        from_explicit(list(range(num_values)), edge_weight_format)
+
+
+@pytest.mark.parametrize(
+    "edge_weight_format",
+    ["FULL_MATRIX", "LOWER_ROW", "UPPER_ROW", "LOWER_DIAG_COL"],
+)
+@pytest.mark.parametrize("chunk_size", [1, 10, 2**23])
+def test_from_explicit_lines(tmp_path, edge_weight_format, chunk_size):
+    """
+    Tests that explicit edge weight lines are parsed in chunks into a
+    memory-mapped file, independent of the chunk size.
+    """
+    matrix = np.random.default_rng(4).integers(1, 100, size=(6, 6))
+    matrix = matrix + matrix.T
+
+    if "DIAG" not in edge_weight_format:
+        np.fill_diagonal(matrix, 0)
+
+    values = _explicit_values(matrix, edge_weight_format)
+    lines = [values[idx : idx + 4] for idx in range(0, len(values), 4)]
+
+    text = [" ".join(map(str, line)) for line in lines]
+    path = tmp_path / "edge_weight.npy"
+    actual = from_explicit_lines(
+        text, edge_weight_format, 6, path, np.int32, chunk_size
+    )
+
+    assert_(isinstance(actual, np.memmap))
+    assert_equal(actual.dtype, np.int32)
+    assert_equal(actual, matrix)
+    assert_equal(np.load(path), matrix)
+
+
+@pytest.mark.parametrize(
+    "lines, func",
+    [
+        (["1 2 3", "4 5", "6"], from_eilon),  # column layout
+        (["1", "2 3", "4 5 6"], from_lower_row),  # row layout
+        (["1 2 3 4 5 6"], from_lower_row),  # single line
+        (["1 2", "3 4", "5 6"], from_lower_row),  # wrapped lines
+        (["1 2 3", "4 5 6"], from_lower_row),  # wrapped lines
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 2**20])
+def test_from_explicit_lines_eilon(tmp_path, lines, func, chunk_size):
+    """
+    Tests that Eilon-style column-wise data is recognized from the layout of
+    the lines like ``parse_distances`` does, and that all other layouts are
+    parsed as regular lower row data.
+    """
+    path = tmp_path / "ew.npy"
+    actual = from_explicit_lines(lines, "LOWER_ROW", 4, path, None, chunk_size)
+    data = [[int(val) for val in line.split()] for line in lines]
+
+    assert_equal(actual, func(np.arange(1, 7)))
+    assert_equal(actual, parse_distances(data, "EXPLICIT", "LOWER_ROW"))
+
+
+@pytest.mark.parametrize(
+    "lines, edge_weight_format, dimension",
+    [
+        (["1 2", "3"], "FULL_MATRIX", 2),  # too few values
+        (["0 1", "1 0", "1"], "FULL_MATRIX", 2),  # too many values
+        (["1", "2 3", "4"], "LOWER_ROW", 4),  # too few values
+        (["1", "2 x"], "LOWER_ROW", 3),  # not numeric
+        (["1"], "LOWER_ROW", 0),  # invalid dimension
+        (["1"], "UNKNOWN", 2),  # unknown format
+    ],
+)
+def test_from_explicit_lines_raises(
+    tmp_path, lines, edge_weight_format, dimension
+):
+    with assert_raises(ValueError):
+        from_explicit_lines(
+            lines, edge_weight_format, dimension, tmp_path / "ew.npy"
+        )
+
 
 def test_from_lower_row():
     """
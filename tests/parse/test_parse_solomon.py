@@ -4,7 +4,8 @@ import numpy as np
 from numpy.testing import assert_, assert_equal, assert_raises
 from pytest import mark
 
-from vrplib.parse.parse_solomon import parse_solomon
+from vrplib.parse.parse_solomon import parse_customers, parse_solomon
+from vrplib.parse.parse_utils import text2lines
 
 DATA_DIR = Path("tests/data")
 
@@ -105,3 +106,51 @@ def test_do_not_compute_edge_weights():
     text = "\n".join(SOLOMON_INSTANCE)
     actual = parse_solomon(text, compute_edge_weights=False)
     assert_("edge_weight" not in actual)
+
+
+@mark.parametrize("name", ["C101.txt", "C1_2_1.txt"])
+def test_parse_customers_equals_genfromtxt(name):
+    """
+    Tests that the customer table is parsed into the same integer array as
+    with ``np.genfromtxt``.
+    """
+    lines = text2lines((DATA_DIR / name).read_text())
+    actual = parse_customers(lines[6:])
+
+    assert_equal(actual, np.genfromtxt(lines[6:], dtype=int))
+    assert_equal(actual.dtype, np.int64)
+
+
+def test_parse_customers_single_and_float_rows():
+    """
+    Tests that a table with a single customer is still two-dimensional, and
+    that non-integer values are parsed as floats instead of being lost.
+    Tables of integral values are parsed as integers, also when the values
+    are written with decimals.
+    """
+    single = parse_customers(["0 40 50 0 0 1236 0"])
+    assert_equal(single, [[0, 40, 50, 0, 0, 1236, 0]])
+    assert_equal(single.dtype, np.int64)
+
+    integral = parse_customers(["0 40.0 50 0 0 1236.0 0"])
+    assert_equal(integral, [[0, 40, 50, 0, 0, 1236, 0]])
+    assert_equal(integral.dtype, np.int64)
+
+    floats = parse_customers(["0 40 50 0 0 1236 0", "1 45.5 68 10 912 967 90"])
+    assert_equal(floats.dtype, np.float64)
+    assert_equal(floats[1, 1], 45.5)
+
+    assert_equal(parse_customers([]).shape, (0, 7))
+
+
+@mark.parametrize(
+    "lines",
+    [
+        ["0 40 50 0 0 1236 0", "1 45 68 10 912 967"],  # ragged rows
+        ["0 40 50 0 0 1236"],  # six columns
+        ["0 40 50 0 0 1236 zero"],  # non-numeric
+    ],
+)
+def test_parse_customers_raises_invalid_table(lines):
+    with assert_raises(ValueError):
+        parse_customers(lines)
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
-from numpy.testing import assert_equal
+from numpy.testing import assert_, assert_equal
 
+from vrplib.parse import CompactRoutes
 from vrplib.parse.parse_solution import parse_solution
 
 
@@ -31,3 +33,78 @@ def test_parse_solution(text, data):
     Tests if a solution is correctly parsed.
     """
     assert_equal(parse_solution(text), data)
+
+
+def test_parse_compact_routes():
+    """
+    Tests that compact routes store the visits of all routes in one flat
+    integer array with route offsets, and keep the other solution data.
+    """
+    text = "Route #1: 1 2 3\n Route #2: 5 6\n COST: 10\n Time: 1.5"
+    solution = parse_solution(text, compact_routes=True)
+    routes = solution["routes"]
+
+    assert_equal(routes.visits, [1, 2, 3, 5, 6])
+    assert_equal(routes.visits.dtype, np.int32)
+    assert_equal(routes.offsets, [0, 3, 5])
+    assert_equal(routes.num_visits, [3, 2])
+    assert_equal(routes.tolist(), [[1, 2, 3], [5, 6]])
+    assert_equal(solution["cost"], 10)
+    assert_equal(solution["time"], 1.5)
+
+
+def test_parse_compact_routes_empty():
+    """
+    Tests that a solution without routes has empty compact routes.
+    """
+    routes = parse_solution("COST: 10", compact_routes=True)["routes"]
+
+    assert_equal(len(routes), 0)
+    assert_equal(routes.offsets, [0])
+    assert_equal(routes.tolist(), [])
+
+
+def test_parse_compact_routes_raises_non_integer_visits():
+    """
+    Tests that an error is raised if a route contains non-integer visits.
+    """
+    with pytest.raises(ValueError):
+        parse_solution("Route #1: 1 2.5", compact_routes=True)
+
+
+def test_compact_routes_sequence():
+    """
+    Tests that compact routes behave like a sequence of read-only routes.
+    """
+    routes = CompactRoutes.from_routes([[1, 2, 3], [4], [5, 6]])
+
+    assert_equal(len(routes), 3)
+    assert_equal(
+        [route.tolist() for route in routes], [[1, 2, 3], [4], [5, 6]]
+    )
+    assert_equal(routes[-1], [5, 6])
+    assert_equal(routes[1], [4])
+    assert_(routes == CompactRoutes([1, 2, 3, 4, 5, 6], [0, 3, 4, 6]))
+
+    with pytest.raises(IndexError):
+        routes[3]
+
+    with pytest.raises(ValueError):
+        routes[0][0] = 10
+
+
+@pytest.mark.parametrize(
+    "visits, offsets",
+    [
+        ([1, 2], [1, 2]),  # does not start at zero
+        ([1, 2], [0, 1]),  # does not end at the number of visits
+        ([1, 2], [0, 2, 1, 2]),  # decreasing
+        ([1, 2], []),  # no offsets
+    ],
+)
+def test_compact_routes_raises_invalid_offsets(visits, offsets):
+    """
+    Tests that an error is raised if the offsets do not describe routes.
+    """
+    with pytest.raises(ValueError):
+        CompactRoutes(visits, offsets)
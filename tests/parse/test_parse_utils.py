@@ -1,7 +1,12 @@
+import numpy as np
 import pytest
-from numpy.testing import assert_equal
+from numpy.testing import assert_, assert_equal
 
-from vrplib.parse.parse_utils import text2lines
+from vrplib.parse.parse_utils import (
+    compact_dtype,
+    text2lines,
+    tokenize_numeric,
+)
 
 
 @pytest.mark.parametrize(("text", "expected"), [("", []), ("\n", [])])
@@ -23,3 +28,69 @@ def test_empty_lines(text: str, expected: list[str]):
 )
 def test_comments(text: str, expected: list[str]):
     assert_equal(text2lines(text), expected)
+
+
+@pytest.mark.parametrize(
+    ("lines", "values", "counts", "dtype"),
+    [
+        (["1 2", "3 4"], [1, 2, 3, 4], [2, 2], np.int64),
+        (["1 2.5", "3"], [1, 2.5, 3], [2, 1], np.float64),
+        (["1 -1", "1e3"], [1, -1, 1000], [2, 1], np.float64),
+        ([], [], [], np.int64),
+    ],
+)
+def test_tokenize_numeric(lines, values, counts, dtype):
+    """
+    Tests that numeric lines are tokenized into a single flat array with the
+    number of values on each line, and that the dtype is inferred correctly.
+    """
+    actual_values, actual_counts = tokenize_numeric(lines)
+
+    assert_equal(actual_values, values)
+    assert_equal(actual_values.dtype, dtype)
+    assert_equal(actual_counts, counts)
+
+
+@pytest.mark.parametrize("lines", [["1 2", "3 x"], ["a"], ["1 0x10"]])
+def test_tokenize_numeric_non_numeric(lines):
+    """
+    Tests that None is returned when the lines contain non-numeric tokens.
+    """
+    assert_(tokenize_numeric(lines) is None)
+
+
+def test_tokenize_numeric_chunks():
+    """
+    Tests that tokenizing in chunks gives the same result as tokenizing all
+    lines at once, also when only a later chunk contains floats.
+    """
+    lines = ["1 2", "3", "4 5 6", "7.5 8"]
+    values, counts = tokenize_numeric(lines, chunk_size=2)
+
+    assert_equal(values, [1, 2, 3, 4, 5, 6, 7.5, 8])
+    assert_equal(values.dtype, np.float64)
+    assert_equal(counts, [2, 1, 3, 2])
+    assert_(tokenize_numeric(["1", "2", "x"], chunk_size=2) is None)
+
+
+@pytest.mark.parametrize(
+    ("values", "dtype"),
+    [
+        (np.array([1, 2, 3]), np.int32),
+        (np.array([-(2**31), 2**31 - 1]), np.int32),
+        (np.array([0, 2**31]), np.int64),
+        (np.array([1.0, -5.0]), np.int32),
+        (np.array([0.0, 2.0**40]), np.int64),
+        (np.array([0.0, 2.0**63]), np.float64),  # too large for int64
+        (np.array([1.0, 1.5]), np.float64),
+        (np.array([1.0, np.nan]), np.float64),
+        (np.array([1.0, np.inf]), np.float64),
+        (np.array([], dtype=np.int64), np.int64),
+    ],
+)
+def test_compact_dtype(values, dtype):
+    """
+    Tests that the smallest integer dtype that holds the values exactly is
+    returned for integer-valued data, and the data's dtype otherwise.
+    """
+    assert_equal(compact_dtype(values), dtype)
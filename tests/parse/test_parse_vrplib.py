@@ -7,6 +7,7 @@ from pytest import mark
 
 from vrplib.parse.parse_vrplib import (
     group_specifications_and_sections,
+    iter_vrplib,
     parse_section,
     parse_specification,
     parse_vrplib,
@@ -77,6 +78,66 @@ def test_group_specifications_and_sections():
     assert_equal(actual_sections, [sections[:3], sections[3:]])
 
 
+def test_iter_vrplib():
+    """
+    Tests that iter_vrplib yields parsed specifications and section names
+    with their unparsed data lines, skipping empty and comment lines.
+    """
+    lines = [
+        "NAME: Test",
+        "# comment",
+        "DIMENSION: 2",
+        "",
+        "NODE_COORD_SECTION",
+        "1 0 0",
+        "2 1 1",
+        "DEMAND_SECTION",
+        "1 0",
+        "2 5",
+        "EOF",
+    ]
+
+    events = [
+        (kind, name, list(value) if kind == "section" else value)
+        for kind, name, value in iter_vrplib(lines)
+    ]
+
+    assert_equal(
+        events,
+        [
+            ("specification", "name", "Test"),
+            ("specification", "dimension", 2),
+            ("section", "node_coord", ["1 0 0", "2 1 1"]),
+            ("section", "demand", ["1 0", "2 5"]),
+        ],
+    )
+
+
+def test_iter_vrplib_is_lazy():
+    """
+    Tests that iter_vrplib only reads the lines needed for the next event,
+    and that unconsumed section lines are skipped.
+    """
+    consumed = []
+
+    def lines():
+        for line in ["NAME: Test", "DEPOT_SECTION", "1", "-1", "TYPE: CVRP"]:
+            consumed.append(line)
+            yield line
+
+    events = iter_vrplib(lines())
+    assert_equal(next(events), ("specification", "name", "Test"))
+    assert_equal(consumed, ["NAME: Test"])
+
+    kind, name, _ = next(events)  # do not consume the section's lines
+    assert_equal((kind, name), ("section", "depot"))
+
+    # The remaining depot lines are skipped, after which the specification
+    # that follows the section is invalid.
+    with assert_raises(ValueError):
+        next(events)
+
+
 @mark.parametrize(
     "line, key, value",
     [
@@ -130,6 +191,16 @@ def test_parse_specification(line, key, value):
             ["VEHICLES_ALLOWED_CLIENTS_SECTION", "1 2 3 4", "2 4 5", "3 6"],
             ["vehicles_allowed_clients", [[2, 3, 4], [4, 5], [6]]],
         ),
+        (
+            # Mixed integer and float values
+            ["NODE_COORD_SECTION", "1  0  0.5", "2  1  2"],
+            ["node_coord", np.array([[0, 0.5], [1, 2]])],
+        ),
+        (
+            # Non-numeric values
+            ["VEHICLE_TYPE_SECTION", "1  truck", "2  bike"],
+            ["vehicle_type", np.array(["truck", "bike"])],
+        ),
     ],
 )
 def test_parse_section(lines, desired):
@@ -231,6 +302,49 @@ def test_parse_vrplib_do_not_compute_edge_weights():
     assert_("edge_weight" not in actual)
 
 
+@mark.parametrize(
+    "sections, desired",
+    [
+        (["service_time"], ["service_time"]),
+        (
+            ["SERVICE_TIME_SECTION", "node_coord"],
+            ["node_coord", "service_time"],
+        ),
+        (["edge_weight"], ["edge_weight"]),
+        ([], []),
+    ],
+)
+def test_parse_vrplib_sections(sections, desired):
+    """
+    Tests that only the given sections are parsed, that the specifications
+    are always parsed, and that edge weights are only computed if requested.
+    """
+    instance = "\n".join(
+        [
+            "NAME: VRPLIB",
+            "EDGE_WEIGHT_TYPE: FLOOR_2D",
+            "NODE_COORD_SECTION",
+            "1  0   1",
+            "2  1   0",
+            "SERVICE_TIME_SECTION",
+            "1  1",
+            "2  1",
+            "TIME_WINDOW_SECTION",
+            "1  1   2",
+            "2  1   2",
+            "EOF",
+        ]
+    )
+    actual = parse_vrplib(instance, sections=sections)
+    full = parse_vrplib(instance)
+
+    assert_equal(
+        sorted(actual), sorted(["name", "edge_weight_type", *desired])
+    )
+    for key in actual:
+        assert_equal(actual[key], full[key])
+
+
 def test_parse_vrplib_raises_data_specification_and_section():
     """
     Tests that a ValueError is raised when data is included both as
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from numpy.testing import assert_equal
+
+from vrplib.read import iter_sections
+
+DATA_DIR = Path("tests/data/")
+
+
+def test_iter_sections_path_and_file():
+    """
+    Tests that iter_sections yields the same events for a file path and for
+    an open file.
+    """
+    path = DATA_DIR / "E-n13-k4.vrp"
+
+    def collect(events):
+        return [
+            (kind, name, list(value) if kind == "section" else value)
+            for kind, name, value in events
+        ]
+
+    from_path = collect(iter_sections(path))
+
+    with open(path, "r") as fh:
+        from_file = collect(iter_sections(fh))
+
+    assert_equal(from_path, from_file)
+    assert_equal(from_path[0], ("specification", "name", "E-n13-k4"))
+
+    sections = [name for kind, name, _ in from_path if kind == "section"]
+    assert_equal(sections, ["edge_weight", "demand", "depot"])
+
+
+def test_iter_sections_stops_early(tmp_path):
+    """
+    Tests that iter_sections can be used to read only the specifications,
+    without parsing the remainder of the file.
+    """
+    path = tmp_path / "instance.vrp"
+    path.write_text("NAME: Test\nDIMENSION: 3\nNODE_COORD_SECTION\n1 0 0\n")
+
+    specs = {}
+    for kind, name, value in iter_sections(path):
+        if kind == "section":
+            break
+
+        specs[name] = value
+
+    assert_equal(specs, {"name": "Test", "dimension": 3})
@@ -0,0 +1,171 @@
+import functools
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from numpy.testing import assert_, assert_equal, assert_raises
+
+import vrplib.read.memory_cache
+from vrplib.read import InstanceCache, read_instance
+
+DATA_DIR = Path("tests/data/")
+
+
+def test_read_instance_equals_uncached():
+    """
+    Tests that the cache returns the same instance data as ``read_instance``
+    for different parse options, and that repeated reads are cache hits that
+    share the same read-only arrays.
+    """
+    cache = InstanceCache()
+    path = DATA_DIR / "C101.txt"
+
+    first = cache.read_instance(path, "solomon")
+    second = cache.read_instance(str(path), instance_format="solomon")
+    assert_equal(first, read_instance(path, "solomon"))
+    assert_equal(cache.misses, 1)
+    assert_equal(cache.hits, 1)
+    assert_(second["edge_weight"] is first["edge_weight"])
+    assert_(second is not first)
+
+    for value in first.values():
+        if isinstance(value, np.ndarray):
+            assert_(not value.flags.writeable)
+
+    with assert_raises(ValueError):
+        first["edge_weight"][0, 1] = 0
+
+    # Different parse options are cached separately.
+    single = cache.read_instance(path, "solomon", dtype="float32")
+    assert_equal(single["edge_weight"].dtype, np.float32)
+    assert_equal(cache.misses, 2)
+    assert_equal(len(cache), 2)
+
+
+def test_reads_changed_file_again(tmp_path):
+    """
+    Tests that an instance is read again once its modification time changes.
+    """
+    path = tmp_path / "E-n13-k4.vrp"
+    shutil.copy(DATA_DIR / "E-n13-k4.vrp", path)
+
+    cache = InstanceCache()
+    first = cache.read_instance(path)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = cache.read_instance(path)
+
+    assert_equal(cache.misses, 2)
+    assert_equal(len(cache), 1)
+    assert_(second["edge_weight"] is not first["edge_weight"])
+    assert_equal(second["edge_weight"], first["edge_weight"])
+
+
+def test_evicts_least_recently_used_by_bytes():
+    """
+    Tests that the least recently used instances are evicted once the
+    arrays of all cached instances exceed the maximum number of bytes.
+    """
+    paths = [DATA_DIR / name for name in ["E-n13-k4.vrp", "P-n16-k8.vrp"]]
+    sizes = []
+
+    for path in paths:
+        cache = InstanceCache()
+        cache.read_instance(path)
+        sizes.append(cache.nbytes)
+
+    cache = InstanceCache(max_bytes=sum(sizes))
+    cache.read_instance(paths[0])
+    cache.read_instance(paths[1])
+    assert_equal(cache.nbytes, sum(sizes))
+
+    cache.read_instance(paths[0])  # now the most recently used instance
+    cache.read_instance(paths[1], dtype="float32")  # evicts paths[1]
+
+    assert_equal(len(cache), 2)
+    assert_(cache.nbytes <= cache.max_bytes)
+
+    cache.read_instance(paths[0])
+    assert_equal(cache.misses, 3)
+
+
+def test_does_not_cache_too_large_instances():
+    """
+    Tests that instances that are larger than the maximum number of bytes
+    are returned, but not cached.
+    """
+    cache = InstanceCache(max_bytes=100)
+    instance = cache.read_instance(DATA_DIR / "E-n13-k4.vrp")
+
+    assert_equal(instance["dimension"], 13)
+    assert_equal(len(cache), 0)
+    assert_equal(cache.nbytes, 0)
+
+
+def test_coalesces_concurrent_misses(monkeypatch):
+    """
+    Tests that concurrent reads of the same uncached instance read the file
+    only once, and all return the same arrays.
+    """
+    release = threading.Event()
+    calls = []
+
+    @functools.wraps(read_instance)
+    def slow_read_instance(*args, **kwargs):
+        calls.append(args)
+        release.wait(timeout=5)
+        return read_instance(*args, **kwargs)
+
+    monkeypatch.setattr(
+        vrplib.read.memory_cache, "read_instance", slow_read_instance
+    )
+
+    cache = InstanceCache()
+    path = DATA_DIR / "X-n101-k25.vrp"
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [
+            executor.submit(cache.read_instance, path) for _ in range(8)
+        ]
+        time.sleep(0.1)  # lets the other threads wait for the first read
+        release.set()
+        instances = [future.result() for future in futures]
+
+    assert_equal(len(calls), 1)
+    assert_equal(cache.misses, 1)
+    assert_equal(cache.hits, 7)
+
+    for instance in instances:
+        assert_(instance["edge_weight"] is instances[0]["edge_weight"])
+
+
+def test_failed_read_is_not_cached(tmp_path):
+    """
+    Tests that errors are raised to the caller, and that failed reads are
+    not cached.
+    """
+    path = tmp_path / "instance.vrp"
+    path.write_text("invalid")
+    cache = InstanceCache()
+
+    with assert_raises(RuntimeError):
+        cache.read_instance(path)
+
+    assert_equal(len(cache), 0)
+
+    shutil.copy(DATA_DIR / "E-n13-k4.vrp", path)
+    assert_equal(cache.read_instance(path)["dimension"], 13)
+
+
+def test_raises_lazy_instance():
+    """
+    Tests that lazy instances, which parse sections on access, cannot be
+    cached.
+    """
+    with assert_raises(ValueError):
+        InstanceCache().read_instance(DATA_DIR / "E-n13-k4.vrp", lazy=True)
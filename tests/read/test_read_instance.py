@@ -1,8 +1,14 @@
+import gzip
+import os
+import shutil
+from pathlib import Path
+
 import numpy as np
 from numpy.testing import assert_, assert_equal, assert_raises
 from pytest import mark
 
-from vrplib.read import read_instance
+from vrplib.parse.distances import LazyEdgeWeight
+from vrplib.read import LazyInstance, read_instance
 
 
 @mark.parametrize("instance_format", ["CVRPLIB", "LKH", "VRP"])
@@ -115,3 +121,300 @@ def test_do_not_compute_edge_weights(tmp_path):
 
     instance = read_instance(tmp_path / name, "solomon", False)
     assert_("edge_weight" not in instance)
+
+
+def test_lazy_edge_weights(tmp_path):
+    """
+    Tests that the edge weights are returned as a lazy edge weight object
+    when requested, for both VRPLIB and Solomon instances.
+    """
+    (tmp_path / "vrplib.txt").write_text("\n".join(VRPLIB_INSTANCE))
+    instance = read_instance(tmp_path / "vrplib.txt", lazy_edge_weights=True)
+
+    assert_(isinstance(instance["edge_weight"], LazyEdgeWeight))
+    assert_equal(np.asarray(instance["edge_weight"]), [[0, 1], [1, 0]])
+
+    (tmp_path / "solomon.txt").write_text("\n".join(SOLOMON_INSTANCE))
+    instance = read_instance(
+        tmp_path / "solomon.txt", "solomon", lazy_edge_weights=True
+    )
+
+    dist = ((40 - 45) ** 2 + (50 - 68) ** 2) ** 0.5
+    assert_(isinstance(instance["edge_weight"], LazyEdgeWeight))
+    assert_equal(instance["edge_weight"][0, 1], dist)
+
+
+def test_edge_weights_dtype(tmp_path):
+    """
+    Tests that the edge weights are returned in the requested dtype.
+    """
+    (tmp_path / "vrplib.txt").write_text("\n".join(VRPLIB_INSTANCE))
+    instance = read_instance(tmp_path / "vrplib.txt", dtype=np.float32)
+
+    assert_equal(instance["edge_weight"].dtype, np.float32)
+    assert_equal(instance["edge_weight"], [[0, 1], [1, 0]])
+
+
+def test_cache(tmp_path):
+    """
+    Tests that a cached instance is stored on the first read, and loaded
+    with memory-mapped arrays on subsequent reads.
+    """
+    path = tmp_path / "vrplib.txt"
+    path.write_text("\n".join(VRPLIB_INSTANCE))
+    cache_dir = tmp_path / "cache"
+
+    desired = read_instance(path)
+    first = read_instance(path, cache=cache_dir)
+    second = read_instance(path, cache=cache_dir)
+
+    assert_(cache_dir.exists())
+    assert_equal(first, desired)
+    assert_equal(second, desired)
+    assert_equal(list(second.keys()), list(desired.keys()))
+    assert_(isinstance(second["edge_weight"], np.memmap))
+    assert_(not second["edge_weight"].flags.writeable)
+
+
+def test_cache_invalidated_when_file_changes(tmp_path):
+    """
+    Tests that a cached instance is not used when the file content changes,
+    but is still used when only the modification time changes.
+    """
+    path = tmp_path / "vrplib.txt"
+    path.write_text("\n".join(VRPLIB_INSTANCE))
+    read_instance(path, cache=True)
+
+    # Same content, different modification time: uses the cache.
+    os.utime(path, ns=(0, 0))
+    instance = read_instance(path, cache=True)
+    assert_(isinstance(instance["node_coord"], np.memmap))
+
+    # Different content of the same size: parses the file again.
+    path.write_text("\n".join(VRPLIB_INSTANCE).replace("0  1", "1  1"))
+    instance = read_instance(path, cache=True)
+    assert_equal(instance["node_coord"], [[0, 0], [1, 1]])
+    assert_(not isinstance(instance["node_coord"], np.memmap))
+
+    # Parse options are part of the cache key.
+    instance = read_instance(path, compute_edge_weights=False, cache=True)
+    assert_("edge_weight" not in instance)
+
+
+def test_cache_entry_removed_is_miss(tmp_path):
+    """
+    Tests that a cache entry whose arrays were removed, e.g., by a concurrent
+    read after the entry's metadata was read, is treated as a miss.
+    """
+    path = tmp_path / "vrplib.txt"
+    path.write_text("\n".join(VRPLIB_INSTANCE))
+    cache_dir = tmp_path / "cache"
+    desired = read_instance(path, cache=cache_dir)
+
+    for array_file in cache_dir.rglob("*.npy"):
+        array_file.unlink()
+
+    instance = read_instance(path, cache=cache_dir)
+    assert_equal(instance, desired)
+    assert_(not isinstance(instance["edge_weight"], np.memmap))
+
+    # The entry is stored again.
+    instance = read_instance(path, cache=cache_dir)
+    assert_(isinstance(instance["edge_weight"], np.memmap))
+
+
+def test_cache_raises_edge_weight_file(tmp_path):
+    """
+    Tests that caching cannot be combined with an edge weight file, since a
+    cached instance would not write the edge weights to the file.
+    """
+    path = tmp_path / "vrplib.txt"
+    path.write_text("\n".join(VRPLIB_INSTANCE))
+
+    with assert_raises(ValueError):
+        read_instance(path, cache=True, edge_weight_file=tmp_path / "ew.npy")
+
+
+def test_edge_weight_file_raises_solomon(tmp_path):
+    """
+    Tests that an edge weight file cannot be combined with Solomon
+    instances, which have no explicit edge weights to write to it.
+    """
+    path = tmp_path / "solomon.txt"
+    path.write_text("\n".join(SOLOMON_INSTANCE))
+
+    with assert_raises(ValueError):
+        read_instance(path, "solomon", edge_weight_file=tmp_path / "ew.npy")
+
+    assert_(not (tmp_path / "ew.npy").exists())
+
+
+def test_cache_lazy_edge_weights(tmp_path):
+    """
+    Tests that lazy edge weights are restored from the cached coordinates.
+    """
+    path = tmp_path / "solomon.txt"
+    path.write_text("\n".join(SOLOMON_INSTANCE))
+
+    kwargs = {"lazy_edge_weights": True, "cache": tmp_path / "cache"}
+    read_instance(path, "solomon", **kwargs)
+    instance = read_instance(path, "solomon", **kwargs)
+
+    dist = ((40 - 45) ** 2 + (50 - 68) ** 2) ** 0.5
+    assert_(isinstance(instance["edge_weight"], LazyEdgeWeight))
+    assert_equal(instance["edge_weight"][1, 0], dist)
+    assert_equal(instance["capacity"], 200)
+
+
+@mark.parametrize("name", ["ORTEC-n242-k12.vrp", "E-n13-k4.vrp"])
+def test_edge_weight_file(tmp_path, name):
+    """
+    Tests that explicit edge weights are streamed into a memory-mapped file
+    when an edge weight file is given, and that the instance is the same.
+    """
+    path = Path("tests/data") / name
+    edge_weight_file = tmp_path / "edge_weight.npy"
+    instance = read_instance(path, edge_weight_file=edge_weight_file)
+
+    assert_(isinstance(instance["edge_weight"], np.memmap))
+    assert_equal(instance, read_instance(path))
+    assert_equal(np.load(edge_weight_file), instance["edge_weight"])
+
+
+def test_read_instance_auto_dtype():
+    """
+    Tests that the "auto" dtype stores integer-valued edge weights and data
+    sections in compact integer dtypes, without changing their values.
+    """
+    path = "tests/data/E-n13-k4.vrp"  # explicit integer edge weights
+    default = read_instance(path)
+    auto = read_instance(path, dtype="auto")
+
+    assert_equal(auto["edge_weight"].dtype, np.int32)
+    assert_equal(auto["demand"].dtype, np.int32)
+    assert_equal(auto["depot"].dtype, np.int32)
+
+    for key, value in default.items():
+        assert_equal(auto[key], value)
+
+    solomon = read_instance("tests/data/C101.txt", "solomon", dtype="auto")
+    assert_equal(solomon["time_window"].dtype, np.int32)
+    assert_equal(solomon["edge_weight"].dtype, np.float64)  # not rounded
+
+
+@mark.parametrize(
+    "path, instance_format",
+    [
+        ("tests/data/X-n101-k25.vrp", "vrplib"),  # from node coordinates
+        ("tests/data/E-n13-k4.vrp", "vrplib"),  # explicit edge weights
+        ("tests/data/C101.txt", "solomon"),
+    ],
+)
+def test_read_instance_neighbours(path, instance_format):
+    """
+    Tests that the neighbours are the nearest locations in the dense edge
+    weight matrix, and that no dense matrix is computed for them.
+    """
+    dense = read_instance(path, instance_format)["edge_weight"]
+    instance = read_instance(path, instance_format, neighbours=5)
+
+    indptr = instance["neighbour_indptr"]
+    neighbours = instance["neighbours"]
+    weights = instance["neighbour_weight"]
+    assert_equal(indptr, np.arange(0, 5 * len(dense) + 1, 5))
+
+    for idx in range(len(dense)):
+        nbs = neighbours[indptr[idx] : indptr[idx + 1]]
+        others = np.delete(dense[idx], idx)
+        assert_equal(weights[indptr[idx] : indptr[idx + 1]], dense[idx, nbs])
+        assert_equal(dense[idx, nbs], np.sort(others)[:5])
+        assert_(idx not in nbs)
+
+    if "EXPLICIT" not in instance.get("edge_weight_type", ""):
+        assert_("edge_weight" not in instance)
+
+
+@mark.parametrize(
+    "path, instance_format",
+    [
+        ("tests/data/X-n101-k25.vrp", "vrplib"),
+        ("tests/data/C101.txt", "solomon"),
+    ],
+)
+def test_read_instance_sections(path, instance_format):
+    """
+    Tests that only the given sections are read, and that edge weights are
+    not computed unless requested.
+    """
+    full = read_instance(path, instance_format)
+    instance = read_instance(path, instance_format, sections=["demand"])
+
+    assert_("demand" in instance)
+    assert_("node_coord" not in instance)
+    assert_("edge_weight" not in instance)
+    assert_equal(instance["demand"], full["demand"])
+    assert_equal(instance["capacity"], full["capacity"])
+
+    with_weights = read_instance(
+        path, instance_format, sections=["edge_weight"]
+    )
+    assert_equal(with_weights["edge_weight"], full["edge_weight"])
+    assert_("node_coord" not in with_weights)
+
+
+@mark.parametrize(
+    "name", ["X-n101-k25.vrp", "E-n13-k4.vrp", "ORTEC-n242-k12.vrp"]
+)
+def test_read_instance_lazy(tmp_path, name):
+    """
+    Tests that a lazy instance parses each section on first access, and that
+    it has the same data as the fully parsed instance, also when compressed.
+    """
+    path = Path("tests/data") / name
+    full = read_instance(path)
+
+    gz_path = tmp_path / (name + ".gz")
+    with open(path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+    for lazy_path in [path, gz_path]:
+        instance = read_instance(lazy_path, lazy=True)
+        assert_(isinstance(instance, LazyInstance))
+        assert_equal(list(instance), list(full))
+        assert_equal(instance.parsed, [])
+
+        assert_equal(instance["demand"], full["demand"])
+        assert_equal(instance.parsed, ["demand"])
+
+        assert_equal(dict(instance), full)
+
+
+def test_read_instance_lazy_sections():
+    """
+    Tests that a lazy instance only contains the given sections.
+    """
+    path = "tests/data/X-n101-k25.vrp"
+    instance = read_instance(path, lazy=True, sections=["edge_weight"])
+
+    assert_("node_coord" not in instance)
+    assert_("demand" not in instance)
+    assert_equal(instance["edge_weight"], read_instance(path)["edge_weight"])
+
+    with assert_raises(KeyError):
+        instance["demand"]
+
+
+@mark.parametrize(
+    "kwargs",
+    [
+        {"instance_format": "solomon"},
+        {"cache": True},
+        {"neighbours": 5},
+    ],
+)
+def test_read_instance_lazy_raises_unsupported_options(kwargs):
+    """
+    Tests that lazy reading raises for options it does not support.
+    """
+    with assert_raises(ValueError):
+        read_instance("tests/data/C101.txt", lazy=True, **kwargs)
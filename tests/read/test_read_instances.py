@@ -0,0 +1,119 @@
+import gzip
+import shutil
+from pathlib import Path
+
+from numpy.testing import assert_, assert_equal, assert_raises
+from pytest import mark
+
+from vrplib.read import read_instance, read_instances, read_solution
+from vrplib.read.read_instances import detect_format
+
+DATA_DIR = Path("tests/data/")
+
+
+@mark.parametrize(
+    "name, desired",
+    [("C101.txt", "solomon"), ("E-n13-k4.vrp", "vrplib")],
+)
+def test_detect_format(name, desired):
+    """
+    Tests that the instance format is detected from the file contents.
+    """
+    assert_equal(detect_format(DATA_DIR / name), desired)
+
+
+@mark.parametrize("executor", ["process", "thread"])
+def test_read_instances(tmp_path, executor):
+    """
+    Tests that instances of both formats are read from a glob pattern, and
+    that they are paired with their solutions.
+    """
+    for name in ["C101.txt", "C101.sol", "E-n13-k4.vrp", "E-n13-k4.sol"]:
+        shutil.copy(DATA_DIR / name, tmp_path)
+
+    results = list(read_instances(tmp_path / "*", 2, executor))
+    paths = [Path(result["path"]).name for result in results]
+    assert_equal(paths, ["C101.txt", "E-n13-k4.vrp"])
+
+    for result in results:
+        path = Path(result["path"])
+        fmt = "solomon" if path.suffix == ".txt" else "vrplib"
+
+        assert_(result["error"] is None)
+        assert_equal(result["instance"], read_instance(path, fmt))
+        assert_equal(
+            result["solution"], read_solution(path.with_suffix(".sol"))
+        )
+
+
+def test_read_instances_recursive_glob():
+    """
+    Tests that a ``**`` pattern matches the instances in all subdirectories,
+    e.g., of the LKH-3 benchmark tree.
+    """
+    results = list(read_instances(DATA_DIR / "lkh-3" / "**" / "*.vrp"))
+    paths = sorted(DATA_DIR.glob("lkh-3/**/*.vrp"))
+
+    assert_equal(len(results), 10)
+    assert_equal([Path(result["path"]) for result in results], paths)
+    assert_(all(result["error"] is None for result in results))
+
+
+def test_read_instances_captures_errors(tmp_path):
+    """
+    Tests that an error while reading one file is returned for that file,
+    without aborting the other files.
+    """
+    invalid = DATA_DIR / "NoColonSpecification.txt"
+    paths = [invalid, DATA_DIR / "A-n32-k5.vrp"]
+    results = list(read_instances(paths, executor="thread", ordered=False))
+
+    by_path = {Path(result["path"]).name: result for result in results}
+    assert_(isinstance(by_path[invalid.name]["error"], RuntimeError))
+    assert_(by_path[invalid.name]["instance"] is None)
+
+    assert_(by_path["A-n32-k5.vrp"]["error"] is None)
+    assert_equal(by_path["A-n32-k5.vrp"]["instance"]["dimension"], 32)
+
+
+def test_read_instances_passes_arguments():
+    """
+    Tests that additional keyword arguments are passed to read_instance.
+    """
+    path = DATA_DIR / "A-n32-k5.vrp"
+    kwargs = {"executor": "thread", "compute_edge_weights": False}
+    (result,) = read_instances([path], **kwargs)
+
+    assert_("edge_weight" not in result["instance"])
+
+
+def test_read_instances_raises_invalid_arguments():
+    """
+    Tests that a ValueError is raised for an unknown executor or an invalid
+    number of workers.
+    """
+    with assert_raises(ValueError):
+        list(read_instances([], executor="cluster"))
+
+    with assert_raises(ValueError):
+        list(read_instances([], workers=0))
+
+
+def test_read_instances_compressed(tmp_path):
+    """
+    Tests that compressed instances are read and paired with their
+    (compressed) solutions, and that compressed solution files matched by
+    the pattern are not read as instances.
+    """
+    for name in ["E-n13-k4.vrp", "E-n13-k4.sol"]:
+        with (
+            open(DATA_DIR / name, "rb") as src,
+            gzip.open(tmp_path / f"{name}.gz", "wb") as dst,
+        ):
+            shutil.copyfileobj(src, dst)
+
+    (result,) = read_instances(tmp_path / "*", executor="thread")
+
+    assert_equal(Path(result["path"]).name, "E-n13-k4.vrp.gz")
+    assert_equal(result["instance"], read_instance(DATA_DIR / "E-n13-k4.vrp"))
+    assert_equal(result["solution"], read_solution(DATA_DIR / "E-n13-k4.sol"))
@@ -0,0 +1,69 @@
+import gzip
+import shutil
+from pathlib import Path
+
+from numpy.testing import assert_equal, assert_raises
+from pytest import mark
+
+from vrplib.read import read_instance, read_metadata
+
+DATA_DIR = Path("tests/data/")
+
+
+@mark.parametrize("name", ["X-n101-k25.vrp", "E-n13-k4.vrp", "Li_21.vrp"])
+def test_read_metadata_vrplib(name):
+    """
+    Tests that the metadata of VRPLIB instances are the specifications of
+    the instance.
+    """
+    instance = read_instance(DATA_DIR / name, compute_edge_weights=False)
+    desired = {
+        key: value
+        for key, value in instance.items()
+        if isinstance(value, (str, int, float))
+    }
+
+    assert_equal(read_metadata(DATA_DIR / name), desired)
+
+
+def test_read_metadata_solomon(tmp_path):
+    """
+    Tests that the metadata of Solomon instances are the name, number of
+    vehicles and capacity, also when the instance is compressed.
+    """
+    gz_path = tmp_path / "C101.txt.gz"
+    with (
+        open(DATA_DIR / "C101.txt", "rb") as src,
+        gzip.open(gz_path, "wb") as dst,
+    ):
+        shutil.copyfileobj(src, dst)
+
+    desired = {"name": "C101", "vehicles": 25, "capacity": 200}
+
+    assert_equal(read_metadata(DATA_DIR / "C101.txt", "solomon"), desired)
+    assert_equal(read_metadata(gz_path, "solomon"), desired)
+
+
+def test_read_metadata_does_not_read_sections(tmp_path):
+    """
+    Tests that the lines after the first section are not read, so that even
+    invalid data there does not raise.
+    """
+    path = tmp_path / "test.vrp"
+    path.write_text("NAME: test\nDIMENSION: 2\nNODE_COORD_SECTION\nTYPE: X\n")
+
+    assert_equal(read_metadata(path), {"name": "test", "dimension": 2})
+
+    with assert_raises(ValueError):
+        read_instance(path)
+
+
+def test_read_metadata_raises_invalid_solomon_instance():
+    """
+    Tests that an error is raised if the Solomon header is invalid.
+    """
+    with assert_raises(RuntimeError):
+        read_metadata(DATA_DIR / "X-n101-k25.vrp", "solomon")
+
+    with assert_raises(ValueError):
+        read_metadata(DATA_DIR / "C101.txt", "cvrplib")
@@ -1,6 +1,7 @@
 from numpy.testing import assert_equal
 
-from vrplib import read_solution
+from vrplib import read_solution, write_solution
+from vrplib.parse import CompactRoutes
 
 
 def test_read_dummy_solution(tmp_path):
@@ -32,3 +33,16 @@ def test_read_dummy_solution(tmp_path):
     }
 
     assert_equal(read_solution(tmp_path / name), target)
+
+
+def test_read_solution_compact_routes(tmp_path):
+    """
+    Tests that a written solution is read back as the same compact routes.
+    """
+    routes = CompactRoutes.from_routes([[1, 2], [3, 4], [5]])
+    write_solution(tmp_path / "test.sol", routes, {"Cost": 100})
+
+    solution = read_solution(tmp_path / "test.sol", compact_routes=True)
+
+    assert_equal(solution["routes"] == routes, True)
+    assert_equal(solution["cost"], 100)
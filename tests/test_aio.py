@@ -0,0 +1,220 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from numpy.testing import assert_, assert_equal
+from pytest import fixture, raises
+
+import vrplib
+from vrplib import (
+    aread_instance,
+    aread_solution,
+    awrite_instance,
+    awrite_solution,
+    read_instance,
+    read_solution,
+    set_executor,
+)
+from vrplib.cancellation import check_cancelled, run_cancellable
+from vrplib.parse.parse_distances import pairwise_distances
+
+DATA_DIR = Path("tests/data/")
+
+
+@fixture(autouse=True)
+def default_executor():
+    """
+    Restores the default executor configuration after each test.
+    """
+    yield
+    set_executor(None, os.cpu_count() or 1)
+
+
+def test_aread_equals_read():
+    """
+    Tests that the asynchronous reads return the same data as the
+    synchronous reads, also when the arguments are passed along.
+    """
+
+    async def main():
+        return await asyncio.gather(
+            aread_instance(DATA_DIR / "X-n101-k25.vrp"),
+            aread_instance(DATA_DIR / "C101.txt", "solomon"),
+            aread_solution(DATA_DIR / "C101.sol"),
+        )
+
+    vrp, solomon, solution = asyncio.run(main())
+
+    assert_equal(vrp, read_instance(DATA_DIR / "X-n101-k25.vrp"))
+    assert_equal(solomon, read_instance(DATA_DIR / "C101.txt", "solomon"))
+    assert_equal(solution, read_solution(DATA_DIR / "C101.sol"))
+
+
+def test_awrite_equals_write(tmp_path):
+    """
+    Tests that the asynchronous writes write the same files as the
+    synchronous writes.
+    """
+    instance = {"name": "test", "node_coord": [[0, 0], [1, 1]]}
+    routes = [[1], [2, 3]]
+
+    async def main():
+        await awrite_instance(tmp_path / "async.vrp", instance)
+        await awrite_solution(tmp_path / "async.sol", routes, {"cost": 3})
+
+    asyncio.run(main())
+    vrplib.write_instance(tmp_path / "sync.vrp", instance)
+    vrplib.write_solution(tmp_path / "sync.sol", routes, {"cost": 3})
+
+    for ext in ["vrp", "sol"]:
+        actual = (tmp_path / f"async.{ext}").read_text()
+        assert_equal(actual, (tmp_path / f"sync.{ext}").read_text())
+
+
+def test_max_concurrency(monkeypatch):
+    """
+    Tests that no more than the maximum number of calls run at once, even
+    if the executor has more workers.
+    """
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def read_instance(path):
+        nonlocal running, peak
+
+        with lock:
+            running += 1
+            peak = max(peak, running)
+
+        time.sleep(0.02)
+
+        with lock:
+            running -= 1
+
+        return path
+
+    monkeypatch.setattr(vrplib.aio, "read_instance", read_instance)
+    set_executor(ThreadPoolExecutor(8), max_concurrency=2)
+
+    async def main():
+        return await asyncio.gather(*(aread_instance(i) for i in range(8)))
+
+    assert_equal(asyncio.run(main()), list(range(8)))
+    assert_equal(peak, 2)
+
+
+def test_max_concurrency_raises_not_positive():
+    """
+    Tests that the maximum concurrency must be positive.
+    """
+    with raises(ValueError):
+        set_executor(max_concurrency=0)
+
+
+def test_set_executor_changes_only_given_settings(monkeypatch):
+    """
+    Tests that each argument of ``set_executor`` only changes its own
+    setting.
+    """
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def read_instance(path):
+        nonlocal running, peak
+
+        with lock:
+            running += 1
+            peak = max(peak, running)
+
+        time.sleep(0.02)
+
+        with lock:
+            running -= 1
+
+        return threading.current_thread().name
+
+    monkeypatch.setattr(vrplib.aio, "read_instance", read_instance)
+
+    async def main():
+        return await asyncio.gather(*(aread_instance(i) for i in range(4)))
+
+    with ThreadPoolExecutor(4, thread_name_prefix="custom") as executor:
+        set_executor(executor)
+        set_executor(max_concurrency=1)  # keeps the executor
+        names = asyncio.run(main())
+
+        assert_(all(name.startswith("custom") for name in names))
+        assert_equal(peak, 1)
+
+        set_executor(None)  # keeps the maximum concurrency
+        names = asyncio.run(main())
+
+        assert_(not any(name.startswith("custom") for name in names))
+        assert_equal(peak, 1)
+
+
+def test_cancelled_call_frees_worker(monkeypatch):
+    """
+    Tests that a running call that times out stops at its next cancellation
+    check, so that the worker is free for the next call.
+    """
+    finished = threading.Event()
+
+    def read_instance(path):
+        for _ in range(500):
+            check_cancelled()
+            time.sleep(0.01)
+
+        finished.set()
+
+    monkeypatch.setattr(vrplib.aio, "read_instance", read_instance)
+    set_executor(ThreadPoolExecutor(1), max_concurrency=1)
+
+    async def main():
+        with raises(asyncio.TimeoutError):
+            await asyncio.wait_for(aread_instance("slow"), timeout=0.05)
+
+        start = time.perf_counter()
+        solution = await aread_solution(DATA_DIR / "C101.sol")
+        return solution, time.perf_counter() - start
+
+    solution, duration = asyncio.run(main())
+
+    assert_equal(solution, read_solution(DATA_DIR / "C101.sol"))
+    assert_(duration < 1)  # the full call takes five seconds
+    assert_(not finished.is_set())
+
+
+def test_run_cancellable():
+    """
+    Tests that a cancelled call stops at the next cancellation check, and
+    that an uncancelled call is not affected.
+    """
+    event = threading.Event()
+    path = DATA_DIR / "X-n101-k25.vrp"
+    assert_equal(
+        run_cancellable(event, read_instance, path)["name"], "X-n101-k25"
+    )
+
+    event.set()
+    with raises(CancelledError):
+        run_cancellable(event, read_instance, path)
+
+
+def test_run_cancellable_computed_distances():
+    """
+    Tests that computing a distance matrix stops between blocks when the
+    call is cancelled.
+    """
+    coords = np.random.default_rng(1).integers(0, 1000, size=(100, 2))
+    event = threading.Event()
+    event.set()
+
+    with raises(CancelledError):
+        run_cancellable(event, pairwise_distances, coords, "EUC_2D")
@@ -0,0 +1,74 @@
+import json
+import os
+
+from numpy.testing import assert_, assert_equal
+
+from benchmarks import cases
+from benchmarks.__main__ import main
+from benchmarks.measure import measure_case
+from vrplib.parse.parse_distances import EXPLICIT_FORMATS
+
+
+def test_synthetic_cases_cover_all_sizes_and_formats():
+    """
+    Tests that the synthetic cases cover every explicit edge weight format,
+    and that dense matrix cases are skipped above the maximum matrix size.
+    """
+    names = cases.synthetic_cases((10, 100), max_matrix_size=10)
+
+    for fmt in EXPLICIT_FORMATS:
+        assert_(f"parse_distances[EXPLICIT,{fmt},n=10]" in names)
+        assert_(f"parse_distances[EXPLICIT,{fmt},n=100]" not in names)
+
+    assert_("parse_distances[EUC_2D,lazy,n=100]" in names)
+    assert_("nearest_neighbours[outlier,n=100]" in names)
+    assert_("write_instance[n=100]" in names)
+
+
+def test_synthetic_cases_run(tmp_path):
+    """
+    Tests that all synthetic cases run on small instances, and that the
+    writer cases write to the given output directory.
+    """
+    for setup in cases.synthetic_cases((10,), output_dir=tmp_path).values():
+        setup()()
+
+    assert_equal(os.listdir(tmp_path), [cases.OUTPUT_FILE])
+
+
+def test_measure_case():
+    """
+    Tests that measuring a case returns the wall time and memory usage, and
+    that the number of runs is bounded by the repeat argument.
+    """
+    result = measure_case("write_solution[n=10]", (10,), 10, 3, 1.0)
+
+    assert_equal(result["runs"], 3)
+    assert_(0 < result["time_min"] <= result["time_median"])
+    assert_(result["peak_alloc"] > 0)
+
+
+def test_compare(tmp_path, capsys):
+    """
+    Tests that compare mode flags cases that are slower or allocate more
+    memory than the baseline.
+    """
+    result = {"time_min": 1.0, "peak_alloc": 100}
+    baseline = {"results": {"a": result, "b": result, "c": result}}
+    current = {
+        "results": {
+            "a": {"time_min": 1.1, "peak_alloc": 100},  # within thresholds
+            "b": {"time_min": 2.0, "peak_alloc": 100},  # slower
+            "c": {"time_min": 1.0, "peak_alloc": 200},  # more memory
+        }
+    }
+
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(baseline))
+    current_path = tmp_path / "current.json"
+    current_path.write_text(json.dumps(current))
+
+    assert_equal(main(["compare", str(baseline_path), str(current_path)]), 1)
+    assert_("2 regression(s) found." in capsys.readouterr().out)
+
+    assert_equal(main(["compare", str(baseline_path), str(baseline_path)]), 0)
@@ -0,0 +1,93 @@
+import bz2
+import gzip
+import lzma
+import shutil
+
+from numpy.testing import assert_equal
+from pytest import mark
+
+from vrplib import read_instance, read_solution, write_instance, write_solution
+from vrplib.compression import detect_compression, open_text
+
+COMPRESSIONS = [
+    ("gzip", ".gz", gzip),
+    ("bz2", ".bz2", bz2),
+    ("xz", ".xz", lzma),
+]
+
+
+@mark.parametrize("name, ext, module", COMPRESSIONS)
+def test_detect_compression(tmp_path, name, ext, module):
+    """
+    Tests that the compression is detected from the extension when writing,
+    and from the magic bytes when reading, also without the extension.
+    """
+    path = tmp_path / f"instance{ext}"
+    assert_equal(detect_compression(path, "w"), name)
+
+    without_ext = tmp_path / "instance"
+    with module.open(without_ext, "wt") as fh:
+        fh.write("NAME: test\n")
+
+    assert_equal(detect_compression(without_ext, "r"), name)
+
+    with open_text(without_ext) as fh:
+        assert_equal(fh.read(), "NAME: test\n")
+
+
+def test_detect_no_compression(tmp_path):
+    """
+    Tests that plain text files are not detected as compressed.
+    """
+    path = tmp_path / "instance.vrp"
+    path.write_text("NAME: test\n")
+
+    assert_equal(detect_compression(path, "r"), None)
+    assert_equal(detect_compression(path, "w"), None)
+
+
+@mark.parametrize("name, ext, module", COMPRESSIONS)
+def test_read_compressed(tmp_path, name, ext, module):
+    """
+    Tests that compressed instances and solutions are read the same as the
+    uncompressed files.
+    """
+    for filename in ["C101.txt", "C101.sol", "E-n13-k4.vrp"]:
+        with (
+            open(f"tests/data/{filename}", "rb") as src,
+            module.open(tmp_path / f"{filename}{ext}", "wb") as dst,
+        ):
+            shutil.copyfileobj(src, dst)
+
+    assert_equal(
+        read_instance(tmp_path / f"C101.txt{ext}", "solomon"),
+        read_instance("tests/data/C101.txt", "solomon"),
+    )
+    assert_equal(
+        read_instance(tmp_path / f"E-n13-k4.vrp{ext}"),
+        read_instance("tests/data/E-n13-k4.vrp"),
+    )
+    assert_equal(
+        read_solution(tmp_path / f"C101.sol{ext}"),
+        read_solution("tests/data/C101.sol"),
+    )
+
+
+@mark.parametrize("name, ext, module", COMPRESSIONS)
+def test_write_compressed(tmp_path, name, ext, module):
+    """
+    Tests that instances and solutions are compressed when written to paths
+    with a compression extension.
+    """
+    instance_path = tmp_path / f"instance.vrp{ext}"
+    write_instance(instance_path, {"NAME": "test", "DEMAND_SECTION": [0, 1]})
+
+    with module.open(instance_path, "rt") as fh:
+        desired = "NAME: test\nDEMAND_SECTION\n1\t0\n2\t1\nEOF\n"
+        assert_equal(fh.read(), desired)
+
+    solution_path = tmp_path / f"instance.sol{ext}"
+    write_solution(solution_path, [[1, 2], [3]], {"Cost": 10})
+
+    solution = read_solution(solution_path)
+    assert_equal(solution, {"routes": [[1, 2], [3]], "cost": 10})
@@ -0,0 +1,126 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+from numpy.testing import assert_, assert_equal, assert_raises
+
+from vrplib import (
+    SharedInstance,
+    attach_instance,
+    detach_instance,
+    read_instance,
+)
+from vrplib.parse.distances import LazyEdgeWeight
+
+DATA_DIR = Path("tests/data/")
+
+
+def _total_distance(handle):
+    instance = attach_instance(handle)
+    return instance["edge_weight"].sum(), instance["name"]
+
+
+def test_attach_equals_shared_instance():
+    """
+    Tests that the attached instance equals the shared instance, and that
+    its arrays are read-only views of the shared memory.
+    """
+    instance = read_instance(DATA_DIR / "C101.txt", "solomon")
+
+    with SharedInstance(instance) as shared:
+        attached = attach_instance(shared.handle)
+        assert_equal(attached, instance)
+
+        for key, value in attached.items():
+            if isinstance(value, np.ndarray):
+                assert_(not value.flags.writeable)
+                assert_(not value.flags.owndata)
+                assert_equal(value.dtype, instance[key].dtype)
+
+        # Attaching again reuses the attached segments.
+        again = attach_instance(shared.handle)
+        assert_(np.shares_memory(again["demand"], attached["demand"]))
+
+
+def test_handle_is_small():
+    """
+    Tests that the handle does not contain the arrays of the instance.
+    """
+    instance = read_instance(DATA_DIR / "ORTEC-n242-k12.vrp")
+
+    with SharedInstance(instance) as shared:
+        handle_bytes = len(pickle.dumps(shared.handle))
+
+        assert_(shared.nbytes >= instance["edge_weight"].nbytes)
+        assert_(handle_bytes < 2_000)
+
+
+def test_attach_in_worker_processes():
+    """
+    Tests that worker processes can attach to the shared instance.
+    """
+    instance = read_instance(DATA_DIR / "X-n101-k25.vrp")
+
+    with (
+        SharedInstance(instance) as shared,
+        ProcessPoolExecutor(2) as executor,
+    ):
+        results = list(executor.map(_total_distance, [shared.handle] * 4))
+
+    for total, name in results:
+        assert_equal(total, instance["edge_weight"].sum())
+        assert_equal(name, "X-n101-k25")
+
+
+def test_lazy_edge_weights():
+    """
+    Tests that lazy edge weights are shared through their node coordinates,
+    which share the segment of the instance's node coordinates.
+    """
+    instance = read_instance(
+        DATA_DIR / "X-n101-k25.vrp", lazy_edge_weights=True, dtype="float32"
+    )
+
+    with SharedInstance(instance) as shared:
+        assert_equal(len(shared.handle.segments), 3)  # coords, demand, depot
+
+        attached = attach_instance(shared.handle)
+        edge_weight = attached["edge_weight"]
+
+        assert_(isinstance(edge_weight, LazyEdgeWeight))
+        assert_equal(edge_weight.dtype, np.float32)
+        assert_equal(
+            np.asarray(edge_weight), np.asarray(instance["edge_weight"])
+        )
+        assert_(
+            np.shares_memory(edge_weight.node_coord, attached["node_coord"])
+        )
+
+
+def test_close_removes_segments():
+    """
+    Tests that closing the shared instance removes its segments, and that
+    detached segments can no longer be used.
+    """
+    shared = SharedInstance({"demand": np.arange(10), "name": "test"})
+    handle = shared.handle
+    attached = attach_instance(handle)
+
+    with assert_raises(BufferError):  # the attached arrays are still in use
+        detach_instance(handle)
+
+    del attached
+    detach_instance(handle)
+
+    assert_(not shared.closed)
+    shared.close()
+    assert_(shared.closed)
+    assert_equal(shared.nbytes, 0)
+
+    with assert_raises(FileNotFoundError):
+        SharedMemory(handle.segments[0])
+
+    with assert_raises(FileNotFoundError):
+        attach_instance(handle)
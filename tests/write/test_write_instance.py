@@ -1,8 +1,9 @@
 import numpy as np
-from numpy.testing import assert_equal
+from numpy.testing import assert_, assert_equal, assert_raises
 from pytest import mark
 
-from vrplib import write_instance
+from vrplib import read_instance, write_instance
+from vrplib.parse.parse_distances import EXPLICIT_FORMATS, pairwise_euclidean
 
 
 @mark.parametrize(
@@ -155,3 +156,187 @@ def test_small_instance_example(tmp_path):
 
     with open(tmp_path / name, "r") as fh:
         assert_equal(fh.read(), desired)
+
+
+@mark.parametrize(
+    "data",
+    [
+        np.array([[0, -1, 25], [np.iinfo(np.int64).min, 7, 1000]]),
+        np.array([3, 2**64 - 1], dtype=np.uint64),
+        np.array([[1.0, -0.0, 12.0], [1e15, 2e16, np.nan]]),
+        np.array([[0.1, 1 / 3, -2.5], [1e-5, 1e300, np.inf]]),
+        np.array([[999999.0, 1e6, 0.1]], dtype=np.float32),
+        np.arange(2 * 2**16).reshape(-1, 2),  # written in multiple chunks
+    ],
+)
+def test_numeric_arrays_formatted_as_str(tmp_path, data):
+    """
+    Tests that numeric arrays, which are formatted in bulk, are written the
+    same as formatting each value with ``str``.
+    """
+    write_instance(tmp_path / "instance", {"DATA_SECTION": data})
+
+    rows = data.reshape(len(data), -1)
+    lines = [
+        "\t".join([str(idx), *(str(val) for val in row)])
+        for idx, row in enumerate(rows, 1)
+    ]
+    desired = "\n".join(["DATA_SECTION", *lines, "EOF", ""])
+
+    with open(tmp_path / "instance", "r") as fh:
+        assert_equal(fh.read(), desired)
+
+
+def test_float_format(tmp_path):
+    """
+    Tests that the float format is applied to floats in data sections, but
+    not to integers and specifications.
+    """
+    instance = {
+        "CAPACITY": 10.5,
+        "NODE_COORD_SECTION": np.array([[0.5, 1.0], [1 / 3, 2.0]]),
+        "DEMAND_SECTION": [0, 2.25],
+        "DEPOT_SECTION": np.array([1, 2]),
+    }
+    write_instance(tmp_path / "instance", instance, float_format="%.2f")
+
+    desired = "\n".join(
+        [
+            "CAPACITY: 10.5",
+            "NODE_COORD_SECTION",
+            "1\t0.50\t1.00",
+            "2\t0.33\t2.00",
+            "DEMAND_SECTION",
+            "1\t0",
+            "2\t2.25",
+            "DEPOT_SECTION",
+            "1",
+            "2",
+            "EOF",
+            "",
+        ]
+    )
+
+    with open(tmp_path / "instance", "r") as fh:
+        assert_equal(fh.read(), desired)
+
+
+def test_edge_weight_format_lower_row(tmp_path):
+    """
+    Tests that a symmetric edge weight matrix is written as triangular rows
+    in the given edge weight format, which is also set as specification
+    before the first section.
+    """
+    instance = {
+        "NAME": "instance",
+        "EDGE_WEIGHT_TYPE": "EXPLICIT",
+        "EDGE_WEIGHT_SECTION": np.array([[0, 1, 2], [1, 0, 3], [2, 3, 0]]),
+    }
+    write_instance(
+        tmp_path / "instance", instance, edge_weight_format="LOWER_ROW"
+    )
+
+    desired = "\n".join(
+        [
+            "NAME: instance",
+            "EDGE_WEIGHT_TYPE: EXPLICIT",
+            "EDGE_WEIGHT_FORMAT: LOWER_ROW",
+            "EDGE_WEIGHT_SECTION",
+            "1",
+            "2\t3",
+            "EOF",
+            "",
+        ]
+    )
+    with open(tmp_path / "instance", "r") as fh:
+        assert_equal(fh.read(), desired)
+
+
+@mark.parametrize("edge_weight_format", ["auto", *EXPLICIT_FORMATS])
+def test_edge_weight_format_round_trip(tmp_path, edge_weight_format):
+    """
+    Tests that instances written in each edge weight format are read back
+    with the same edge weights.
+    """
+    rng = np.random.default_rng(1)
+    edge_weight = rng.integers(1, 100, size=(6, 6))
+    edge_weight = edge_weight + edge_weight.T  # symmetric
+    np.fill_diagonal(edge_weight, 0)
+
+    instance = {
+        "NAME": "instance",
+        "DIMENSION": 6,
+        "EDGE_WEIGHT_TYPE": "EXPLICIT",
+        "EDGE_WEIGHT_FORMAT": "FULL_MATRIX",
+        "EDGE_WEIGHT_SECTION": edge_weight,
+    }
+    path = tmp_path / "instance"
+    write_instance(path, instance, edge_weight_format=edge_weight_format)
+    read = read_instance(path)
+
+    assert_equal(read["edge_weight"], edge_weight)
+
+    if edge_weight_format == "auto":  # symmetric with zero diagonal
+        assert_equal(read["edge_weight_format"], "LOWER_ROW")
+    else:
+        assert_equal(read["edge_weight_format"], edge_weight_format)
+
+
+@mark.parametrize(
+    "edge_weight_type", ["EUC_2D", "FLOOR_2D", "EXACT_2D", "ATT", "MAN_2D"]
+)
+def test_edge_weight_format_auto_euclidean(tmp_path, edge_weight_type):
+    """
+    Tests that the auto edge weight format omits the edge weight section when
+    the edge weights are the rounded Euclidean distances of the coordinates.
+    """
+    coords = read_instance("tests/data/A-n32-k5.vrp")["node_coord"]
+    path = tmp_path / "instance"
+    data = {
+        "NAME": "instance",
+        "EDGE_WEIGHT_TYPE": "EXPLICIT",
+        "EDGE_WEIGHT_FORMAT": "FULL_MATRIX",
+        "NODE_COORD_SECTION": coords,
+        "EDGE_WEIGHT_SECTION": pairwise_euclidean(coords, edge_weight_type),
+    }
+    write_instance(path, data, edge_weight_format="auto")
+    read = read_instance(path)
+
+    assert_equal(read["edge_weight_type"], edge_weight_type)
+    assert_("edge_weight_format" not in read)
+    assert_equal(read["edge_weight"], data["EDGE_WEIGHT_SECTION"])
+
+    with open(path, "r") as fh:
+        assert_("EDGE_WEIGHT_SECTION" not in fh.read())
+
+
+def test_edge_weight_format_auto_asymmetric(tmp_path):
+    """
+    Tests that the auto edge weight format writes asymmetric edge weights as
+    full matrix.
+    """
+    edge_weight = np.array([[0, 1], [2, 0]])
+    instance = {"EDGE_WEIGHT_SECTION": edge_weight}
+    write_instance(tmp_path / "instance", instance, edge_weight_format="auto")
+
+    with open(tmp_path / "instance", "r") as fh:
+        lines = fh.read().splitlines()
+
+    assert_equal(lines[0], "EDGE_WEIGHT_FORMAT: FULL_MATRIX")
+    assert_equal(lines[2:4], ["0\t1", "2\t0"])
+
+
+def test_edge_weight_format_raises(tmp_path):
+    """
+    Tests that a ValueError is raised for unknown edge weight formats and
+    when asymmetric edge weights are written in a triangular format.
+    """
+    instance = {"EDGE_WEIGHT_SECTION": np.array([[0, 1], [2, 0]])}
+
+    with assert_raises(ValueError):
+        write_instance(tmp_path / "a", instance, edge_weight_format="ROW")
+
+    with assert_raises(ValueError):
+        write_instance(
+            tmp_path / "b", instance, edge_weight_format="LOWER_ROW"
+        )
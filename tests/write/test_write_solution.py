@@ -2,6 +2,7 @@ from numpy.testing import assert_equal, assert_raises
 from pytest import mark
 
 from vrplib import write_solution
+from vrplib.parse import CompactRoutes
 
 
 @mark.parametrize(
@@ -80,3 +81,22 @@ def test_small_example(tmp_path):
 
     with open(tmp_path / name, "r") as fh:
         assert_equal(fh.read(), desired)
+
+
+def test_write_compact_routes(tmp_path):
+    """
+    Tests that compact routes are written the same as a list of routes.
+    """
+    routes = [[1, 2], [42, 9, 3]]
+    write_solution(tmp_path / "list.sol", routes)
+    write_solution(tmp_path / "compact.sol", CompactRoutes.from_routes(routes))
+
+    with (
+        open(tmp_path / "list.sol") as fh1,
+        open(tmp_path / "compact.sol") as fh2,
+    ):
+        assert_equal(fh2.read(), fh1.read())
+
+    with assert_raises(ValueError):
+        compact = CompactRoutes.from_routes([[1], []])
+        write_solution(tmp_path / "empty.sol", compact)
@@ -1,4 +1,19 @@
+from .aio import aread_instance as aread_instance
+from .aio import aread_solution as aread_solution
+from .aio import awrite_instance as awrite_instance
+from .aio import awrite_solution as awrite_solution
+from .aio import set_executor as set_executor
+from .catalogue import Catalogue as Catalogue
+from .evaluate import evaluate_solution as evaluate_solution
+from .evaluate import evaluate_solutions as evaluate_solutions
+from .read import InstanceCache as InstanceCache
+from .read import iter_sections as iter_sections
 from .read import read_instance as read_instance
+from .read import read_instances as read_instances
+from .read import read_metadata as read_metadata
 from .read import read_solution as read_solution
+from .shared import SharedInstance as SharedInstance
+from .shared import attach_instance as attach_instance
+from .shared import detach_instance as detach_instance
 from .write import write_instance as write_instance
 from .write import write_solution as write_solution
@@ -0,0 +1,195 @@
+import asyncio
+import contextlib
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from .cancellation import run_cancellable
+from .read import read_instance, read_solution
+from .write import write_instance, write_solution
+
+_executor: Executor | None = None
+_max_concurrency: int = os.cpu_count() or 1
+_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+# Default of the set_executor arguments, which keeps the current setting.
+_UNCHANGED: Any = object()
+
+
+def set_executor(
+    executor: Executor | None = _UNCHANGED,
+    max_concurrency: int | None = _UNCHANGED,
+):
+    """
+    Configures how the asynchronous functions run the blocking reads and
+    writes. Settings that are not passed are kept.
+
+    Parameters
+    ----------
+    executor
+        The executor that runs the reads and writes, e.g., a
+        ``ProcessPoolExecutor`` for CPU-heavy parsing. If None, a shared
+        thread pool is used, which is the initial setting. Calls that
+        already started running can only be cancelled in thread pools.
+    max_concurrency
+        The maximum number of reads and writes that run at once per event
+        loop. Other calls wait for their turn without occupying a worker.
+        If None, the limit is the number of CPUs, which is the initial
+        setting.
+    """
+    global _executor, _max_concurrency
+
+    if max_concurrency is None:
+        max_concurrency = os.cpu_count() or 1
+
+    if max_concurrency is not _UNCHANGED and max_concurrency < 1:
+        raise ValueError("Maximum concurrency must be positive.")
+
+    with _lock:
+        if executor is not _UNCHANGED:
+            _executor = executor
+
+        if max_concurrency is not _UNCHANGED:
+            _max_concurrency = max_concurrency
+            _semaphores.clear()
+
+
+async def aread_instance(
+    path: str | os.PathLike,
+    *args: Any,
+    executor: Executor | None = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Asynchronous version of ``read_instance``, which reads and parses the
+    instance in an executor without blocking the event loop.
+
+    Parameters
+    ----------
+    path
+        The path to the instance file.
+    *args
+        Positional arguments passed to ``read_instance``.
+    executor
+        The executor for this call. Defaults to the one configured with
+        ``set_executor``.
+    **kwargs
+        Keyword arguments passed to ``read_instance``.
+
+    Returns
+    -------
+    The instance data, as returned by ``read_instance``.
+    """
+    return await _run(read_instance, executor, path, *args, **kwargs)
+
+
+async def aread_solution(
+    path: str | os.PathLike,
+    *args: Any,
+    executor: Executor | None = None,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Asynchronous version of ``read_solution``. See ``aread_instance``.
+    """
+    return await _run(read_solution, executor, path, *args, **kwargs)
+
+
+async def awrite_instance(
+    path: str | os.PathLike,
+    *args: Any,
+    executor: Executor | None = None,
+    **kwargs: Any,
+):
+    """
+    Asynchronous version of ``write_instance``. See ``aread_instance``.
+    """
+    await _run(write_instance, executor, path, *args, **kwargs)
+
+
+async def awrite_solution(
+    path: str | os.PathLike,
+    *args: Any,
+    executor: Executor | None = None,
+    **kwargs: Any,
+):
+    """
+    Asynchronous version of ``write_solution``. See ``aread_instance``.
+    """
+    await _run(write_solution, executor, path, *args, **kwargs)
+
+
+async def _run(
+    func: Callable, executor: Executor | None, *args: Any, **kwargs: Any
+) -> Any:
+    """
+    Runs the function in the executor once fewer than the maximum number of
+    calls are running. The call keeps its slot until its worker is done,
+    also when the call is cancelled, so that cancelled calls that are still
+    running count towards the limit.
+
+    When cancelled, a call that has not yet started is removed from the
+    executor's queue. A call that is running in a thread pool stops at its
+    next cancellation check, e.g., when it reads or writes the next lines.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphore(loop)
+    executor = _default_executor() if executor is None else executor
+
+    await semaphore.acquire()
+
+    try:
+        if isinstance(executor, ThreadPoolExecutor):
+            event = threading.Event()
+            call = partial(run_cancellable, event, func, *args, **kwargs)
+        else:  # the event cannot be shared with, e.g., other processes
+            event = None
+            call = partial(func, *args, **kwargs)
+
+        future = executor.submit(call)
+    except BaseException:
+        semaphore.release()
+        raise
+
+    future.add_done_callback(partial(_release, loop, semaphore))
+
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        future.cancel()  # if it has not started yet
+
+        if event is not None:
+            event.set()  # stops the call if it is running
+
+        raise
+
+
+def _release(loop: asyncio.AbstractEventLoop, semaphore, _):
+    with contextlib.suppress(RuntimeError):  # the event loop is closed
+        loop.call_soon_threadsafe(semaphore.release)
+
+
+def _semaphore(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    """
+    Returns the semaphore that bounds the concurrent calls in the given
+    event loop.
+    """
+    with _lock:
+        if loop not in _semaphores:
+            _semaphores[loop] = asyncio.Semaphore(_max_concurrency)
+
+        return _semaphores[loop]
+
+
+def _default_executor() -> Executor:
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix="vrplib")
+
+        return _executor
@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import CancelledError
+from contextvars import ContextVar
+from typing import IO, Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# The cancellation event of the call that runs in the current context, if
+# it can be cancelled.
+_CANCEL_EVENT: ContextVar[threading.Event | None] = ContextVar(
+    "vrplib_cancel_event", default=None
+)
+
+# Number of lines between cancellation checks when iterating over a file.
+_CHECK_INTERVAL = 1024
+
+
+def run_cancellable(
+    event: threading.Event, func: Callable[..., T], *args, **kwargs
+) -> T:
+    """
+    Calls the function, which stops with a ``CancelledError`` at its next
+    cancellation check once the event is set. Cancellation is checked while
+    reading or writing files opened with ``open_text``, and between the
+    blocks of computed distance matrices.
+    """
+    token = _CANCEL_EVENT.set(event)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _CANCEL_EVENT.reset(token)
+
+
+def check_cancelled():
+    """
+    Raises a ``CancelledError`` if the call that runs in the current context
+    has been cancelled.
+    """
+    event = _CANCEL_EVENT.get()
+
+    if event is not None and event.is_set():
+        raise CancelledError
+
+
+def checked_file(fh: IO) -> IO:
+    """
+    Returns the file, wrapped to check for cancellation while reading and
+    writing if the current call can be cancelled.
+    """
+    if _CANCEL_EVENT.get() is None:
+        return fh
+
+    return _CheckedFile(fh)  # type: ignore
+
+
+class _CheckedFile:
+    """
+    Wraps a file to check for cancellation on reads, writes and every
+    ``_CHECK_INTERVAL`` lines of iteration.
+    """
+
+    def __init__(self, fh: IO):
+        self._fh = fh
+
+    def __enter__(self):
+        self._fh.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        return self._fh.__exit__(*args)
+
+    def __iter__(self) -> Iterator[Any]:
+        for idx, line in enumerate(self._fh):
+            if idx % _CHECK_INTERVAL == 0:
+                check_cancelled()
+
+            yield line
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fh, name)
+
+    def read(self, *args) -> Any:
+        check_cancelled()
+        return self._fh.read(*args)
+
+    def write(self, text: Any) -> int:
+        check_cancelled()
+        return self._fh.write(text)
@@ -0,0 +1 @@
+from .catalogue import Catalogue as Catalogue
@@ -0,0 +1,420 @@
+import json
+import os
+import re
+import sqlite3
+from math import ceil
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+from vrplib.read import read_instance, read_solution
+from vrplib.read.read_instances import (
+    detect_format,
+    find_solution_file,
+    is_instance_file,
+)
+
+# Bump this whenever the layout of the store, or the indexed data of an
+# instance, changes. Stores of other versions are rebuilt on refresh.
+CATALOGUE_VERSION = 1
+
+DEFAULT_CATALOGUE_FILE = ".vrplib_catalogue.sqlite"
+
+# Record fields that are stored in their own columns. Other query keys are
+# looked up in the specifications and then in the derived statistics.
+_COLUMNS = ("path", "format", "solution_path", "cost", "error")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instances (
+    path TEXT PRIMARY KEY,
+    format TEXT,
+    size INTEGER,
+    mtime INTEGER,
+    solution_path TEXT,
+    solution_size INTEGER,
+    solution_mtime INTEGER,
+    cost REAL,
+    specifications TEXT,
+    shapes TEXT,
+    stats TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class Catalogue:
+    """
+    A persistent index of the instances, and their solutions, in a directory
+    tree. The index is stored in an SQLite database and records, for each
+    instance file, its specifications, the shapes of its data sections,
+    derived statistics, and the cost of the solution file with the same
+    name, if any. Queries are answered from the index, without parsing any
+    instance.
+
+    The index is updated by ``refresh``, which only re-indexes the files
+    whose size or modification time changed since the previous refresh.
+
+    Parameters
+    ----------
+    root
+        The root directory of the instances.
+    path
+        The path of the SQLite database. Defaults to a
+        ``.vrplib_catalogue.sqlite`` file in the root directory.
+    pattern
+        Glob pattern, relative to the root directory, of the instance files.
+        Solution files and hidden files are never indexed as instances.
+        Defaults to all files in the directory tree.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        path: str | os.PathLike | None = None,
+        pattern: str = "**/*",
+    ):
+        self._root = Path(root)
+        self._pattern = pattern
+        self._path = (
+            self._root / DEFAULT_CATALOGUE_FILE if path is None else path
+        )
+        self._conn = sqlite3.connect(self._path)
+        self._conn.executescript(_SCHEMA)
+
+        if self._version() != CATALOGUE_VERSION:
+            self._conn.execute("DELETE FROM instances")
+            self._set_version()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        sql = "SELECT COUNT(*) FROM instances"
+        return self._conn.execute(sql).fetchone()[0]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        yield from self.query()
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+        self._conn.close()
+
+    def refresh(self) -> dict[str, int]:
+        """
+        Updates the index with the instance files in the directory tree.
+        New and changed instances are (re-)indexed, and instances that no
+        longer exist are removed. If only the solution file of an instance
+        changed, then only the solution is read again. Files that cannot be
+        read are indexed with their error, so that they are not read again
+        until they change.
+
+        Returns
+        -------
+        dict[str, int]
+            The number of "added", "updated", "removed" and "unchanged"
+            instances.
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        stored = {
+            row[0]: row[1:]
+            for row in self._conn.execute(
+                "SELECT path, size, mtime, solution_path, solution_size, "
+                "solution_mtime FROM instances"
+            )
+        }
+
+        with self._conn:
+            for path in self._instance_paths():
+                key = path.relative_to(self._root).as_posix()
+                stat = path.stat()
+                sol_path = find_solution_file(str(path))
+                sol = _file_state(self._root, sol_path)
+                current = (stat.st_size, stat.st_mtime_ns, *sol)
+                previous = stored.pop(key, None)
+
+                if previous is None:
+                    self._index(key, path, current, sol_path)
+                    counts["added"] += 1
+                elif tuple(previous) == current:
+                    counts["unchanged"] += 1
+                elif tuple(previous[:2]) == current[:2]:
+                    self._index_solution(key, current, sol_path)
+                    counts["updated"] += 1
+                else:
+                    self._index(key, path, current, sol_path)
+                    counts["updated"] += 1
+
+            for key in stored:  # these files no longer exist
+                self._conn.execute(
+                    "DELETE FROM instances WHERE path = ?", (key,)
+                )
+                counts["removed"] += 1
+
+        return counts
+
+    def query(self, **filters: Any) -> list[dict[str, Any]]:
+        """
+        Returns the records of the indexed instances that match all filters,
+        ordered by path.
+
+        Filters are given as ``key=value``, where the key is a record field
+        ("path", "format", "solution_path", "cost" or "error"), or else a
+        specification, e.g., "type", "dimension" or "edge_weight_type", or a
+        derived statistic, e.g., "num_clients". The value is matched
+        exactly, or is a ``(low, high)`` tuple to match an inclusive range,
+        where either bound may be None, or is a list of allowed values.
+
+        Parameters
+        ----------
+        **filters
+            The filters.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The records of the matching instances. Each record contains the
+            instance "path", its "format", the "solution_path" and its
+            "cost" (None if there is no solution or cost), the
+            "specifications", the "shapes" of the data sections, the derived
+            "stats", and the "error" if the instance could not be read.
+
+        Examples
+        --------
+        ``catalogue.query(type="CVRP", dimension=(200, 500),
+        edge_weight_type="EXACT_2D")``
+        """
+        clauses = []
+        params: list[Any] = []
+
+        for key, value in filters.items():
+            expr = _expression(key)
+
+            if isinstance(value, tuple):
+                low, high = value
+                if low is not None:
+                    clauses.append(f"{expr} >= ?")
+                    params.append(low)
+                if high is not None:
+                    clauses.append(f"{expr} <= ?")
+                    params.append(high)
+            elif isinstance(value, list):
+                marks = ", ".join("?" * len(value))
+                clauses.append(f"{expr} IN ({marks})")
+                params.extend(value)
+            elif value is None:
+                clauses.append(f"{expr} IS NULL")
+            else:
+                clauses.append(f"{expr} = ?")
+                params.append(value)
+
+        sql = (
+            "SELECT path, format, solution_path, cost, specifications, "
+            "shapes, stats, error FROM instances"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        rows = self._conn.execute(sql + " ORDER BY path", params)
+        return [self._record(row) for row in rows]
+
+    def _instance_paths(self) -> Iterator[Path]:
+        catalogue_file = Path(self._path).resolve()
+
+        for path in sorted(self._root.glob(self._pattern)):
+            parts = path.relative_to(self._root).parts
+            if any(part.startswith(".") for part in parts):
+                continue  # hidden files, such as the catalogue and caches
+
+            if (
+                is_instance_file(str(path))
+                and path.resolve() != catalogue_file
+            ):
+                yield path
+
+    def _index(
+        self, key: str, path: Path, state: tuple, sol_path: Path | None
+    ):
+        """
+        Indexes the instance and its solution. The state holds the size and
+        modification time of the instance file, and the relative path, size
+        and modification time of the solution file.
+        """
+        fmt = None
+        specs = shapes = stats = error = None
+
+        try:
+            fmt = detect_format(path)
+            specs, shapes, stats = _describe(path, fmt)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO instances VALUES "
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                fmt,
+                *state,
+                _read_cost(sol_path),
+                json.dumps(specs),
+                json.dumps(shapes),
+                json.dumps(stats),
+                error,
+            ),
+        )
+
+    def _index_solution(self, key: str, state: tuple, sol_path: Path | None):
+        """
+        Updates the solution of an indexed instance.
+        """
+        self._conn.execute(
+            "UPDATE instances SET solution_path = ?, solution_size = ?, "
+            "solution_mtime = ?, cost = ? WHERE path = ?",
+            (*state[2:], _read_cost(sol_path), key),
+        )
+
+    def _record(self, row: tuple) -> dict[str, Any]:
+        path, fmt, sol_path, cost, specs, shapes, stats, error = row
+
+        return {
+            "path": str(self._root / path),
+            "format": fmt,
+            "solution_path": None
+            if sol_path is None
+            else str(self._root / sol_path),
+            "cost": cost,
+            "specifications": json.loads(specs),
+            "shapes": json.loads(shapes),
+            "stats": json.loads(stats),
+            "error": error,
+        }
+
+    def _version(self) -> int | None:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+
+        return None if row is None else int(row[0])
+
+    def _set_version(self):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                (str(CATALOGUE_VERSION),),
+            )
+
+
+def _describe(path: Path, fmt: str) -> tuple[dict, dict, dict]:
+    """
+    Reads the instance and returns its specifications, the shapes of its
+    data sections, and derived statistics. Explicit edge weights are not
+    parsed, since their shape follows from the dimension.
+    """
+    if fmt == "vrplib":
+        instance = read_instance(path, compute_edge_weights=False, lazy=True)
+    else:
+        instance = read_instance(path, fmt, compute_edge_weights=False)
+
+    specs = {}
+    shapes = {}
+    sections = {}
+
+    for key in instance:
+        if key == "edge_weight":
+            dimension = instance.get("dimension")
+            shapes[key] = None if dimension is None else [dimension] * 2
+            continue
+
+        value = instance[key]
+        if isinstance(value, (str, int, float)):
+            specs[key] = value
+        else:
+            shapes[key] = list(np.shape(value))
+            sections[key] = value
+
+    return specs, shapes, _stats(specs, sections)
+
+
+def _stats(specs: dict[str, Any], sections: dict[str, Any]) -> dict[str, Any]:
+    """
+    Derives statistics of the instance, such as the number of clients and
+    the total demand, from its specifications and data sections.
+    """
+    num_locations: int | None = specs.get("dimension")
+    for key in ("node_coord", "demand"):
+        if key in sections:
+            num_locations = len(sections[key])
+            break
+
+    num_depots = len(np.atleast_1d(sections.get("depot", 0)))
+    stats: dict[str, Any] = {
+        "num_locations": num_locations,
+        "num_depots": num_depots,
+        "num_clients": None,
+        "has_time_windows": "time_window" in sections,
+    }
+
+    if num_locations is not None:
+        stats["num_clients"] = num_locations - num_depots
+
+    demand = sections.get("demand")
+    if isinstance(demand, np.ndarray) and demand.ndim == 1:
+        stats["total_demand"] = demand.sum().item()
+        stats["max_demand"] = demand.max().item() if demand.size else 0
+
+        capacity = specs.get("capacity")
+        if isinstance(capacity, (int, float)) and capacity > 0:
+            stats["min_vehicles"] = ceil(stats["total_demand"] / capacity)
+
+    return stats
+
+
+def _expression(key: str) -> str:
+    """
+    Returns the SQL expression of the query key.
+    """
+    if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", key):
+        raise ValueError(f"Invalid query key {key}.")
+
+    if key in _COLUMNS:
+        return key
+
+    return (
+        f"COALESCE(json_extract(specifications, '$.{key}'), "
+        f"json_extract(stats, '$.{key}'))"
+    )
+
+
+def _file_state(root: Path, path: Path | None) -> tuple:
+    if path is None:
+        return (None, None, None)
+
+    stat = path.stat()
+    return (_relative(root, path), stat.st_size, stat.st_mtime_ns)
+
+
+def _relative(root: Path, path: Path | None) -> str | None:
+    return None if path is None else path.relative_to(root).as_posix()
+
+
+def _read_cost(path: Path | None) -> float | None:
+    """
+    Returns the cost of the solution file, or None if there is no solution
+    file or if it has no numeric cost.
+    """
+    if path is None:
+        return None
+
+    try:
+        cost = read_solution(path).get("cost")
+    except Exception:
+        return None
+
+    return cost if isinstance(cost, (int, float)) else None
@@ -0,0 +1,124 @@
+import bz2
+import gzip
+import lzma
+import os
+from pathlib import Path
+from typing import IO, Callable
+
+from .cancellation import checked_file
+
+# Maps each supported compression to its file extensions, magic bytes, and
+# the function that opens compressed files.
+_COMPRESSIONS: dict[str, tuple[tuple[str, ...], bytes, Callable]] = {
+    "gzip": ((".gz",), b"\x1f\x8b", gzip.open),
+    "bz2": ((".bz2",), b"BZh", bz2.open),
+    "xz": ((".xz", ".lzma"), b"\xfd7zXZ\x00", lzma.open),
+}
+
+COMPRESSION_EXTENSIONS = tuple(
+    ext for exts, _, _ in _COMPRESSIONS.values() for ext in exts
+)
+
+
+def detect_compression(path: str | os.PathLike, mode: str = "r") -> str | None:
+    """
+    Detects the compression of the file. When reading, the compression is
+    detected from the magic bytes at the start of the file, so compressed
+    files are also recognized without their usual extension. When writing,
+    the compression is detected from the file extension.
+
+    Parameters
+    ----------
+    path
+        The file path.
+    mode
+        The mode in which the file is opened, either "r" or "w".
+
+    Returns
+    -------
+    str | None
+        One of "gzip", "bz2" or "xz", or None if the file is not compressed.
+    """
+    if mode == "r":
+        with open(path, "rb") as fh:
+            start = fh.read(6)
+
+        for name, (_, magic, _) in _COMPRESSIONS.items():
+            if start.startswith(magic):
+                return name
+
+        return None
+
+    suffix = Path(path).suffix.lower()
+    for name, (exts, _, _) in _COMPRESSIONS.items():
+        if suffix in exts:
+            return name
+
+    return None
+
+
+def open_text(path: str | os.PathLike, mode: str = "r") -> IO[str]:
+    """
+    Opens the file in text mode, transparently (de)compressing gzip, bz2 and
+    xz files. Compressed files are decompressed incrementally while reading,
+    without creating a decompressed copy.
+
+    Parameters
+    ----------
+    path
+        The file path.
+    mode
+        The mode in which the file is opened, either "r" or "w".
+
+    Returns
+    -------
+    IO[str]
+        The opened text file.
+    """
+    if mode not in ["r", "w"]:
+        raise ValueError(f"Mode {mode} not supported.")
+
+    compression = detect_compression(path, mode)
+
+    if compression is None:
+        return checked_file(open(path, mode))
+
+    _, _, open_compressed = _COMPRESSIONS[compression]
+    return checked_file(open_compressed(path, mode + "t"))
+
+
+def open_binary(path: str | os.PathLike) -> IO[bytes]:
+    """
+    Opens the file for reading in binary mode, transparently decompressing
+    gzip, bz2 and xz files. Positions in compressed files refer to the
+    decompressed data, so seeking and telling work the same as for
+    uncompressed files (albeit slower, because seeking decompresses).
+
+    Parameters
+    ----------
+    path
+        The file path.
+
+    Returns
+    -------
+    IO[bytes]
+        The opened binary file.
+    """
+    compression = detect_compression(path, "r")
+
+    if compression is None:
+        return open(path, "rb")
+
+    _, _, open_compressed = _COMPRESSIONS[compression]
+    return open_compressed(path, "rb")
+
+
+def strip_compression_suffix(path: str | os.PathLike) -> Path:
+    """
+    Returns the path without its compression extension, if any.
+    """
+    path = Path(path)
+    if path.suffix.lower() in COMPRESSION_EXTENSIONS:
+        return path.with_suffix("")
+
+    return path
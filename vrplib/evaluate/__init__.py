@@ -0,0 +1,2 @@
+from .evaluate_solutions import evaluate_solution as evaluate_solution
+from .evaluate_solutions import evaluate_solutions as evaluate_solutions
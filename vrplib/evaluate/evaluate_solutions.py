@@ -0,0 +1,287 @@
+import glob
+import os
+from itertools import pairwise
+from typing import Any, Iterable
+
+import numpy as np
+
+from vrplib.parse import CompactRoutes
+from vrplib.parse.distances import get_kernel
+from vrplib.read import read_solution
+
+Routes = CompactRoutes | list[list[int]]
+
+
+def evaluate_solution(
+    instance: dict[str, Any],
+    solution: dict[str, Any] | Routes,
+) -> dict[str, Any]:
+    """
+    Evaluates the routes of a solution against the instance.
+
+    Each route starts and ends at the (first) depot, and visits the given
+    locations in between. Vehicles leave the depot at the start of its time
+    window, travel along the edge weights, wait at locations that are
+    reached before their time window opens, and serve each location for its
+    service time. Service that starts after a time window closes, or a
+    return to the depot after its time window closes, violates the time
+    window by the amount of lateness.
+
+    Parameters
+    ----------
+    instance
+        The instance data, as returned by ``read_instance``. Uses the
+        "edge_weight" (or, if missing, the "node_coord" and registered
+        "edge_weight_type"), "depot", "demand", "capacity", "time_window"
+        and "service_time" data, where available.
+    solution
+        The solution data, as returned by ``read_solution``, or its routes.
+
+    Returns
+    -------
+    dict[str, Any]
+        The per-route "distance", "load", "excess_load", "duration" and
+        "tw_violation" arrays, the total "cost" (distance) of the routes,
+        whether the solution is "feasible", i.e., has no excess load and no
+        time window violations, and whether it is "complete", i.e., visits
+        every location other than the depot exactly once.
+    """
+    return evaluate_solutions(instance, [solution])[0]
+
+
+def evaluate_solutions(
+    instance: dict[str, Any],
+    solutions: str | os.PathLike | Iterable[Any],
+) -> list[dict[str, Any]]:
+    """
+    Evaluates many solutions of the same instance at once. The routes of all
+    solutions are evaluated together, so that the cost per solution is
+    small. See ``evaluate_solution`` for the evaluation of each solution.
+
+    Parameters
+    ----------
+    instance
+        The instance data, as returned by ``read_instance``.
+    solutions
+        A glob pattern of solution files, e.g., ``"/path/to/pool/*.sol"``,
+        or ``"/path/to/pool/**/*.sol"`` to include subdirectories, or an
+        iterable of solution file paths, solution data or routes.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The evaluation of each solution, in order. Solutions that are read
+        from a file also contain the solution "path".
+    """
+    if isinstance(solutions, (str, os.PathLike)):
+        solutions = sorted(glob.glob(os.fspath(solutions), recursive=True))
+
+    paths = []
+    all_routes = []
+
+    for solution in solutions:
+        if isinstance(solution, (str, os.PathLike)):
+            paths.append(os.fspath(solution))
+            solution = read_solution(solution, compact_routes=True)
+        else:
+            paths.append(None)
+
+        all_routes.append(_compact(solution))
+
+    routes = _concatenate(all_routes)
+    evaluation = _evaluate(instance, routes)
+    complete = _complete(instance, all_routes)
+
+    results = []
+    bounds = np.cumsum([0] + [len(routes) for routes in all_routes])
+
+    for idx, (start, end) in enumerate(pairwise(bounds)):
+        result: dict[str, Any] = {
+            key: value[start:end] for key, value in evaluation.items()
+        }
+        result["cost"] = result["distance"].sum()
+        result["feasible"] = not (
+            result["excess_load"].any() or result["tw_violation"].any()
+        )
+        result["complete"] = complete[idx]
+
+        if paths[idx] is not None:
+            result["path"] = paths[idx]
+
+        results.append(result)
+
+    return results
+
+
+def _compact(solution: dict[str, Any] | Routes) -> CompactRoutes:
+    routes = solution["routes"] if isinstance(solution, dict) else solution
+
+    if isinstance(routes, CompactRoutes):
+        return routes
+
+    return CompactRoutes.from_routes(routes)
+
+
+def _concatenate(all_routes: list[CompactRoutes]) -> CompactRoutes:
+    """
+    Concatenates the routes of all solutions into a single compact routes.
+    """
+    visits = [routes.visits for routes in all_routes]
+    num_visits = [routes.num_visits for routes in all_routes]
+
+    visits_ = np.concatenate([np.empty(0, dtype=np.int64), *visits])
+    num_visits_ = np.concatenate([np.empty(0, dtype=np.int64), *num_visits])
+    offsets = np.concatenate(([0], np.cumsum(num_visits_)))
+
+    return CompactRoutes(visits_, offsets)
+
+
+def _evaluate(
+    instance: dict[str, Any], routes: CompactRoutes
+) -> dict[str, np.ndarray]:
+    """
+    Computes the per-route statistics of all routes at once.
+    """
+    dimension = _dimension(instance)
+    visits = routes.visits
+    offsets = routes.offsets
+    num_visits = routes.num_visits
+    num_routes = len(routes)
+
+    if visits.size and (visits.min() < 0 or visits.max() >= dimension):
+        raise ValueError("Routes contain unknown locations.")
+
+    depot = int(np.atleast_1d(instance.get("depot", 0))[0])
+
+    # Each route has one more leg than visits. Leg j of route i starts at
+    # visit j - 1 (or the depot) and ends at visit j (or the depot), and is
+    # stored at position offsets[i] + i + j.
+    route_idx = np.repeat(np.arange(num_routes), num_visits)
+    leg_idx = np.arange(len(visits)) + route_idx
+
+    frm = np.full(len(visits) + num_routes, depot)
+    frm[leg_idx + 1] = visits
+    to = np.full(len(visits) + num_routes, depot)
+    to[leg_idx] = visits
+
+    legs = _edge_weights(instance, frm, to)
+    leg_starts = offsets[:-1] + np.arange(num_routes)
+    distance = np.add.reduceat(legs, leg_starts) if num_routes else legs
+
+    if "demand" in instance:
+        demand = np.asarray(instance["demand"])[visits]
+        cum_demand = np.concatenate(
+            (np.zeros((1, *demand.shape[1:]), demand.dtype), demand.cumsum(0))
+        )
+        load = cum_demand[offsets[1:]] - cum_demand[offsets[:-1]]
+    else:
+        load = np.zeros(num_routes, dtype=np.int64)
+
+    if "capacity" in instance:
+        excess_load = np.maximum(load - instance["capacity"], 0)
+    else:
+        excess_load = np.zeros_like(load)
+
+    duration, tw_violation = _schedule(
+        instance, routes, legs, leg_starts, depot
+    )
+
+    return {
+        "distance": distance,
+        "load": load,
+        "excess_load": excess_load,
+        "duration": duration,
+        "tw_violation": tw_violation,
+    }
+
+
+def _schedule(
+    instance: dict[str, Any],
+    routes: CompactRoutes,
+    legs: np.ndarray,
+    leg_starts: np.ndarray,
+    depot: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the duration and time window violation of each route. The
+    schedules of all routes advance together, one visit at a time.
+    """
+    dimension = _dimension(instance)
+    num_visits = routes.num_visits
+
+    if "time_window" in instance:
+        time_window = np.asarray(instance["time_window"])
+        early, late = time_window[:, 0], time_window[:, 1]
+    else:
+        early = np.zeros(dimension)
+        late = np.full(dimension, np.inf)
+
+    service = np.broadcast_to(instance.get("service_time", 0), dimension)
+
+    time = np.full(len(routes), early[depot], dtype=np.result_type(legs, 0.0))
+    tw_violation = np.zeros_like(time)
+
+    # Routes in order of decreasing number of visits, so that the routes
+    # with more than j visits come first in this order.
+    order = np.argsort(-num_visits, kind="stable")
+    sorted_visits = -num_visits[order]
+
+    for step in range(num_visits.max() if len(routes) else 0):
+        active = order[: np.searchsorted(sorted_visits, -step)]
+        visit = routes.visits[routes.offsets[active] + step]
+
+        arrival = time[active] + legs[leg_starts[active] + step]
+        start = np.maximum(arrival, early[visit])
+        tw_violation[active] += np.maximum(start - late[visit], 0)
+        time[active] = start + service[visit]
+
+    # Return to the depot along the last leg of each route.
+    time += legs[leg_starts + num_visits]
+    tw_violation += np.maximum(time - late[depot], 0)
+
+    return time - early[depot], tw_violation
+
+
+def _edge_weights(
+    instance: dict[str, Any], frm: np.ndarray, to: np.ndarray
+) -> np.ndarray:
+    """
+    Gathers the edge weights of the given legs, or computes them from the
+    node coordinates if the instance has no edge weights.
+    """
+    if "edge_weight" in instance:
+        return np.asarray(instance["edge_weight"][frm, to])
+
+    if "node_coord" in instance and "edge_weight_type" in instance:
+        kernel = get_kernel(instance["edge_weight_type"])
+        coords = np.asarray(instance["node_coord"])
+        return kernel.distance(coords[frm], coords[to])
+
+    raise ValueError("Instance has no edge weights or node coordinates.")
+
+
+def _dimension(instance: dict[str, Any]) -> int:
+    for key in ("edge_weight", "node_coord", "demand"):
+        if key in instance:
+            return len(instance[key])
+
+    return int(instance["dimension"])
+
+
+def _complete(
+    instance: dict[str, Any], all_routes: list[CompactRoutes]
+) -> list[bool]:
+    """
+    Returns whether each solution visits every location other than the
+    depots exactly once.
+    """
+    dimension = _dimension(instance)
+    is_depot = np.zeros(dimension, dtype=bool)
+    is_depot[np.atleast_1d(instance.get("depot", 0))] = True
+
+    complete = []
+    for routes in all_routes:
+        count = np.bincount(routes.visits, minlength=dimension)
+        complete.append(bool((count == ~is_depot).all()))
+
+    return complete
@@ -1,3 +1,5 @@
+from .compact_routes import CompactRoutes as CompactRoutes
 from .parse_solomon import parse_solomon as parse_solomon
 from .parse_solution import parse_solution as parse_solution
+from .parse_vrplib import iter_vrplib as iter_vrplib
 from .parse_vrplib import parse_vrplib as parse_vrplib
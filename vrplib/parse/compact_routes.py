@@ -0,0 +1,103 @@
+from itertools import pairwise
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from .parse_utils import compact_dtype
+
+
+class CompactRoutes:
+    """
+    Routes stored as a single flat array of visits and an array of route
+    offsets, in compressed sparse row (CSR) layout: route i visits
+    ``visits[offsets[i] : offsets[i + 1]]``. This uses far less memory than
+    a list of lists of integers, and feeds directly into NumPy code, e.g.,
+    ``edge_weight[visits[:-1], visits[1:]]`` for the distances between
+    consecutive visits.
+
+    Supports ``len``, iteration and indexing like a list of routes, where
+    each route is a read-only view of the visits.
+
+    Parameters
+    ----------
+    visits
+        The flat array of visits of all routes.
+    offsets
+        The start offset of each route in the visits, followed by the total
+        number of visits.
+    """
+
+    def __init__(self, visits: np.ndarray, offsets: np.ndarray):
+        visits = np.asarray(visits)
+        offsets = np.asarray(offsets, dtype=np.int64)
+
+        if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0:
+            raise ValueError("Offsets must start at zero.")
+
+        if offsets[-1] != len(visits) or np.any(np.diff(offsets) < 0):
+            msg = "Offsets must be non-decreasing up to the number of visits."
+            raise ValueError(msg)
+
+        self._visits = visits
+        self._offsets = offsets
+
+    @classmethod
+    def from_routes(cls, routes: Iterable[Iterable[int]]) -> "CompactRoutes":
+        """
+        Converts the given routes, such as a list of lists of visits, into
+        compact routes.
+        """
+        arrays = [np.asarray(route, dtype=np.int64) for route in routes]
+        lengths = [len(array) for array in arrays]
+        offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        visits = np.concatenate([np.empty(0, dtype=np.int64), *arrays])
+
+        return cls(visits.astype(compact_dtype(visits)), offsets)
+
+    @property
+    def visits(self) -> np.ndarray:
+        return self._visits
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._offsets
+
+    @property
+    def num_visits(self) -> np.ndarray:
+        """
+        The number of visits of each route.
+        """
+        return np.diff(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        idx = range(len(self))[idx]  # raises an IndexError if out of bounds
+        route = self._visits[self._offsets[idx] : self._offsets[idx + 1]]
+        route.flags.writeable = False
+        return route
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactRoutes):
+            return NotImplemented
+
+        return np.array_equal(self._offsets, other.offsets) and np.array_equal(
+            self._visits, other.visits
+        )
+
+    def __repr__(self) -> str:
+        num_visits = len(self._visits)
+        return f"CompactRoutes(routes={len(self)}, visits={num_visits})"
+
+    def tolist(self) -> list[list[int]]:
+        """
+        Returns the routes as a list of lists of visits.
+        """
+        visits = self._visits.tolist()
+        offsets = self._offsets.tolist()
+        return [visits[start:end] for start, end in pairwise(offsets)]
@@ -0,0 +1,11 @@
+from .kernels import EdgeWeightKernel as EdgeWeightKernel
+from .kernels import edge_weight_dtype as edge_weight_dtype
+from .kernels import edge_weight_types as edge_weight_types
+from .kernels import get_kernel as get_kernel
+from .kernels import pairwise as pairwise
+from .kernels import (
+    register_edge_weight_type as register_edge_weight_type,
+)
+from .lazy_edge_weight import LazyEdgeWeight as LazyEdgeWeight
+from .neighbours import nearest_neighbours as nearest_neighbours
+from .neighbours import neighbours_from_matrix as neighbours_from_matrix
@@ -0,0 +1,340 @@
+from math import ceil, hypot, pi, sqrt
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+# A distance kernel maps two arrays of coordinates, whose last axis holds
+# the coordinates of a location and whose other axes broadcast against each
+# other, to the float64 distances between the broadcast locations.
+Kernel = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+# Maximum number of n-by-n float64 temporaries (per row in a block) that a
+# kernel may use while computing a block of rows.
+NUM_TEMPORARIES = 4
+
+# TSPLIB's approximation of pi and the radius of the earth for GEO.
+_GEO_PI = 3.141592
+_GEO_RADIUS = 6378.388
+
+
+class EdgeWeightKernel(NamedTuple):
+    """
+    A distance kernel of an edge weight type.
+
+    Attributes
+    ----------
+    distance
+        The vectorized kernel that computes the distances between
+        broadcastable arrays of coordinates.
+    integral
+        Whether the kernel rounds the distances to integers.
+    bound
+        Optional function that returns an upper bound on the distances
+        between the given n-by-d coordinates. Used to select the smallest
+        integer dtype that holds the distances of integral kernels.
+    """
+
+    distance: Kernel
+    integral: bool = False
+    bound: Callable[[np.ndarray], float] | None = None
+
+
+_KERNELS: dict[str, EdgeWeightKernel] = {}
+
+
+def register_edge_weight_type(
+    edge_weight_type: str,
+    distance: Kernel,
+    integral: bool = False,
+    bound: Callable[[np.ndarray], float] | None = None,
+    overwrite: bool = False,
+):
+    """
+    Registers a distance kernel for the given edge weight type, so that the
+    edge weights of instances with this "EDGE_WEIGHT_TYPE" are computed from
+    their node coordinates.
+
+    The kernel is called with two arrays of coordinates, whose last axis
+    holds the coordinates of a location and whose other axes broadcast
+    against each other, e.g., an m-by-1-by-d and a 1-by-n-by-d array to
+    compute an m-by-n block of the distance matrix. It must return the
+    float64 distances of the broadcast shape, using at most
+    ``NUM_TEMPORARIES`` temporary arrays of that shape.
+
+    Parameters
+    ----------
+    edge_weight_type
+        The edge weight type, e.g., "HAVERSINE".
+    distance
+        The vectorized distance kernel.
+    integral
+        Whether the kernel rounds the distances to integers, which allows
+        integer dtypes. Defaults to False.
+    bound
+        Optional function that returns an upper bound on the distances
+        between the given n-by-d coordinates. Used to select the smallest
+        integer dtype for ``dtype="auto"``. Defaults to None, in which case
+        int64 is used for integral kernels.
+    overwrite
+        Whether to replace an already registered kernel. Defaults to False.
+    """
+    if edge_weight_type in _KERNELS and not overwrite:
+        msg = f"Edge weight type {edge_weight_type} is already registered."
+        raise ValueError(msg)
+
+    _KERNELS[edge_weight_type] = EdgeWeightKernel(distance, integral, bound)
+
+
+def edge_weight_types() -> tuple[str, ...]:
+    """
+    Returns the edge weight types that have a registered distance kernel.
+    """
+    return tuple(_KERNELS)
+
+
+def get_kernel(edge_weight_type: str) -> EdgeWeightKernel:
+    """
+    Returns the distance kernel of the given edge weight type.
+    """
+    if edge_weight_type not in _KERNELS:
+        raise ValueError(f"Edge weight type {edge_weight_type} unknown.")
+
+    return _KERNELS[edge_weight_type]
+
+
+def pairwise(
+    coords_from: np.ndarray, coords_to: np.ndarray, edge_weight_type: str
+) -> np.ndarray:
+    """
+    Computes the distances of the given edge weight type from each of the
+    coordinates in ``coords_from`` to each of the coordinates in
+    ``coords_to``.
+
+    Parameters
+    ----------
+    coords_from
+        An m-by-d array of location coordinates.
+    coords_to
+        An n-by-d array of location coordinates.
+    edge_weight_type
+        An edge weight type with a registered distance kernel.
+
+    Returns
+    -------
+    np.ndarray
+        An m-by-n distances matrix.
+    """
+    kernel = get_kernel(edge_weight_type)
+    coords_from = np.atleast_2d(coords_from)
+    coords_to = np.atleast_2d(coords_to)
+
+    return kernel.distance(coords_from[:, None, :], coords_to[None, :, :])
+
+
+def edge_weight_dtype(coords: np.ndarray, edge_weight_type: str) -> np.dtype:
+    """
+    Returns the smallest dtype that holds the distances of the given edge
+    weight type between the coordinates. This is int32 or int64 for integral
+    kernels, depending on an upper bound on the distances, and float64
+    otherwise.
+
+    Parameters
+    ----------
+    coords
+        An n-by-d array of location coordinates.
+    edge_weight_type
+        An edge weight type with a registered distance kernel.
+
+    Returns
+    -------
+    np.dtype
+        The smallest dtype of the distances.
+    """
+    kernel = get_kernel(edge_weight_type)
+    coords = np.atleast_2d(coords)
+
+    if not kernel.integral:
+        return np.dtype(np.float64)
+
+    if coords.size == 0:
+        return np.dtype(np.int32)
+
+    if kernel.bound is None:
+        return np.dtype(np.int64)
+
+    bound = kernel.bound(coords)
+    if not np.isfinite(bound):
+        return np.dtype(np.float64)
+
+    for dtype in (np.int32, np.int64):
+        if bound <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+
+    return np.dtype(np.float64)
+
+
+def _squared_euclidean(
+    coords_from: np.ndarray, coords_to: np.ndarray
+) -> np.ndarray:
+    """
+    Accumulates the squared coordinate differences per dimension, so that
+    every entry is computed in exactly the same way regardless of which
+    block of the distance matrix it belongs to.
+    """
+    shape = np.broadcast_shapes(coords_from.shape[:-1], coords_to.shape[:-1])
+    sq_dist = np.zeros(shape)
+    diff = np.empty(shape)
+
+    for dim in range(coords_from.shape[-1]):
+        np.subtract(coords_from[..., dim], coords_to[..., dim], out=diff)
+        np.multiply(diff, diff, out=diff)
+        sq_dist += diff
+
+    return sq_dist
+
+
+def euclidean_distance(
+    coords_from: np.ndarray, coords_to: np.ndarray
+) -> np.ndarray:
+    sq_dist = _squared_euclidean(coords_from, coords_to)
+    return np.sqrt(sq_dist, out=sq_dist)
+
+
+def _floor_euclidean(coords_from, coords_to) -> np.ndarray:
+    distance = euclidean_distance(coords_from, coords_to)
+    return np.floor(distance, out=distance)
+
+
+def _ceil_euclidean(coords_from, coords_to) -> np.ndarray:
+    distance = euclidean_distance(coords_from, coords_to)
+    return np.ceil(distance, out=distance)
+
+
+def _exact_euclidean(coords_from, coords_to) -> np.ndarray:
+    distance = euclidean_distance(coords_from, coords_to)
+    distance *= 1000
+    return np.round(distance, out=distance)
+
+
+def _pseudo_euclidean(coords_from, coords_to) -> np.ndarray:
+    """
+    TSPLIB's ATT distance: the pseudo-Euclidean distance, rounded up to the
+    next integer unless it is an integer after rounding to nearest.
+    """
+    distance = _squared_euclidean(coords_from, coords_to)
+    distance /= 10.0
+    np.sqrt(distance, out=distance)
+
+    rounded = distance + 0.5
+    np.trunc(rounded, out=rounded)
+    rounded += rounded < distance
+    return rounded
+
+
+def manhattan_distance(coords_from, coords_to) -> np.ndarray:
+    shape = np.broadcast_shapes(coords_from.shape[:-1], coords_to.shape[:-1])
+    distance = np.zeros(shape)
+    diff = np.empty(shape)
+
+    for dim in range(coords_from.shape[-1]):
+        np.subtract(coords_from[..., dim], coords_to[..., dim], out=diff)
+        np.abs(diff, out=diff)
+        distance += diff
+
+    return distance
+
+
+def maximum_distance(coords_from, coords_to) -> np.ndarray:
+    shape = np.broadcast_shapes(coords_from.shape[:-1], coords_to.shape[:-1])
+    distance = np.zeros(shape)
+    diff = np.empty(shape)
+
+    for dim in range(coords_from.shape[-1]):
+        np.subtract(coords_from[..., dim], coords_to[..., dim], out=diff)
+        np.abs(diff, out=diff)
+        np.maximum(distance, diff, out=distance)
+
+    return distance
+
+
+def _geo_radians(coords: np.ndarray) -> np.ndarray:
+    """
+    Converts TSPLIB's DDD.MM geographical coordinates to radians.
+    """
+    degrees = np.trunc(coords)
+    minutes = coords - degrees
+    return _GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+
+def _geographical(coords_from, coords_to) -> np.ndarray:
+    """
+    TSPLIB's GEO distance: the great circle distance in kilometers between
+    the (latitude, longitude) coordinates in DDD.MM format, truncated after
+    adding one. This follows the TSPLIB formula exactly, so the distance
+    from a location to itself is one.
+    """
+    lat_from = _geo_radians(coords_from[..., 0])
+    lon_from = _geo_radians(coords_from[..., 1])
+    lat_to = _geo_radians(coords_to[..., 0])
+    lon_to = _geo_radians(coords_to[..., 1])
+
+    q1 = np.subtract(lon_from, lon_to)
+    np.cos(q1, out=q1)
+    q2 = np.subtract(lat_from, lat_to)
+    np.cos(q2, out=q2)
+    q3 = np.add(lat_from, lat_to)
+    np.cos(q3, out=q3)
+
+    # 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)
+    distance = np.add(1.0, q1)
+    distance *= q2
+    del q2
+    np.subtract(1.0, q1, out=q1)
+    q1 *= q3
+    del q3
+    distance -= q1
+    del q1
+    distance *= 0.5
+
+    np.clip(distance, -1.0, 1.0, out=distance)
+    np.arccos(distance, out=distance)
+    distance *= _GEO_RADIUS
+    distance += 1.0
+    return np.trunc(distance, out=distance)
+
+
+def _diagonal(coords: np.ndarray) -> float:
+    """
+    Returns the length of the diagonal of the bounding box of the locations,
+    which no Euclidean distance between them exceeds.
+    """
+    extent = coords.max(axis=0).astype(float) - coords.min(axis=0)
+    return hypot(*extent)
+
+
+def _rounded_bound(coords: np.ndarray) -> float:
+    return ceil(_diagonal(coords)) + 1 if np.isfinite(coords).all() else np.inf
+
+
+def _exact_bound(coords: np.ndarray) -> float:
+    return 1000 * _rounded_bound(coords)
+
+
+def _pseudo_bound(coords: np.ndarray) -> float:
+    # The ATT distance of the diagonal, rounded up to the next integer.
+    return _rounded_bound(coords) / sqrt(10) + 2
+
+
+register_edge_weight_type("EUC_2D", euclidean_distance)
+register_edge_weight_type("EUC_3D", euclidean_distance)
+register_edge_weight_type("FLOOR_2D", _floor_euclidean, True, _rounded_bound)
+register_edge_weight_type("CEIL_2D", _ceil_euclidean, True, _rounded_bound)
+register_edge_weight_type("EXACT_2D", _exact_euclidean, True, _exact_bound)
+register_edge_weight_type("ATT", _pseudo_euclidean, True, _pseudo_bound)
+register_edge_weight_type("MAN_2D", manhattan_distance)
+register_edge_weight_type("MAN_3D", manhattan_distance)
+register_edge_weight_type("MAX_2D", maximum_distance)
+register_edge_weight_type("MAX_3D", maximum_distance)
+register_edge_weight_type(
+    "GEO", _geographical, True, lambda _: ceil(_GEO_RADIUS * pi) + 1
+)
@@ -0,0 +1,220 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import numpy.typing as npt
+
+from ..parse_utils import is_auto_dtype
+from .kernels import edge_weight_dtype, get_kernel
+
+
+class LazyEdgeWeight:
+    """
+    Array-like edge weight matrix that computes the distances from the node
+    coordinates on demand. Rows are computed in blocks of
+    ``block_size`` rows and the most recently used blocks are cached, so
+    that only a bounded part of the full n-by-n matrix is ever in memory.
+    The block cache is thread-safe, so the edge weights can be shared across
+    threads.
+
+    Supports the indexing operations of a two-dimensional NumPy array:
+    scalars (``ew[i, j]``), rows (``ew[i]``), columns (``ew[:, j]``), slices
+    and (fancy) index arrays. Only selections of full rows use the row
+    blocks; other selections, like columns, compute just the selected
+    entries. Converting to an array (``np.asarray(ew)``) materializes the
+    full matrix.
+
+    Parameters
+    ----------
+    node_coord
+        An n-by-d array of location coordinates.
+    edge_weight_type
+        The edge weight type, which determines the distance kernel. Any edge
+        weight type in ``edge_weight_types()``. Defaults to "EUC_2D".
+    dtype
+        The dtype of the edge weights. Integer dtypes are only allowed for
+        edge weight types that round to integers. If "auto", the smallest
+        dtype that holds the edge weights is used (see ``edge_weight_dtype``).
+        Defaults to float64.
+    block_size
+        The number of rows computed at once. Defaults to 256.
+    cache_size
+        The maximum number of bytes of cached row blocks. Defaults to 256MB.
+    """
+
+    def __init__(
+        self,
+        node_coord: np.ndarray,
+        edge_weight_type: str = "EUC_2D",
+        dtype: npt.DTypeLike | None = None,
+        block_size: int = 256,
+        cache_size: int = 2**28,
+    ):
+        kernel = get_kernel(edge_weight_type)
+
+        if is_auto_dtype(dtype):
+            dtype = edge_weight_dtype(node_coord, edge_weight_type)
+
+        dtype = np.dtype(np.float64 if dtype is None else dtype)
+        if not kernel.integral and dtype.kind in "iu":
+            msg = "Integer dtype requires edge weight type that rounds."
+            raise ValueError(msg)
+
+        if block_size < 1:
+            raise ValueError("Block size must be positive.")
+
+        self._coords = np.atleast_2d(node_coord)
+        self._edge_weight_type = edge_weight_type
+        self._kernel = kernel
+        self._dtype = dtype
+        self._block_size = block_size
+        self._cache_size = cache_size
+        self._blocks: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_blocks"] = OrderedDict()  # cached blocks are not pickled
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def node_coord(self) -> np.ndarray:
+        return self._coords
+
+    @property
+    def edge_weight_type(self) -> str:
+        return self._edge_weight_type
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (len(self._coords), len(self._coords))
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def size(self) -> int:
+        return len(self._coords) ** 2
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def cached_bytes(self) -> int:
+        """
+        The number of bytes used by the currently cached row blocks.
+        """
+        with self._lock:
+            return sum(block.nbytes for block in self._blocks.values())
+
+    def __len__(self) -> int:
+        return len(self._coords)
+
+    def __repr__(self) -> str:
+        n = len(self._coords)
+        return f"LazyEdgeWeight(n={n}, type={self._edge_weight_type})"
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        data = self._rows(np.arange(len(self)))
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if len(key) > 2 or any(k is Ellipsis or k is None for k in key):
+            raise IndexError("Only row and column indices are supported.")
+
+        row_key = key[0]
+        col_key = key[1] if len(key) == 2 else slice(None)
+
+        n = len(self)
+        rows = self._indices(row_key)
+
+        if isinstance(col_key, slice) and col_key.indices(n) == (0, n, 1):
+            # Full rows are gathered from the cached row blocks.
+            data = self._rows(np.atleast_1d(rows).ravel())
+            return data.reshape((*np.shape(rows), n))
+
+        cols = self._indices(col_key)
+
+        if isinstance(row_key, slice) or isinstance(col_key, slice):
+            # A slice selects all combinations of the row and column indices,
+            # like np.ix_, rather than pairs of indices.
+            rows = np.reshape(rows, np.shape(rows) + (1,) * np.ndim(cols))
+
+        # Other selections, e.g., columns or individual entries, are computed
+        # directly from the coordinates, without computing (and caching) the
+        # full rows.
+        return self._entries(*np.broadcast_arrays(rows, cols))
+
+    def _indices(self, key) -> np.ndarray:
+        """
+        Normalizes the given index key into (an array of) non-negative
+        integer indices, raising an IndexError when out of bounds.
+        """
+        return np.arange(len(self))[key]
+
+    def _entries(self, rows: np.ndarray, cols: np.ndarray):
+        """
+        Computes the edge weights between the given pairs of indices.
+        """
+        from_coords = self._coords[np.ravel(rows)]
+        to_coords = self._coords[np.ravel(cols)]
+
+        distance = self._kernel.distance(from_coords, to_coords)
+        distance = distance.astype(self._dtype).reshape(np.shape(rows))
+
+        return distance if distance.ndim else distance.item()
+
+    def _rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Gathers the given rows of the edge weight matrix from the (cached)
+        row blocks.
+        """
+        data = np.empty((len(rows), len(self)), dtype=self.dtype)
+        block_idcs = rows // self._block_size
+
+        for block_idx in np.unique(block_idcs):
+            mask = block_idcs == block_idx
+            offset = block_idx * self._block_size
+            data[mask] = self._block(int(block_idx))[rows[mask] - offset]
+
+        return data
+
+    def _block(self, block_idx: int) -> np.ndarray:
+        """
+        Returns the given block of rows, computing it if it is not cached.
+        """
+        with self._lock:
+            if block_idx in self._blocks:
+                self._blocks.move_to_end(block_idx)
+                return self._blocks[block_idx]
+
+        start = block_idx * self._block_size
+        end = min(start + self._block_size, len(self))
+        block = self._kernel.distance(
+            self._coords[start:end, None, :], self._coords[None, :, :]
+        )
+        block = block.astype(self._dtype, copy=False)
+
+        with self._lock:
+            self._blocks[block_idx] = block
+            cached_bytes = sum(blk.nbytes for blk in self._blocks.values())
+
+            while cached_bytes > self._cache_size and len(self._blocks) > 1:
+                _, evicted = self._blocks.popitem(last=False)
+                cached_bytes -= evicted.nbytes
+
+        return block
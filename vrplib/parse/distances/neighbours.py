@@ -0,0 +1,448 @@
+from itertools import product
+from math import floor, prod
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from ..parse_utils import is_auto_dtype
+from .kernels import (
+    Kernel,
+    edge_weight_dtype,
+    euclidean_distance,
+    get_kernel,
+    manhattan_distance,
+    maximum_distance,
+)
+from .lazy_edge_weight import LazyEdgeWeight
+
+# Maps the edge weight types whose distances do not decrease with the
+# unrounded Euclidean, Manhattan or maximum distance to that distance. These
+# are never smaller than the largest coordinate difference, which bounds the
+# distance to the locations outside the searched grid cells.
+BASE_DISTANCES = {
+    "EUC_2D": euclidean_distance,
+    "EUC_3D": euclidean_distance,
+    "FLOOR_2D": euclidean_distance,
+    "CEIL_2D": euclidean_distance,
+    "EXACT_2D": euclidean_distance,
+    "ATT": euclidean_distance,
+    "MAN_2D": manhattan_distance,
+    "MAN_3D": manhattan_distance,
+    "MAX_2D": maximum_distance,
+    "MAX_3D": maximum_distance,
+}
+
+# Average number of locations per grid cell, per neighbour.
+_CELL_SIZE = 1
+
+# Maximum number of locations whose neighbours are searched together.
+_UNIT_SIZE = 64
+
+# Maximum average number of locations in a location's cell, relative to the
+# number of neighbours, before the grid is refined.
+_MAX_CROWDING = 4
+
+# Maximum number of consecutive refinements that do not halve the crowding,
+# and maximum number of cells of a refined grid.
+_MAX_FRUITLESS = 4
+_MAX_CELLS = 2**60
+
+# Maximum number of bytes of temporary arrays per group of units, which is
+# smaller than the memory limit because smaller groups are faster.
+_GROUP_BYTES = 2**24
+
+
+def nearest_neighbours(
+    node_coord: np.ndarray,
+    k: int,
+    edge_weight_type: str = "EUC_2D",
+    dtype: npt.DTypeLike | None = None,
+    memory_limit: int = 2**27,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes the k nearest neighbours of each location, without computing
+    the full distance matrix. The locations are bucketed in a uniform grid,
+    and the neighbours of the locations in a grid cell are searched in the
+    surrounding cells, extending the search until no location outside the
+    searched cells can be nearer. This takes O(n log n) time for evenly
+    spread locations, and O(nk) memory.
+
+    Parameters
+    ----------
+    node_coord
+        An n-by-d array of location coordinates.
+    k
+        The number of neighbours per location. At most n - 1 neighbours are
+        returned, since a location is not its own neighbour.
+    edge_weight_type
+        The edge weight type of the distances. One of the Euclidean,
+        Manhattan or maximum distance types, or "ATT". Defaults to "EUC_2D".
+    dtype
+        The dtype of the neighbour distances. Integer dtypes are only allowed
+        for edge weight types that round to integers. If "auto", the smallest
+        dtype that holds the distances is used. Defaults to float64.
+    memory_limit
+        The maximum number of bytes used for temporary arrays. Defaults to
+        128MB.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        The neighbours in compressed sparse row (CSR) format: the index
+        pointers, the neighbour indices and the neighbour distances. The
+        neighbours of location i are ``indices[indptr[i] : indptr[i + 1]]``,
+        sorted by increasing distance, and ties by index.
+    """
+    if edge_weight_type not in BASE_DISTANCES:
+        msg = f"Edge weight type {edge_weight_type} has no neighbour search."
+        raise ValueError(msg)
+
+    if k < 0:
+        raise ValueError("Number of neighbours must be non-negative.")
+
+    kernel = get_kernel(edge_weight_type)
+    coords = np.atleast_2d(np.asarray(node_coord, dtype=np.float64))
+
+    if is_auto_dtype(dtype):
+        dtype = edge_weight_dtype(coords, edge_weight_type)
+
+    dtype = np.dtype(np.float64 if dtype is None else dtype)
+    if not kernel.integral and dtype.kind in "iu":
+        msg = "Integer dtype requires edge weight type that rounds distances."
+        raise ValueError(msg)
+
+    n = len(coords)
+    k = min(k, max(n - 1, 0))
+    indices = np.empty((n, k), dtype=_index_dtype(n))
+
+    if k > 0:
+        distance = BASE_DISTANCES[edge_weight_type]
+        _grid_search(coords, k, distance, memory_limit, indices)
+
+    rows = np.repeat(np.arange(n), k)
+    weights = kernel.distance(coords[rows], coords[indices.ravel()])
+    indptr = np.arange(n + 1, dtype=np.int64) * k
+
+    return indptr, indices.ravel(), weights.astype(dtype, copy=False)
+
+
+def neighbours_from_matrix(
+    matrix: np.ndarray | LazyEdgeWeight, k: int, memory_limit: int = 2**27
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes the k nearest neighbours of each location from an explicit
+    edge weight matrix, in blocks of rows that use at most ``memory_limit``
+    bytes of temporary arrays.
+
+    Parameters
+    ----------
+    matrix
+        An n-by-n edge weight matrix, or lazy edge weights.
+    k
+        The number of neighbours per location. At most n - 1 neighbours are
+        returned, since a location is not its own neighbour.
+    memory_limit
+        The maximum number of bytes used for temporary arrays. At least one
+        row is processed at a time. Defaults to 128MB.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        The neighbours in compressed sparse row (CSR) format, like
+        ``nearest_neighbours``.
+    """
+    if k < 0:
+        raise ValueError("Number of neighbours must be non-negative.")
+
+    n = len(matrix)
+    k = min(k, max(n - 1, 0))
+    indices = np.empty((n, k), dtype=_index_dtype(n))
+    candidates = np.arange(n)
+    block_size = max(memory_limit // (4 * 8 * max(n, 1)), 1)
+
+    for start in range(0, n if k > 0 else 0, block_size):
+        end = min(start + block_size, n)
+        block = np.array(matrix[start:end], dtype=np.float64)
+        block[np.arange(end - start), np.arange(start, end)] = np.inf
+        indices[start:end] = _smallest(block, candidates, k)[0]
+
+    rows = np.repeat(np.arange(n), k)
+    weights = np.asarray(matrix[rows, indices.ravel()])
+    indptr = np.arange(n + 1, dtype=np.int64) * k
+
+    return indptr, indices.ravel(), weights
+
+
+def _grid_search(
+    coords: np.ndarray,
+    k: int,
+    distance: Kernel,
+    memory_limit: int,
+    out: np.ndarray,
+):
+    """
+    Writes the indices of the k nearest neighbours of each location to out,
+    using the given base distance.
+    """
+    n = len(coords)
+    lower = coords.min(axis=0)
+    extent = coords.max(axis=0) - lower
+    if not np.isfinite(extent).all():
+        raise ValueError("Coordinates must be finite.")
+
+    # Cells of equal width in all dimensions, so that each cell contains
+    # about k * _CELL_SIZE locations on average.
+    positive = extent[extent > 0]
+    target = k * _CELL_SIZE
+    volume = prod(positive.tolist()) * target / n
+    width = volume ** (1 / len(positive)) if len(positive) else 1.0
+    limit = min(memory_limit, _GROUP_BYTES)
+    grid = _make_grid(coords, lower, extent, width, limit)
+
+    # Clustered locations, or a few far away outliers, leave most cells of
+    # the bounding box empty and crowd the others. Such grids are refined
+    # until the cells of the locations are about as full as they would be
+    # for evenly spread locations. Refining does not help for, e.g., many
+    # identical locations, so it stops after a few fruitless refinements.
+    best = grid
+    fruitless = 0
+
+    while len(positive) and best.crowding > _MAX_CROWDING * target:
+        factor = (grid.crowding / target) ** (1 / len(positive))
+        finer = grid.width / max(factor, 2)
+        if prod(floor(ext / finer) + 1 for ext in extent) > _MAX_CELLS:
+            break
+
+        grid = _make_grid(coords, lower, extent, finer, limit)
+
+        if grid.crowding < best.crowding / 2:
+            best, fruitless = grid, 0
+        elif (fruitless := fruitless + 1) == _MAX_FRUITLESS:
+            break
+
+    grid = best
+
+    # The locations are searched in units of at most _UNIT_SIZE locations of
+    # the same cell, which all share the same candidate neighbours: the
+    # locations in the cells within some radius. Units whose k-th nearest
+    # candidate is not provably final are searched again with twice the
+    # radius, which is rare for evenly spread locations.
+    is_first = np.flatnonzero(np.diff(grid.cells, prepend=-1))
+    counts = np.diff(np.append(is_first, n))
+    num_units = -(-counts // _UNIT_SIZE)
+    offsets = _ragged_arange(num_units) * _UNIT_SIZE
+    unit_cells = np.repeat(grid.cells[is_first], num_units)
+    unit_starts = np.repeat(is_first, num_units) + offsets
+    unit_sizes = np.minimum(np.repeat(counts, num_units) - offsets, _UNIT_SIZE)
+    radius = 1
+
+    while len(unit_cells):
+        units = (unit_cells, unit_starts, unit_sizes)
+        failed = _search_units(coords, k, distance, grid, radius, units, out)
+        unit_cells = unit_cells[failed]
+        unit_starts = unit_starts[failed]
+        unit_sizes = unit_sizes[failed]
+        radius *= 2
+
+
+class _Grid(NamedTuple):
+    shape: tuple[int, ...]
+    width: float
+    order: np.ndarray  # locations sorted by cell
+    cells: np.ndarray  # flat cell index of each location in order
+    crowding: float  # average number of locations in a location's cell
+    memory_limit: int  # bytes of temporary arrays per group of units
+
+
+def _make_grid(
+    coords: np.ndarray,
+    lower: np.ndarray,
+    extent: np.ndarray,
+    width: float,
+    memory_limit: int,
+) -> _Grid:
+    """
+    Buckets the locations in a grid of cells with the given width. Only the
+    occupied cells are stored, so the grid may have many more cells than
+    locations.
+    """
+    shape = tuple(floor(ext / width) + 1 for ext in extent)
+    cells = np.floor((coords - lower) / width).astype(np.int64)
+    cells = np.minimum(cells, np.array(shape) - 1)
+    cell_idcs = np.ravel_multi_index(tuple(cells.T), shape)
+
+    order = np.argsort(cell_idcs, kind="stable")
+    cell_idcs = cell_idcs[order]
+    is_first = np.flatnonzero(np.diff(cell_idcs, prepend=-1))
+    counts = np.diff(np.append(is_first, len(coords)))
+    crowding = float((counts**2).sum() / max(len(coords), 1))
+
+    return _Grid(shape, width, order, cell_idcs, crowding, memory_limit)
+
+
+def _search_units(
+    coords: np.ndarray,
+    k: int,
+    distance: Kernel,
+    grid: _Grid,
+    radius: int,
+    units: tuple[np.ndarray, np.ndarray, np.ndarray],
+    out: np.ndarray,
+) -> np.ndarray:
+    """
+    Searches the neighbours of the given units among the locations in the
+    cells within the given radius, and writes those that are final to out.
+    Returns a mask of the units whose neighbours are not yet final.
+    """
+    order, cells, shape = grid.order, grid.cells, grid.shape
+    unit_cells, unit_starts, num_points = units
+    n = len(coords)
+
+    # The candidate cells of a unit are contiguous along the last dimension,
+    # so the candidates are gathered as one slice of order per offset in the
+    # other dimensions. When there are more such offsets than locations, all
+    # locations are gathered instead.
+    pos = np.stack(np.unravel_index(unit_cells, shape), axis=-1)
+    spans = [min(radius, size - 1) for size in shape[:-1]]
+
+    if prod(2 * span + 1 for span in spans) > n:
+        slice_starts = np.zeros((len(unit_cells), 1), dtype=np.int64)
+        slice_lengths = np.full((len(unit_cells), 1), n, dtype=np.int64)
+    else:
+        ranges = [range(-span, span + 1) for span in spans]
+        offsets = np.array(list(product(*ranges)), dtype=np.int64)
+
+        prefix = pos[:, None, :-1] + offsets[None]
+        valid = np.all((prefix >= 0) & (prefix < shape[:-1]), axis=-1)
+        prefix = np.where(valid[..., None], prefix, 0)
+        lo = np.maximum(pos[:, -1] - radius, 0)
+        hi = np.minimum(pos[:, -1] + radius, shape[-1] - 1)
+
+        first = _ravel(
+            prefix, np.broadcast_to(lo[:, None], valid.shape), shape
+        )
+        last = _ravel(prefix, np.broadcast_to(hi[:, None], valid.shape), shape)
+        slice_starts = np.searchsorted(cells, first, side="left")
+        slice_ends = np.searchsorted(cells, last, side="right")
+        slice_lengths = np.where(valid, slice_ends - slice_starts, 0)
+
+    num_candidates = slice_lengths.sum(axis=1)
+    covers_all = num_candidates == n
+
+    # Units with too few candidates are certainly not final.
+    failed = (num_candidates <= k) & ~covers_all
+    todo = np.flatnonzero(~failed)
+
+    if len(todo) == 0:
+        return failed
+
+    # Units are grouped by their number of candidates, to limit padding.
+    todo = todo[np.argsort(num_candidates[todo], kind="stable")]
+    max_size = num_points[todo].max() * num_candidates[todo].max()
+    group_size = max(grid.memory_limit // (4 * 8 * max_size), 1)
+
+    for start in range(0, len(todo), group_size):
+        group = todo[start : start + group_size]
+        size = num_candidates[group].max()
+
+        candidates = _gather_slices(
+            order, slice_starts[group], slice_lengths[group], size
+        )
+        points = _gather_slices(
+            order,
+            unit_starts[group][:, None],
+            num_points[group][:, None],
+            num_points[group].max(),
+        )
+
+        dist = distance(
+            coords[np.maximum(points, 0), None, :],
+            coords[np.maximum(candidates, 0)[:, None, :], :],
+        )
+        is_self = points[:, :, None] == candidates[:, None, :]
+        dist[is_self | (candidates[:, None, :] < 0)] = np.inf
+
+        # Locations outside the searched cells are at least this far, so
+        # neighbours strictly nearer than this are final, including ties.
+        reach = radius * grid.width
+        nearest, kth = _smallest(dist, candidates[:, None, :], k)
+        kth[points < 0] = -np.inf
+        group_failed = (kth.max(axis=1) >= reach) & ~covers_all[group]
+        failed[group[group_failed]] = True
+
+        done = (points >= 0) & ~group_failed[:, None]
+        out[points[done]] = nearest[done]
+
+    return failed
+
+
+def _ravel(prefix: np.ndarray, last: np.ndarray, shape: tuple[int, ...]):
+    """
+    Returns the flat indices of the cells with the given prefix and last
+    dimension indices.
+    """
+    idcs = np.concatenate((prefix, last[..., None]), axis=-1)
+    return np.ravel_multi_index(tuple(np.moveaxis(idcs, -1, 0)), shape)
+
+
+def _ragged_arange(lengths: np.ndarray) -> np.ndarray:
+    """
+    Returns the concatenation of ``np.arange(length)`` for each length.
+    """
+    ends = np.cumsum(lengths)
+    return np.arange(ends[-1] if len(ends) else 0) - np.repeat(
+        ends - lengths, lengths
+    )
+
+
+def _gather_slices(
+    order: np.ndarray, slice_starts: np.ndarray, lengths: np.ndarray, size: int
+) -> np.ndarray:
+    """
+    Returns a matrix whose rows concatenate the slices of order with the
+    given starts and lengths, padded with -1 up to the given size.
+    """
+    rows = np.repeat(np.arange(len(lengths)), lengths.sum(axis=1))
+    within = _ragged_arange(lengths.ravel())
+    sources = np.repeat(slice_starts.ravel(), lengths.ravel()) + within
+    row_offsets = np.cumsum(lengths, axis=1) - lengths
+    cols = np.repeat(row_offsets.ravel(), lengths.ravel()) + within
+
+    gathered = np.full((len(lengths), size), -1, dtype=np.int64)
+    gathered[rows, cols] = order[sources]
+    return gathered
+
+
+def _smallest(
+    dist: np.ndarray, candidates: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the candidates with the k smallest distances along the last axis
+    of the distances, sorted by distance, and ties by candidate index, and
+    the k-th smallest distances. The candidates broadcast to the distances.
+    """
+    candidates = np.broadcast_to(candidates, dist.shape)
+    idcs = np.argpartition(dist, k - 1, axis=-1)[..., :k]
+    values = np.take_along_axis(dist, idcs, axis=-1)
+    nearest = np.take_along_axis(candidates, idcs, axis=-1)
+
+    order = np.lexsort((nearest, values), axis=-1)
+    values = np.take_along_axis(values, order, axis=-1)
+    nearest = np.take_along_axis(nearest, order, axis=-1)
+    kth = values[..., -1]
+
+    # Candidates that tie with the k-th smallest distance are selected
+    # arbitrarily, so rows with unselected ties are sorted in full.
+    num_ties = (dist == kth[..., None]).sum(axis=-1)
+    tied = np.nonzero(num_ties > (values == kth[..., None]).sum(axis=-1))
+
+    if len(tied[0]):
+        full = np.lexsort((candidates[tied], dist[tied]), axis=-1)[:, :k]
+        nearest[tied] = np.take_along_axis(candidates[tied], full, axis=-1)
+
+    return nearest, kth
+
+
+def _index_dtype(n: int) -> np.dtype:
+    return np.dtype(np.int32 if n <= np.iinfo(np.int32).max else np.int64)
@@ -1,6 +1,44 @@
-from itertools import combinations
+import os
+from itertools import chain
+from math import isqrt
+from typing import Iterable, Iterator
 
 import numpy as np
+import numpy.typing as npt
+
+from vrplib.cancellation import check_cancelled
+
+from .distances import (
+    LazyEdgeWeight,
+    edge_weight_dtype,
+    edge_weight_types,
+    get_kernel,
+    nearest_neighbours,
+    neighbours_from_matrix,
+)
+from .distances.kernels import NUM_TEMPORARIES
+from .distances.neighbours import BASE_DISTANCES
+from .parse_utils import compact_dtype, is_auto_dtype, tokenize_numeric
+
+DEFAULT_MEMORY_LIMIT = 2**27
+
+# Maps each TSPLIB explicit edge weight format to the row format with the
+# same values order. Column formats list the values of the transposed matrix,
+# which is the same as the opposite row format for symmetric matrices.
+ROW_FORMATS = {
+    "LOWER_ROW": "LOWER_ROW",
+    "UPPER_COL": "LOWER_ROW",
+    "UPPER_ROW": "UPPER_ROW",
+    "LOWER_COL": "UPPER_ROW",
+    "LOWER_DIAG_ROW": "LOWER_DIAG_ROW",
+    "UPPER_DIAG_COL": "LOWER_DIAG_ROW",
+    "UPPER_DIAG_ROW": "UPPER_DIAG_ROW",
+    "LOWER_DIAG_COL": "UPPER_DIAG_ROW",
+}
+EXPLICIT_FORMATS = ("FULL_MATRIX", *ROW_FORMATS)
+
+# Maximum number of triangular values that are scattered at once.
+_SCATTER_SIZE = 2**20
 
 
 def parse_distances(
@@ -9,13 +47,17 @@ def parse_distances(
     edge_weight_format: str | None = None,
     node_coord: np.ndarray | None = None,
     comment: str | None = None,
+    lazy: bool = False,
+    dtype: npt.DTypeLike | None = None,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
     **kwargs: float | str | np.ndarray,
-) -> np.ndarray:
+) -> np.ndarray | LazyEdgeWeight:
     """
     Parses the distances. The specification "edge_weight_type" describes how
     the distances should be parsed. The two main ways are to calculate the
-    Euclidean distances using the the node coordinates or by parsing an
-    explicit distance matrix.
+    distances between the node coordinates using the distance kernel that is
+    registered for the edge weight type (see ``register_edge_weight_type``),
+    or by parsing an explicit distance matrix.
 
     Parameters
     ----------
@@ -28,74 +70,517 @@ def parse_distances(
     node_coord, optional
         The customer location coordinates.
     comment, optional
-        The comment specification in the instance.
+        The comment specification in the instance. Not used.
+    lazy, optional
+        Whether to return a ``LazyEdgeWeight`` that computes the distances
+        on demand, rather than a dense matrix. Only applies to edge weight
+        types that are computed from the node coordinates. Defaults to False.
+    dtype, optional
+        The dtype of the distances matrix, e.g., float32 to halve the memory
+        usage or int32 for rounded Euclidean edge weight types. If "auto",
+        the smallest integer dtype (int32 or int64) that holds the distances
+        is used for integer-valued distances. Defaults to float64 for
+        distances computed from the node coordinates and to the data type
+        otherwise.
+    memory_limit, optional
+        The maximum number of bytes used for temporary arrays when computing
+        distances from the node coordinates. Defaults to 128MB.
     **kwargs, optional
         Optional keyword arguments.
 
     Returns
     -------
-    np.ndarray
+    np.ndarray | LazyEdgeWeight
         An n-by-n distances matrix.
     """
-    if "2D" in edge_weight_type:  # Euclidean distance on node coordinates
+    if edge_weight_type in edge_weight_types():  # from node coordinates
         if node_coord is None:
             msg = (
-                "Cannot compute Euclidean distances because node coordinates "
-                "are not provided."
+                "Cannot compute distances because node coordinates are not "
+                "provided."
             )
             raise ValueError(msg)
 
-        distance = pairwise_euclidean(node_coord)
-
-        if edge_weight_type == "EUC_2D":
-            return distance
-
-        if edge_weight_type == "FLOOR_2D":
-            return np.floor(distance)
+        if lazy:
+            return LazyEdgeWeight(node_coord, edge_weight_type, dtype)
 
-        if edge_weight_type == "EXACT_2D":
-            return np.round(distance * 1000)
-
-        if edge_weight_type == "CEIL_2D":
-            return np.ceil(distance)
+        return pairwise_distances(
+            node_coord, edge_weight_type, dtype, memory_limit
+        )
 
     if edge_weight_type == "EXPLICIT":
-        if edge_weight_format == "LOWER_ROW":
-            # TODO Eilon instances edge weight specifications are incorrect in
-            # (C)VRPLIB format. Find a better way to identify Eilon instances.
-            if comment is not None and "Eilon" in comment:
-                return from_eilon(data)
-
-            return from_lower_row(data)
+        # Eilon instances specify LOWER_ROW in (C)VRPLIB format, but their
+        # data is column-wise. These are recognized by their line layout.
+        if edge_weight_format == "LOWER_ROW" and is_eilon_layout(data):
+            return from_eilon(data, dtype)
 
-        if edge_weight_format == "FULL_MATRIX":
-            return np.array(data)
+        if edge_weight_format in EXPLICIT_FORMATS:
+            return from_explicit(data, edge_weight_format, dtype)
 
     raise ValueError("Edge weight type or format unknown.")
 
 
-def pairwise_euclidean(coords: np.ndarray) -> np.ndarray:
+def parse_neighbours(
+    k: int,
+    edge_weight_type: str,
+    node_coord: np.ndarray | None = None,
+    edge_weight: np.ndarray | LazyEdgeWeight | None = None,
+    dtype: npt.DTypeLike | None = None,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    **kwargs: float | str | np.ndarray,
+) -> dict[str, np.ndarray]:
     """
-    Computes the pairwise Euclidean distance between the passed-in coordinates.
+    Parses the k nearest neighbours of each location. These are searched in
+    the node coordinates without computing the full distance matrix, if the
+    edge weight type supports this (see ``nearest_neighbours``), and are
+    selected from the edge weights otherwise.
+
+    Parameters
+    ----------
+    k
+        The number of neighbours per location.
+    edge_weight_type
+        The type of the edge weight data.
+    node_coord, optional
+        The customer location coordinates.
+    edge_weight, optional
+        The edge weights, which are used if the neighbours cannot be searched
+        in the node coordinates.
+    dtype, optional
+        The dtype of the neighbour distances, like in ``parse_distances``.
+    memory_limit, optional
+        The maximum number of bytes used for temporary arrays. Defaults to
+        128MB.
+    **kwargs, optional
+        Optional keyword arguments.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        The neighbours in compressed sparse row (CSR) format: the neighbours
+        of location i are ``neighbours[neighbour_indptr[i] :
+        neighbour_indptr[i + 1]]``, at distances ``neighbour_weight`` over
+        the same range.
+    """
+    if node_coord is not None and edge_weight_type in BASE_DISTANCES:
+        csr = nearest_neighbours(
+            node_coord, k, edge_weight_type, dtype, memory_limit
+        )
+    elif edge_weight is not None:
+        csr = neighbours_from_matrix(edge_weight, k, memory_limit)
+    else:
+        msg = "Cannot compute neighbours without node coordinates or weights."
+        raise ValueError(msg)
+
+    keys = ("neighbour_indptr", "neighbours", "neighbour_weight")
+    return dict(zip(keys, csr))
+
+
+def pairwise_distances(
+    coords: np.ndarray,
+    edge_weight_type: str = "EUC_2D",
+    dtype: npt.DTypeLike | None = None,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+) -> np.ndarray:
+    """
+    Computes the pairwise distances of the given edge weight type between the
+    passed-in coordinates, using its registered distance kernel. The
+    distances are computed in blocks of rows that are written directly into
+    the output matrix, so that the temporary arrays never use more than
+    ``memory_limit`` bytes.
 
     Parameters
     ----------
     coords
-        An n-by-2 array of location coordinates.
+        An n-by-d array of location coordinates.
+    edge_weight_type
+        Any edge weight type in ``edge_weight_types()``. Defaults to
+        "EUC_2D", which does not round.
+    dtype
+        The dtype of the distances matrix. Integer dtypes are only allowed
+        for edge weight types that round to integers, and raise a ValueError
+        when the distances might not fit. If "auto", the smallest dtype that
+        holds the distances is used. Defaults to float64.
+    memory_limit
+        The maximum number of bytes used for temporary arrays. At least one
+        row is computed at a time. Defaults to 128MB.
 
     Returns
     -------
     np.ndarray
-        An n-by-n Euclidean distances matrix.
+        An n-by-n distances matrix.
 
     """
+    kernel = get_kernel(edge_weight_type)
     coords = np.atleast_2d(coords)
 
-    sq_sum = (coords**2).sum(axis=1)
-    sq_dist = np.add.outer(sq_sum, sq_sum) - 2 * (coords @ coords.T)
-    np.fill_diagonal(sq_dist, 0)  # avoids minor numerical issues
+    if is_auto_dtype(dtype):
+        dtype = edge_weight_dtype(coords, edge_weight_type)
+
+    dtype = np.dtype(np.float64 if dtype is None else dtype)
+
+    if not kernel.integral and dtype.kind in "iu":
+        msg = "Integer dtype requires edge weight type that rounds distances."
+        raise ValueError(msg)
+
+    # Integer distances are checked against the kernel's upper bound, or
+    # otherwise per block, so that they never silently wrap around.
+    is_integer = dtype.kind in "iu"
+    bound = kernel.bound if is_integer else None
+    check_blocks = is_integer and bound is None
+
+    if bound is not None and bound(coords) > np.iinfo(dtype).max:
+        raise ValueError(f"Distances do not fit in {dtype}.")
+
+    n = len(coords)
+    distances = np.empty((n, n), dtype=dtype)
+    block_size = max(memory_limit // (NUM_TEMPORARIES * 8 * max(n, 1)), 1)
+
+    for start in range(0, n, block_size):
+        check_cancelled()
+        end = min(start + block_size, n)
+        block = kernel.distance(coords[start:end, None, :], coords[None, :, :])
+
+        if check_blocks:
+            _check_integer_values(block, dtype)
+
+        distances[start:end] = block
+        del block  # release the temporaries before computing the next block
+
+    return distances
+
+
+# Kept for backwards compatibility: the Euclidean edge weight types are
+# computed by their registered distance kernels like all others.
+pairwise_euclidean = pairwise_distances
+
+
+def from_explicit(
+    data: list | np.ndarray,
+    edge_weight_format: str,
+    dtype: npt.DTypeLike | None = None,
+) -> np.ndarray:
+    """
+    Computes a full distances matrix from explicit edge weight data in one of
+    the TSPLIB explicit edge weight formats. The data is flattened into a
+    single buffer, from which the dimension is derived. Triangular formats
+    are scattered symmetrically into the output in blocks of rows, using
+    precomputed row and column indices for each block.
+
+    Parameters
+    ----------
+    data
+        The edge weight data, either as flat buffer or as (ragged) rows. The
+        line breaks in the data do not need to correspond to matrix rows.
+    edge_weight_format
+        One of the explicit edge weight formats in ``EXPLICIT_FORMATS``.
+    dtype
+        The dtype of the distances matrix. If "auto", the smallest integer
+        dtype (int32 or int64) is used if all values are integers that fit,
+        and the data type otherwise. Integer dtypes raise a ValueError when
+        the values are not integers that fit. Defaults to the data type for
+        "FULL_MATRIX" and to float64 for triangular formats.
+
+    Returns
+    -------
+    np.ndarray
+        An n-by-n distances matrix.
+    """
+    if edge_weight_format not in EXPLICIT_FORMATS:
+        raise ValueError(f"Edge weight format {edge_weight_format} unknown.")
+
+    flat = _flatten(data)
+    n = _explicit_dimension(len(flat), edge_weight_format)
+
+    if is_auto_dtype(dtype):
+        dtype = compact_dtype(flat)
+    elif dtype is not None:
+        _check_integer_values(flat, dtype)
+
+    if edge_weight_format == "FULL_MATRIX":
+        dtype = flat.dtype if dtype is None else dtype
+        return flat.reshape(n, n).astype(dtype)
+
+    distances = np.zeros((n, n), dtype=np.float64 if dtype is None else dtype)
+    lengths, col_starts = _row_layout(n, edge_weight_format)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    start = 0
+    while start < n:
+        # Scatter as many rows as fit in a bounded number of entries, so that
+        # the index arrays stay small compared to the distances matrix.
+        end = np.searchsorted(offsets, offsets[start] + _SCATTER_SIZE, "right")
+        end = min(max(end - 1, start + 1), n)
+
+        values = flat[offsets[start] : offsets[end]]
+        _scatter_rows(distances, values, start, end, lengths, col_starts)
+        start = end
+
+    return distances
+
+
+def from_explicit_lines(
+    lines: Iterable[str],
+    edge_weight_format: str,
+    dimension: int,
+    path: str | os.PathLike,
+    dtype: npt.DTypeLike | None = None,
+    chunk_size: int = 2**20,
+) -> np.memmap:
+    """
+    Parses explicit edge weight data lines directly into a memory-mapped
+    ``.npy`` file. The lines are consumed in chunks, so that only one chunk of
+    lines and values is kept in memory at a time.
+
+    Parameters
+    ----------
+    lines
+        An iterable over the edge weight data lines.
+    edge_weight_format
+        One of the explicit edge weight formats in ``EXPLICIT_FORMATS``. Like
+        ``parse_distances``, Eilon instances are recognized from the layout
+        of the data lines: these specify "LOWER_ROW", but line i contains
+        n - 1 - i values (see ``is_eilon_layout``). Such lines are buffered
+        until the layout is known.
+    dimension
+        The dimension of the distances matrix.
+    path
+        The path of the ``.npy`` file to write to. Existing files are
+        overwritten.
+    dtype
+        The dtype of the distances matrix. Since the values are not known
+        before streaming, "auto" is the same as the default float64.
+    chunk_size
+        The (approximate) number of characters parsed at once. Defaults to
+        about one million.
+
+    Returns
+    -------
+    np.memmap
+        An n-by-n distances matrix, memory-mapped to the given file.
+    """
+    if edge_weight_format not in EXPLICIT_FORMATS:
+        raise ValueError(f"Edge weight format {edge_weight_format} unknown.")
+
+    if not isinstance(dimension, int) or dimension < 1:
+        raise ValueError("Streaming edge weights requires a valid dimension.")
+
+    if is_auto_dtype(dtype):
+        dtype = None
+
+    n = dimension
+    distances = np.lib.format.open_memmap(
+        path,
+        mode="w+",
+        dtype=np.float64 if dtype is None else dtype,
+        shape=(n, n),
+    )
+
+    fmt = edge_weight_format
+    if fmt == "LOWER_ROW":
+        lines = iter(lines)
+        head, is_eilon = _eilon_head(lines, n)
+        lines = chain(head, lines)
+
+        if is_eilon:
+            fmt = "LOWER_COL"
+
+    flat = distances.reshape(-1)
+    num_written = 0  # only used for FULL_MATRIX
+    lengths, col_starts = _row_layout(n, fmt)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    pending = np.empty(0)
+    row = 0
+
+    for chunk in _chunks(lines, chunk_size):
+        if (parsed := tokenize_numeric(chunk)) is None:
+            raise ValueError("Edge weight data contains non-numeric values.")
+
+        values, _ = parsed
+        _check_integer_values(values, distances.dtype)
+
+        if fmt == "FULL_MATRIX":
+            if num_written + len(values) > n * n:
+                break  # too many values; raises below
+
+            flat[num_written : num_written + len(values)] = values
+            num_written += len(values)
+            continue
+
+        # Scatter all complete rows, and keep the values of the incomplete
+        # last row for the next chunk.
+        pending = np.concatenate((pending, values))
+        end = np.searchsorted(offsets, offsets[row] + len(pending), "right")
+        end = min(end - 1, n)
+        num_values = offsets[end] - offsets[row]
+
+        _scatter_rows(
+            distances, pending[:num_values], row, end, lengths, col_starts
+        )
+        pending = pending[num_values:]
+        row = end
+
+    if fmt == "FULL_MATRIX":
+        is_complete = num_written == n * n
+    else:
+        is_complete = offsets[row] == offsets[-1] and len(pending) == 0
+
+    if not is_complete:
+        msg = f"Edge weights do not form a {n}-dimensional {fmt} matrix."
+        raise ValueError(msg)
+
+    distances.flush()
+    return distances
+
+
+def _check_integer_values(values: np.ndarray, dtype: npt.DTypeLike):
+    """
+    Raises a ValueError when the values are not all integers that fit in the
+    given integer dtype. Values for other dtypes are not checked.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in "iu" or values.size == 0:
+        return
+
+    if values.dtype.kind not in "iu":
+        with np.errstate(invalid="ignore"):
+            if not (values == np.trunc(values)).all():  # also excludes NaN
+                msg = f"Edge weights must be integers for dtype {dtype}."
+                raise ValueError(msg)
+
+    # Compares Python scalars, which is exact also for large floats.
+    info = np.iinfo(dtype)
+    if values.min().item() < info.min or values.max().item() > info.max:
+        raise ValueError(f"Edge weights do not fit in {dtype}.")
+
+
+def _eilon_head(
+    lines: Iterator[str], dimension: int
+) -> tuple[list[str], bool]:
+    """
+    Reads the first lines of "LOWER_ROW" edge weight data for as long as
+    these follow the column-wise layout of Eilon instances. Returns the
+    lines that were read, and whether all lines follow that layout.
+    """
+    lengths = np.arange(dimension - 1, 0, -1)
+    head: list[str] = []
+
+    for length in lengths:
+        line = next(lines, None)
+        if line is None:
+            break
+
+        head.append(line)
+        if len(line.split()) != length:
+            break
+
+    counts = [len(line.split()) for line in head]
+    return head, _is_column_layout(np.array(counts, dtype=int), dimension)
+
+
+def _chunks(lines: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    """
+    Yields lists of consecutive lines with about ``chunk_size`` characters.
+    """
+    chunk: list[str] = []
+    num_chars = 0
+
+    for line in lines:
+        chunk.append(line)
+        num_chars += len(line)
+
+        if num_chars >= chunk_size:
+            yield chunk
+            chunk = []
+            num_chars = 0
+
+    if chunk:
+        yield chunk
+
+
+def _flatten(data: list | np.ndarray) -> np.ndarray:
+    """
+    Flattens the (possibly ragged) rows of edge weight data into a 1D array.
+    """
+    if isinstance(data, np.ndarray) and data.dtype != object:
+        return data.ravel()
+
+    if len(data) == 0:
+        return np.array([])
+
+    return np.concatenate([np.ravel(row) for row in data])
+
+
+def _explicit_dimension(num_values: int, edge_weight_format: str) -> int:
+    """
+    Derives the dimension of the distances matrix from the number of values
+    in the explicit edge weight data.
+    """
+    if edge_weight_format == "FULL_MATRIX":
+        n = isqrt(num_values)
+        num_expected = n * n
+    elif "DIAG" in edge_weight_format:
+        n = (isqrt(8 * num_values + 1) - 1) // 2
+        num_expected = n * (n + 1) // 2
+    else:
+        n = (isqrt(8 * num_values + 1) + 1) // 2
+        num_expected = n * (n - 1) // 2
+
+    if num_values != num_expected:
+        msg = f"{num_values} edge weights do not form a {edge_weight_format}."
+        raise ValueError(msg)
+
+    return n
+
+
+def _row_layout(
+    n: int, edge_weight_format: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the number of values and the first column index of each matrix
+    row in the given format. Column formats are the transpose of
+    the opposite row formats, which is the same for symmetric matrices.
+    """
+    if edge_weight_format == "FULL_MATRIX":
+        return np.full(n, n), np.zeros(n, dtype=int)
+
+    fmt = ROW_FORMATS[edge_weight_format]
+    rows = np.arange(n)
+
+    if fmt == "LOWER_ROW":
+        return rows, np.zeros(n, dtype=int)
 
-    return np.sqrt(sq_dist)
+    if fmt == "LOWER_DIAG_ROW":
+        return rows + 1, np.zeros(n, dtype=int)
+
+    if fmt == "UPPER_ROW":
+        return n - rows - 1, rows + 1
+
+    return n - rows, rows  # UPPER_DIAG_ROW
+
+
+def _scatter_rows(
+    distances: np.ndarray,
+    values: np.ndarray,
+    start: int,
+    end: int,
+    lengths: np.ndarray,
+    col_starts: np.ndarray,
+):
+    """
+    Scatters the triangular values of rows ``start`` up to ``end`` into both
+    triangles of the distances matrix.
+    """
+    row_lengths = lengths[start:end]
+    row_offsets = np.cumsum(row_lengths) - row_lengths
+
+    rows = np.repeat(np.arange(start, end), row_lengths)
+    cols = np.arange(len(values)) + np.repeat(
+        col_starts[start:end] - row_offsets, row_lengths
+    )
+
+    distances[rows, cols] = values
+    distances[cols, rows] = values
 
 
 def from_lower_row(triangular: np.ndarray) -> np.ndarray:
@@ -114,35 +599,53 @@ def from_lower_row(triangular: np.ndarray) -> np.ndarray:
     np.ndarray
         A n-by-n distances matrix.
     """
-    n = len(triangular) + 1
-    distances = np.zeros((n, n))
+    return from_explicit(triangular, "LOWER_ROW")
 
-    for i in range(n - 1):
-        distances[i + 1, : i + 1] = triangular[i]
 
-    return distances + distances.T
-
-
-def from_eilon(edge_weights: np.ndarray) -> np.ndarray:
+def from_eilon(
+    edge_weights: list | np.ndarray, dtype: npt.DTypeLike | None = None
+) -> np.ndarray:
     """
     Computes a full distances matrix from the Eilon instances with "LOWER_ROW"
     edge weight format. The specification is incorrect, instead the edge weight
     section needs to be parsed as a flattend, column-wise triangular matrix.
+    Column-wise lower triangular values are ordered like the row-wise upper
+    triangular values, so these are decoded in the same (vectorized) way.
 
     See https://github.com/leonlan/VRPLIB/issues/40.
     """
-    flattened = [dist for row in edge_weights for dist in row]
-    n = int((2 * len(flattened)) ** 0.5) + 1  # The (n+1)-th triangular number
+    return from_explicit(edge_weights, "LOWER_COL", dtype)
 
-    distances = np.zeros((n, n))
-    indices = sorted([(i, j) for (i, j) in combinations(range(n), r=2)])
 
-    for idx, (i, j) in enumerate(indices):
-        d_ij = flattened[idx]
-        distances[i, j] = d_ij
-        distances[j, i] = d_ij
+def is_eilon_layout(data: list | np.ndarray) -> bool:
+    """
+    Checks if the lines of "LOWER_ROW" edge weight data follow the layout of
+    Eilon instances, which are column-wise: for dimension n, there are n - 1
+    lines, and line i contains n - 1 - i values. Flat data, and data with any
+    other line layout, such as the row layout or wrapped lines, is regular
+    "LOWER_ROW" data.
+    """
+    if isinstance(data, np.ndarray) and data.dtype != object:
+        if data.ndim < 2:
+            return False
 
-    return distances
+        lengths = np.full(len(data), data.shape[1])
+    elif len(data) == 0 or np.ndim(data[0]) == 0:
+        return False
+    else:
+        lengths = np.fromiter(map(len, data), dtype=int, count=len(data))
+
+    return _is_column_layout(lengths, len(lengths) + 1)
+
+
+def _is_column_layout(lengths: np.ndarray, dimension: int) -> bool:
+    """
+    Checks if the line lengths are those of column-wise lower triangular
+    data of the given dimension. For dimensions up to two, the row and
+    column layouts are the same, so the data is not considered column-wise.
+    """
+    expected = np.arange(dimension - 1, 0, -1)
+    return dimension > 2 and np.array_equal(lengths, expected)
 
 
 def is_triangular_number(n):
@@ -1,12 +1,21 @@
 import numpy as np
+import numpy.typing as npt
 
-from .parse_distances import pairwise_euclidean
-from .parse_utils import text2lines
+from .distances import LazyEdgeWeight, nearest_neighbours
+from .parse_distances import DEFAULT_MEMORY_LIMIT, pairwise_distances
+from .parse_utils import compact_dtype, is_auto_dtype, text2lines
 
-Instance = dict[str, str | float | np.ndarray]
+Instance = dict[str, str | float | np.ndarray | LazyEdgeWeight]
 
 
-def parse_solomon(text: str, compute_edge_weights: bool = True) -> Instance:
+def parse_solomon(
+    text: str,
+    compute_edge_weights: bool = True,
+    lazy_edge_weights: bool = False,
+    dtype: npt.DTypeLike | None = None,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    neighbours: int | None = None,
+) -> Instance:
     """
     Parses the text of a Solomon VRPTW instance.
 
@@ -17,6 +26,23 @@ def parse_solomon(text: str, compute_edge_weights: bool = True) -> Instance:
     compute_edge_weights
         Whether to compute the edge weights from the node coordinates.
         Defaults to True.
+    lazy_edge_weights
+        Whether the computed edge weights are a ``LazyEdgeWeight`` that
+        computes distances on demand, instead of a dense matrix. Defaults to
+        False.
+    dtype
+        The dtype of the edge weights, e.g., float32 or (for rounded edge
+        weight types) int32. If "auto", the data sections are stored in the
+        smallest integer dtype (int32 or int64) that holds their values.
+        Defaults to float64 for computed edge weights.
+    memory_limit
+        The maximum number of bytes of temporary arrays used when computing
+        the edge weights. Defaults to 128MB.
+    neighbours
+        Optional number of nearest neighbours per location. If given, the
+        neighbours and their distances are returned in compressed sparse row
+        format (see ``parse_vrplib``) instead of a dense edge weight matrix.
+        Defaults to None.
 
     Returns
     -------
@@ -26,20 +52,67 @@ def parse_solomon(text: str, compute_edge_weights: bool = True) -> Instance:
 
     is_valid_solomon_instance(lines)
 
-    instance: Instance = {"name": lines[0]}
-    instance["vehicles"], instance["capacity"] = [
-        int(num) for num in lines[3].split()
-    ]
+    instance = parse_solomon_header(lines)
+
+    data = parse_customers(lines[6:])
 
-    data = np.genfromtxt(lines[6:], dtype=int)
+    if is_auto_dtype(dtype):
+        data = data.astype(compact_dtype(data), copy=False)
 
-    instance["node_coord"] = data[:, 1:3]
+    coords = data[:, 1:3]
+    instance["node_coord"] = coords
     instance["demand"] = data[:, 3]
     instance["time_window"] = data[:, 4:6]
     instance["service_time"] = data[:, 6]
 
-    if compute_edge_weights:
-        instance["edge_weight"] = pairwise_euclidean(instance["node_coord"])
+    if compute_edge_weights and lazy_edge_weights:
+        instance["edge_weight"] = LazyEdgeWeight(coords, dtype=dtype)
+    elif compute_edge_weights and neighbours is None:
+        instance["edge_weight"] = pairwise_distances(
+            coords, "EUC_2D", dtype, memory_limit
+        )
+
+    if neighbours is not None:
+        csr = nearest_neighbours(
+            coords, neighbours, "EUC_2D", dtype, memory_limit
+        )
+        keys = ("neighbour_indptr", "neighbours", "neighbour_weight")
+        instance |= dict(zip(keys, csr))
+
+    return instance
+
+
+def parse_customers(lines: list[str]) -> np.ndarray:
+    """
+    Parses the customer table of a Solomon instance, whose rows contain the
+    customer number, x and y coordinates, demand, ready time, due date and
+    service time, into an n-by-7 array. The array has an integer dtype if
+    all values are integers, and a float dtype otherwise.
+    """
+    if not lines:
+        return np.empty((0, 7), dtype=np.int64)
+
+    data = np.loadtxt(lines, dtype=np.float64, ndmin=2)
+
+    if data.shape[1] != 7:
+        msg = f"Expected 7 columns in customer table, got {data.shape[1]}."
+        raise ValueError(msg)
+
+    if np.all(data == np.round(data)):
+        return data.astype(np.int64)
+
+    return data
+
+
+def parse_solomon_header(lines: list[str]) -> Instance:
+    """
+    Parses the name, number of vehicles and vehicle capacity from the header
+    lines of a Solomon instance, i.e., the lines before the customer data.
+    """
+    instance: Instance = {"name": lines[0]}
+    instance["vehicles"], instance["capacity"] = [
+        int(num) for num in lines[3].split()
+    ]
 
     return instance
 
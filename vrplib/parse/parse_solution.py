@@ -1,9 +1,17 @@
-from .parse_utils import infer_type, text2lines
+import numpy as np
 
-Solution = dict[str, float | str | list]
+from .compact_routes import CompactRoutes
+from .parse_utils import (
+    compact_dtype,
+    infer_type,
+    text2lines,
+    tokenize_numeric,
+)
 
+Solution = dict[str, float | str | list | CompactRoutes]
 
-def parse_solution(text: str) -> Solution:
+
+def parse_solution(text: str, compact_routes: bool = False) -> Solution:
     """
     Parses the text of a solution file formatted in VRPLIB style. A solution
     consists of routes, which are indexed from 1 to n, and possibly other data.
@@ -12,6 +20,11 @@ def parse_solution(text: str) -> Solution:
     ----------
     text
         The solution text.
+    compact_routes
+        Whether the routes are returned as ``CompactRoutes``, i.e., a flat
+        integer array of visits and an array of route offsets, instead of a
+        list of lists. The route lines are then tokenized in bulk. Defaults
+        to False.
 
     Returns
     -------
@@ -19,11 +32,11 @@ def parse_solution(text: str) -> Solution:
         The soluion data.
     """
     solution: Solution = {"routes": []}
+    route_lines = []
 
     for line in text2lines(text):
         if "Route" in line:
-            route = [int(idx) for idx in line.split(":")[1].split(" ") if idx]
-            solution["routes"].append(route)  # type: ignore
+            route_lines.append(line.split(":")[1])
         elif ":" in line or " " in line:  # Split at first colon or whitespace
             split_at = ":" if ":" in line else " "
             k, v = [word.strip() for word in line.split(split_at, 1)]
@@ -31,4 +44,26 @@ def parse_solution(text: str) -> Solution:
         else:  # Ignore lines without keyword-value pairs
             continue
 
+    if compact_routes:
+        solution["routes"] = _compact_routes(route_lines)
+    else:
+        solution["routes"] = [
+            [int(idx) for idx in line.split(" ") if idx]
+            for line in route_lines
+        ]
+
     return solution
+
+
+def _compact_routes(route_lines: list[str]) -> CompactRoutes:
+    """
+    Tokenizes the visits of the route lines into compact routes.
+    """
+    numeric = tokenize_numeric(route_lines)
+
+    if numeric is None or numeric[0].dtype.kind != "i":
+        raise ValueError("Routes must consist of integer visits.")
+
+    visits, counts = numeric
+    offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+    return CompactRoutes(visits.astype(compact_dtype(visits)), offsets)
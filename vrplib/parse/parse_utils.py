@@ -1,3 +1,9 @@
+from itertools import chain
+from typing import Iterable, Iterator
+
+import numpy as np
+
+
 def text2lines(text: str) -> list[str]:
     """
     Takes a string and returns a list of non-empty, stripped lines. Also
@@ -10,6 +16,48 @@ def text2lines(text: str) -> list[str]:
     ]
 
 
+def iter_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Lazy version of ``text2lines`` that takes an iterable of lines, such as an
+    open file, and yields the non-empty, stripped, non-comment lines.
+    """
+    for line in lines:
+        if (stripped := line.strip()) and not stripped.startswith("#"):
+            yield stripped
+
+
+def is_auto_dtype(dtype) -> bool:
+    """
+    Checks if the dtype argument requests the "auto" dtype policy.
+    """
+    return isinstance(dtype, str) and dtype == "auto"
+
+
+def compact_dtype(values: np.ndarray) -> np.dtype:
+    """
+    Returns the smallest of int32 and int64 that represents all values
+    exactly, if the values are integers or integral floats. Otherwise, the
+    dtype of the values is returned.
+    """
+    if values.dtype.kind not in "iuf" or values.size == 0:
+        return values.dtype
+
+    if values.dtype.kind == "f":
+        with np.errstate(invalid="ignore"):
+            if not (values == np.trunc(values)).all():  # also excludes NaN
+                return values.dtype
+
+    # Compares Python scalars, which is exact also for large floats.
+    low, high = values.min().item(), values.max().item()
+
+    for dtype in (np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+
+    return values.dtype
+
+
 def infer_type(s: str) -> int | float | str:
     try:
         return int(s)
@@ -18,3 +66,49 @@ def infer_type(s: str) -> int | float | str:
             return float(s)
         except ValueError:
             return s
+
+
+def tokenize_numeric(
+    lines: list[str], chunk_size: int = 2**14
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Tokenizes the passed-in lines into a single flat numeric array, without
+    inferring the type of each token separately. The array has an integer
+    dtype if all tokens are integers, and a float dtype otherwise.
+
+    Parameters
+    ----------
+    lines
+        The lines to tokenize.
+    chunk_size
+        The number of lines that are tokenized at once. This bounds the
+        number of intermediate token strings. Defaults to 2**14.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray] | None
+        The flat array of values and the number of values on each line, or
+        None if any of the tokens is not numeric.
+    """
+    all_values = []
+    all_counts = []
+
+    for start in range(0, len(lines), chunk_size):
+        tokens = [line.split() for line in lines[start : start + chunk_size]]
+        all_counts.append(np.fromiter(map(len, tokens), dtype=np.int64))
+        flat = list(chain.from_iterable(tokens))
+
+        for dtype in (np.int64, np.float64):
+            try:
+                all_values.append(np.array(flat, dtype=dtype))
+                break
+            except (ValueError, OverflowError):
+                continue
+        else:
+            return None
+
+    if not all_values:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+    # Integer chunks are promoted to float if any of the chunks has floats.
+    return np.concatenate(all_values), np.concatenate(all_counts)
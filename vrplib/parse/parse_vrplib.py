@@ -1,14 +1,37 @@
+import os
 import re
+from typing import Any, Iterable, Iterator
 
 import numpy as np
+import numpy.typing as npt
 
-from .parse_distances import parse_distances
-from .parse_utils import infer_type, text2lines
+from .parse_distances import (
+    DEFAULT_MEMORY_LIMIT,
+    from_explicit_lines,
+    parse_distances,
+    parse_neighbours,
+)
+from .parse_utils import (
+    compact_dtype,
+    infer_type,
+    is_auto_dtype,
+    iter_lines,
+    tokenize_numeric,
+)
 
 Instance = dict[str, str | float | np.ndarray]
 
 
-def parse_vrplib(text: str, compute_edge_weights: bool = True) -> Instance:
+def parse_vrplib(
+    text: str | Iterable[str],
+    compute_edge_weights: bool = True,
+    lazy_edge_weights: bool = False,
+    dtype: npt.DTypeLike | None = None,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    edge_weight_file: str | os.PathLike | None = None,
+    neighbours: int | None = None,
+    sections: Iterable[str] | None = None,
+) -> Instance:
     """
     Parses a VRPLIB instance. An instance consists of two parts:
     1) Specifications: single line of the form <KEY>:<VALUE>.
@@ -22,25 +45,72 @@ def parse_vrplib(text: str, compute_edge_weights: bool = True) -> Instance:
     Parameters
     ----------
     text
-        The instance text.
+        The instance text, or an iterable over the instance lines such as an
+        open file. Lines are then read one at a time.
     compute_edge_weights
         Whether to compute edge weights from the node coordinates.
         Defaults to True.
+    lazy_edge_weights
+        Whether the computed edge weights are a ``LazyEdgeWeight`` that
+        computes distances on demand, instead of a dense matrix. Defaults to
+        False.
+    dtype
+        The dtype of the edge weights, e.g., float32 or (for rounded edge
+        weight types) int32. If "auto", integer-valued edge weights and other
+        integer-valued numeric sections are stored in the smallest integer
+        dtype (int32 or int64) that holds their values. Defaults to float64
+        for computed edge weights.
+    memory_limit
+        The maximum number of bytes of temporary arrays used when computing
+        the edge weights. Defaults to 128MB.
+    edge_weight_file
+        Optional path of a ``.npy`` file. If given, an explicit edge weight
+        section is parsed in chunks directly into this file, which is returned
+        as memory-mapped array. Requires the DIMENSION specification.
+    neighbours
+        Optional number of nearest neighbours per location. If given, the
+        neighbours and their distances are returned in compressed sparse row
+        format (see ``parse_neighbours``) instead of dense edge weights,
+        which are then not computed from the node coordinates. Defaults to
+        None.
+    sections
+        Optional names of the sections to parse, e.g., ``["demand",
+        "node_coord"]``. Other sections are skipped without tokenizing their
+        lines, and edge weights are only computed if "edge_weight" is one of
+        these sections. Specifications are always parsed. Defaults to None,
+        in which case all sections are parsed.
 
     Returns
     -------
     dict
         The instance data.
     """
-    instance = {}
-    specs, sections = group_specifications_and_sections(text2lines(text))
+    instance: dict = {}
+    lines = text.splitlines() if isinstance(text, str) else text
+    requested = requested_sections(sections)
+    wanted = _wanted_sections(requested, neighbours)
 
-    for spec in specs:
-        key, value = parse_specification(spec)
-        instance[key] = value
+    for kind, name, value in iter_vrplib(lines):
+        if kind == "specification":
+            instance[name] = value
+            continue
+
+        if wanted is not None and name not in wanted:
+            continue  # the unconsumed section lines are skipped
 
-    for section in sections:
-        name, data = parse_section(section, instance)
+        data: list | np.ndarray
+
+        if name == "edge_weight" and edge_weight_file is not None:
+            # Stream the edge weights straight into the memory-mapped file.
+            data = from_explicit_lines(
+                value,
+                instance.get("edge_weight_format", ""),
+                instance.get("dimension", 0),
+                edge_weight_file,
+                dtype,
+            )
+        else:
+            data = parse_section_data(name, list(value), instance, dtype)
 
         if name in instance:
             msg = f"{name.upper()} is used both as specification and section."
@@ -48,14 +118,103 @@ def parse_vrplib(text: str, compute_edge_weights: bool = True) -> Instance:
 
         instance[name] = data  # type: ignore
 
-    if instance and compute_edge_weights and "edge_weight" not in instance:
+    # Neighbours replace dense computed edge weights, but not lazy ones.
+    compute = compute_edge_weights and (
+        neighbours is None or lazy_edge_weights
+    )
+
+    if requested is not None and "edge_weight" not in requested:
+        compute = False
+
+    if instance and compute and "edge_weight" not in instance:
         # Compute edge weights if there was no explicit edge weight section
-        edge_weights = parse_distances([], **instance)  # type: ignore
+        edge_weights = parse_distances(
+            [],
+            **instance,  # type: ignore
+            lazy=lazy_edge_weights,
+            dtype=dtype,
+            memory_limit=memory_limit,
+        )
         instance["edge_weight"] = edge_weights
 
+    if instance and neighbours is not None:
+        instance |= parse_neighbours(
+            neighbours,
+            **instance,  # type: ignore
+            dtype=dtype,
+            memory_limit=memory_limit,
+        )
+
+    if requested is not None and wanted is not None:
+        for name in wanted - requested:  # only needed for the neighbours
+            instance.pop(name, None)
+
     return instance
 
 
+def requested_sections(sections: Iterable[str] | None) -> set[str] | None:
+    """
+    Normalizes the requested section names, which may be given in upper case
+    and with the "_SECTION" suffix, to the names of the instance data.
+    """
+    if sections is None:
+        return None
+
+    if isinstance(sections, str):
+        sections = [sections]
+
+    return {section_name(section) for section in sections}
+
+
+def _wanted_sections(
+    requested: set[str] | None, neighbours: int | None
+) -> set[str] | None:
+    """
+    Returns the sections that must be parsed for the requested sections. The
+    edge weights and neighbours may also need the node coordinates and the
+    explicit edge weights.
+    """
+    if requested is None:
+        return None
+
+    if "edge_weight" in requested or neighbours is not None:
+        return requested | {"edge_weight", "node_coord"}
+
+    return requested
+
+
+def iter_vrplib(lines: Iterable[str]) -> Iterator[tuple[str, str, Any]]:
+    """
+    Lazily parses the lines of a VRPLIB instance into a stream of events,
+    reading only as many lines as needed for the next event. Yields
+
+    * ``("specification", key, value)`` for each specification, where the
+      key and value are parsed as in ``parse_specification``;
+    * ``("section", name, lines)`` for each data section, where the name is
+      parsed as in ``section_name`` and ``lines`` is an iterator over the
+      section's data lines. These lines are skipped if the iterator is not
+      consumed before the next event is requested.
+
+    Parameters
+    ----------
+    lines
+        An iterable over the instance lines, such as an open file. Empty and
+        comment lines are skipped.
+
+    Yields
+    ------
+    tuple[str, str, Any]
+        The specification and section events.
+    """
+    for kind, *group in _iter_groups(iter_lines(lines)):
+        if kind == "specification":
+            key, value = parse_specification(group[0])
+            yield kind, key, value
+        else:
+            header, body = group
+            yield kind, section_name(header), body
+
+
 def group_specifications_and_sections(lines: list[str]):
     """
     Groups instance lines into specifications and section parts.
@@ -63,37 +222,73 @@ def group_specifications_and_sections(lines: list[str]):
     specs = []
     sections = []
 
-    end_section = 0
-    for idx, line in enumerate(lines):
-        if "EOF" in line:
-            break
+    for kind, *group in _iter_groups(lines):
+        if kind == "specification":
+            specs.append(group[0])
+        else:
+            header, body = group
+            sections.append([header, *body])
 
-        if idx < end_section:  # Skip all lines of the current section
-            continue
+    return specs, sections
 
-        if "_SECTION" in line:
-            start = idx
-            end_section = start + 1
 
-            for next_line in lines[start + 1 :]:
-                if ":" in next_line and "_SECTION" not in next_line:
-                    raise ValueError("Specification presented after section.")
+def _iter_groups(lines: Iterable[str]) -> Iterator[tuple]:
+    """
+    Lazily groups instance lines into specifications and sections. Yields
+    ``("specification", line)`` for each specification line, and
+    ``("section", header, body)`` for each section, where ``body`` is an
+    iterator over the section's data lines. The body iterator is exhausted
+    before the next group is yielded, so it must be consumed directly.
+    """
+    lines = iter(lines)
+    line = next(lines, None)
+
+    while line is not None and "EOF" not in line:
+        if "_SECTION" in line:
+            end: list[str | None] = [None]  # line that ends the section
+            body = iter_section_body(lines, end)
 
-                # The current section ends when a next section or an EOF token
-                # is found.
-                if "_SECTION" in next_line or "EOF" in next_line:
-                    break
+            yield "section", line, body
 
-                end_section += 1
+            for _ in body:  # skip any lines that were not consumed
+                pass
 
-            sections.append(lines[start:end_section])
+            line = end[0]
         elif ":" in line:
-            specs.append(line)
+            yield "specification", line
+            line = next(lines, None)
         else:
             msg = "Instance does not conform to the VRPLIB format."
             raise RuntimeError(msg)
 
-    return specs, sections
+
+def iter_section_body(
+    lines: Iterator[str], end: list[str | None]
+) -> Iterator[str]:
+    """
+    Yields the data lines of the current section. The line that ends the
+    section, i.e., the next section or an EOF token, is stored in ``end``.
+    """
+    for line in lines:
+        if ":" in line and "_SECTION" not in line:
+            raise ValueError("Specification presented after section.")
+
+        # The current section ends when a next section or an EOF token is
+        # found.
+        if "_SECTION" in line or "EOF" in line:
+            end[0] = line
+            return
+
+        yield line
+
+
+def section_name(header: str) -> str:
+    """
+    Parses the section name from the section header line, in lower case and
+    without the "_SECTION" suffix.
+    """
+    # Some section names include colons, so we strip those as well.
+    return header.strip(" :").removesuffix("_SECTION").lower()
 
 
 def parse_specification(line: str) -> tuple[str, float | str]:
@@ -106,31 +301,96 @@ def parse_specification(line: str) -> tuple[str, float | str]:
 
 
 def parse_section(
-    lines: list, instance: dict
+    lines: list, instance: dict, dtype: npt.DTypeLike | None = None
 ) -> tuple[str, list | np.ndarray]:
     """
-    Parses the data section lines.
+    Parses the data section lines, of which the first line is the section
+    header.
     """
-    # Some section names include colons, so we strip those as well.
-    name = lines[0].strip(" :").removesuffix("_SECTION").lower()
-    rows = [[infer_type(n) for n in line.split()] for line in lines[1:]]
+    name = section_name(lines[0])
+    return name, parse_section_data(name, lines[1:], instance, dtype)
+
+
+def parse_section_data(
+    name: str,
+    lines: list[str],
+    instance: dict,
+    dtype: npt.DTypeLike | None = None,
+) -> list | np.ndarray:
+    """
+    Parses the data lines of the section with the given name. Numeric sections
+    are converted to arrays in bulk, whereas sections with non-numeric values
+    or rows of different lengths are parsed value by value. The dtype only
+    applies to the edge weight section, except for the "auto" dtype, which
+    also stores other integer-valued numeric sections in the smallest
+    integer dtype (int32 or int64) that holds their values.
+    """
+    numeric = tokenize_numeric(lines) if lines else None
+
+    if numeric is None:
+        return _parse_rows(name, lines, instance, dtype)
+
+    values, counts = numeric
+    is_ragged = bool((counts != counts[0]).any())
 
     if name == "edge_weight":
         # Parse edge weights separately as it involves extra processing.
-        data = parse_distances(rows, **instance)  # type: ignore
-    elif name == "depot":
+        rows: list | np.ndarray
+        if is_ragged:
+            rows = np.split(values, np.cumsum(counts[:-1]))
+        else:
+            rows = values.reshape(len(counts), -1)
+
+        return parse_distances(rows, **instance, dtype=dtype)  # type: ignore
+
+    if name == "depot":
         # Remove -1 end token and renormalize depots to start at zero.
-        data = np.array(rows)
-        data = data[data != -1] - 1
-    elif any(len(row) != len(rows[0]) for row in rows):
-        # This is a ragged array, so we keep it as a nested list, but we
-        # remove the indices column.
-        data = [row[1:] for row in rows]
+        data = values[values != -1] - 1
+    elif is_ragged:
+        # Ragged arrays are kept as nested lists of the inferred types.
+        return _parse_rows(name, lines, instance, dtype)
     else:
-        data = np.array([row[1:] for row in rows])
+        data = values.reshape(len(counts), -1)[:, 1:]
 
-        if data.ndim > 1 and data.shape[-1] == 1:
+        if data.shape[-1] == 1:
             # Squeeze data lines that contain only one column.
             data = data.squeeze(-1)
 
-    return name, data
+    if is_auto_dtype(dtype):
+        data = data.astype(compact_dtype(data), copy=False)
+
+    return data
+
+
+def _parse_rows(
+    name: str,
+    lines: list[str],
+    instance: dict,
+    dtype: npt.DTypeLike | None = None,
+) -> list | np.ndarray:
+    """
+    Parses the data section lines by inferring the type of each value
+    separately. This handles sections that contain non-numeric values or
+    rows of different lengths.
+    """
+    rows = [[infer_type(n) for n in line.split()] for line in lines]
+
+    if name == "edge_weight":
+        return parse_distances(rows, **instance, dtype=dtype)  # type: ignore
+
+    if name == "depot":
+        data = np.array(rows)
+        return data[data != -1] - 1
+
+    if any(len(row) != len(rows[0]) for row in rows):
+        # This is a ragged array, so we keep it as a nested list, but we
+        # remove the indices column.
+        return [row[1:] for row in rows]
+
+    data = np.array([row[1:] for row in rows])
+
+    if data.ndim > 1 and data.shape[-1] == 1:
+        # Squeeze data lines that contain only one column.
+        data = data.squeeze(-1)
+
+    return data
@@ -1,2 +1,7 @@
+from .iter_sections import iter_sections as iter_sections
+from .lazy_instance import LazyInstance as LazyInstance
+from .memory_cache import InstanceCache as InstanceCache
 from .read_instance import read_instance as read_instance
+from .read_instances import read_instances as read_instances
+from .read_metadata import read_metadata as read_metadata
 from .read_solution import read_solution as read_solution
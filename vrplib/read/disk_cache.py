@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from vrplib.parse.distances import LazyEdgeWeight
+
+# Bump this whenever the layout of a cache entry, or the parsed output of an
+# instance, changes. Entries of other versions are ignored and overwritten.
+CACHE_VERSION = 1
+
+_META_FILE = "meta.json"
+
+
+def default_cache_dir(path: str | os.PathLike) -> Path:
+    """
+    Returns the default cache directory for the given instance file, which is
+    a sidecar directory next to the instance.
+    """
+    return Path(path).parent / ".vrplib_cache"
+
+
+def read_cached(
+    path: str | os.PathLike,
+    cache_dir: str | os.PathLike,
+    options: dict[str, Any],
+    read: Callable[[], dict[str, Any]],
+) -> dict[str, Any]:
+    """
+    Returns the instance stored in the cache for the given file and parse
+    options, or reads it using ``read`` and stores it in the cache.
+
+    A cache entry is a directory with one ``.npy`` file per array, and a JSON
+    file with all other values and the size, modification time and content
+    hash of the instance file. An entry is valid if the file size and
+    modification time are unchanged, or otherwise if the content hash is
+    unchanged. Arrays of valid entries are memory-mapped in read-only mode.
+
+    Parameters
+    ----------
+    path
+        The path to the instance file.
+    cache_dir
+        The directory in which cache entries are stored.
+    options
+        The parse options, which are part of the cache key.
+    read
+        Function that reads and parses the instance on a cache miss.
+
+    Returns
+    -------
+    dict[str, Any]
+        The instance data.
+    """
+    stat = os.stat(path)
+    entry = Path(cache_dir) / _entry_name(path, options)
+    meta = _read_meta(entry)
+
+    # The entry might be removed or replaced while it is loaded, e.g., by a
+    # concurrent read, in which case it is treated as a miss.
+    with suppress(OSError, ValueError):
+        if meta is not None and _is_valid(meta, stat, path):
+            instance = _load(entry, meta)
+
+            if meta["mtime"] != stat.st_mtime_ns:
+                # Only the modification time changed, e.g. because the file
+                # was copied or touched, so we update the entry's metadata.
+                meta["mtime"] = stat.st_mtime_ns
+
+                with suppress(OSError):
+                    _write_meta(entry, meta)
+
+            return instance
+
+    instance = read()
+
+    # Caching is best effort, e.g., the file system might be read-only.
+    with suppress(OSError):
+        _store(entry, instance, stat, _hash_file(path))
+
+    return instance
+
+
+def _is_valid(
+    meta: dict[str, Any], stat: os.stat_result, path: str | os.PathLike
+) -> bool:
+    if meta["size"] != stat.st_size:
+        return False
+
+    return meta["mtime"] == stat.st_mtime_ns or meta["hash"] == _hash_file(
+        path
+    )
+
+
+def _entry_name(path: str | os.PathLike, options: dict[str, Any]) -> str:
+    key = json.dumps([os.path.abspath(path), options], default=str)
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def _hash_file(path: str | os.PathLike) -> str:
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as fh:
+        while chunk := fh.read(2**20):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _read_meta(entry: Path) -> dict[str, Any] | None:
+    try:
+        with open(entry / _META_FILE, "r") as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+    return meta if meta.get("version") == CACHE_VERSION else None
+
+
+def _write_meta(entry: Path, meta: dict[str, Any]):
+    tmp = entry / f"{_META_FILE}.{uuid.uuid4().hex}"
+
+    with open(tmp, "w") as fh:
+        json.dump(meta, fh)
+
+    os.replace(tmp, entry / _META_FILE)
+
+
+def _load(entry: Path, meta: dict[str, Any]) -> dict[str, Any]:
+    instance: dict[str, Any] = {}
+
+    for key, kind, value in meta["items"]:
+        if kind == "array":
+            instance[key] = np.load(entry / value, mmap_mode="r")
+        elif kind == "lazy":
+            coords = instance["node_coord"]
+            instance[key] = LazyEdgeWeight(coords, value[0], value[1])
+        else:
+            instance[key] = value
+
+    return instance
+
+
+def _store(
+    entry: Path,
+    instance: dict[str, Any],
+    stat: os.stat_result,
+    content_hash: str,
+):
+    """
+    Stores the instance as cache entry. The entry is written to a temporary
+    directory first and then moved in place, so concurrent readers never see
+    partially written entries.
+    """
+    items: list[tuple[str, str, Any]] = []
+    arrays = {}
+
+    for idx, (key, value) in enumerate(instance.items()):
+        if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+            arrays[f"{idx}.npy"] = value
+            items.append((key, "array", f"{idx}.npy"))
+        elif isinstance(value, LazyEdgeWeight) and "node_coord" in instance:
+            lazy_args = [value.edge_weight_type, str(value.dtype)]
+            items.append((key, "lazy", lazy_args))
+        elif _is_json_value(value):
+            items.append((key, "value", value))
+        else:  # cannot store this value, so we do not cache the instance
+            return
+
+    meta = {
+        "version": CACHE_VERSION,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "hash": content_hash,
+        "items": items,
+    }
+
+    tmp = entry.with_name(f"{entry.name}.{uuid.uuid4().hex}.tmp")
+    tmp.mkdir(parents=True)
+
+    try:
+        for name, array in arrays.items():
+            np.save(tmp / name, array, allow_pickle=False)
+
+        _write_meta(tmp, meta)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.rename(tmp, entry)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _is_json_value(value: Any) -> bool:
+    if value is None or isinstance(value, (str, int, float)):
+        return not isinstance(value, np.generic)
+
+    if isinstance(value, list):
+        return all(_is_json_value(elt) for elt in value)
+
+    return False
@@ -0,0 +1,35 @@
+import io
+import os
+from typing import Any, Iterator, TextIO
+
+from vrplib.compression import open_text
+from vrplib.parse.parse_vrplib import iter_vrplib
+
+
+def iter_sections(
+    path_or_file: str | os.PathLike | TextIO,
+) -> Iterator[tuple[str, str, Any]]:
+    """
+    Incrementally reads a VRPLIB instance and yields its specifications and
+    sections one at a time, without reading the whole file into memory.
+
+    Parameters
+    ----------
+    path_or_file
+        The path to the instance file, which may be compressed, or an open
+        text file.
+
+    Yields
+    ------
+    tuple[str, str, Any]
+        ``("specification", key, value)`` for each specification, and
+        ``("section", name, lines)`` for each data section, where ``lines``
+        is an iterator over the section's unparsed data lines. Section lines
+        that are not consumed before advancing are skipped.
+    """
+    if isinstance(path_or_file, io.IOBase):
+        yield from iter_vrplib(path_or_file)  # type: ignore
+        return
+
+    with open_text(path_or_file) as fh:  # type: ignore
+        yield from iter_vrplib(fh)
@@ -0,0 +1,193 @@
+import os
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
+
+import numpy.typing as npt
+
+from vrplib.compression import open_binary
+from vrplib.parse.distances import edge_weight_types
+from vrplib.parse.parse_distances import DEFAULT_MEMORY_LIMIT, parse_distances
+from vrplib.parse.parse_utils import iter_lines
+from vrplib.parse.parse_vrplib import (
+    iter_section_body,
+    iter_vrplib,
+    parse_section_data,
+    requested_sections,
+)
+
+
+class LazyInstance(Mapping):
+    """
+    A read-only mapping of the data of a VRPLIB instance file that parses
+    each section only when it is first accessed.
+
+    On construction, the file is scanned once to parse the specifications
+    and to record the byte span of each section, without tokenizing the
+    section lines. Accessing a section then reads only its span from the
+    file, and parses and caches the section data. Computed edge weights are
+    likewise computed on first access. The file should not change while the
+    instance is in use.
+
+    Parameters
+    ----------
+    path
+        The path to the instance file, which may be compressed.
+    compute_edge_weights
+        Whether to compute edge weights from the node coordinates if there is
+        no explicit edge weight section. Defaults to True.
+    lazy_edge_weights
+        Whether the computed edge weights are a ``LazyEdgeWeight``. Defaults
+        to False.
+    dtype
+        The dtype of the edge weights, or "auto". See ``read_instance``.
+    memory_limit
+        The maximum number of bytes of temporary arrays used when computing
+        the edge weights. Defaults to 128MB.
+    sections
+        Optional names of the sections that are part of the instance. Other
+        sections are never parsed. Defaults to None, meaning all sections.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        compute_edge_weights: bool = True,
+        lazy_edge_weights: bool = False,
+        dtype: npt.DTypeLike | None = None,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        sections: Iterable[str] | None = None,
+    ):
+        self._path = path
+        self._lazy_edge_weights = lazy_edge_weights
+        self._dtype = dtype
+        self._memory_limit = memory_limit
+        self._specs, self._spans = _scan(path)
+        self._data: dict[str, Any] = {}
+
+        requested = requested_sections(sections)
+        names = [
+            name
+            for name in self._spans
+            if requested is None or name in requested
+        ]
+
+        is_computed = (
+            compute_edge_weights
+            and "edge_weight" not in self._spans
+            and "node_coord" in self._spans
+            and self._specs.get("edge_weight_type") in edge_weight_types()
+        )
+        if is_computed and (requested is None or "edge_weight" in requested):
+            names.append("edge_weight")
+
+        self._sections = names
+
+    @property
+    def parsed(self) -> list[str]:
+        """
+        The names of the sections that have been parsed so far.
+        """
+        return [name for name in self._sections if name in self._data]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._specs:
+            return self._specs[key]
+
+        if key not in self._sections:
+            raise KeyError(key)
+
+        return self._section(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._specs
+        yield from self._sections
+
+    def __len__(self) -> int:
+        return len(self._specs) + len(self._sections)
+
+    def __repr__(self) -> str:
+        return f"LazyInstance(path={os.fspath(self._path)!r})"
+
+    def _section(self, name: str) -> Any:
+        """
+        Returns the data of the given section, which is parsed (or computed)
+        and cached on first access.
+        """
+        if name in self._data:
+            return self._data[name]
+
+        if name in self._spans:
+            lines = self._read_lines(name)
+            data = parse_section_data(name, lines, self._specs, self._dtype)
+        else:  # edge weights computed from the node coordinates
+            data = parse_distances(
+                [],
+                **self._specs,  # type: ignore
+                node_coord=self._section("node_coord"),
+                lazy=self._lazy_edge_weights,
+                dtype=self._dtype,
+                memory_limit=self._memory_limit,
+            )
+
+        self._data[name] = data
+        return data
+
+    def _read_lines(self, name: str) -> list[str]:
+        """
+        Reads the data lines of the given section from its byte span.
+        """
+        start, end = self._spans[name]
+
+        with open_binary(self._path) as fh:
+            fh.seek(start)
+            text = fh.read(end - start).decode()
+
+        lines = iter_lines(text.splitlines())
+        return list(iter_section_body(lines, [None]))
+
+
+def _scan(
+    path: str | os.PathLike,
+) -> tuple[dict[str, Any], dict[str, tuple[int, int]]]:
+    """
+    Scans the instance file for its specifications and the byte span of each
+    section. A span starts after the section header, and ends after the line
+    that ends the section.
+    """
+    specs: dict[str, Any] = {}
+    spans: dict[str, tuple[int, int]] = {}
+    position = 0
+
+    def decoded(lines: Iterable[bytes]) -> Iterator[str]:
+        nonlocal position
+
+        for line in lines:
+            position += len(line)
+            yield line.decode()
+
+    with open_binary(path) as fh:
+        previous = None  # section whose span is not yet complete
+
+        for kind, name, value in iter_vrplib(decoded(fh)):
+            if previous is not None:
+                spans[previous] = (spans[previous][0], position)
+                previous = None
+
+            if kind == "specification":
+                specs[name] = value
+                continue
+
+            if name in specs or name in spans:
+                msg = (
+                    f"{name.upper()} is used both as specification and "
+                    "section."
+                )
+                raise ValueError(msg)
+
+            spans[name] = (position, position)
+            previous = name
+
+        if previous is not None:
+            spans[previous] = (spans[previous][0], position)
+
+    return specs, spans
@@ -0,0 +1,238 @@
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from vrplib.parse.distances import LazyEdgeWeight
+from vrplib.parse.parse_vrplib import requested_sections
+
+from .read_instance import dtype_key, read_instance
+
+# Default maximum number of bytes of the arrays of all cached instances.
+DEFAULT_MAX_BYTES = 2**30
+
+
+class _Entry(NamedTuple):
+    size: int
+    mtime: int
+    instance: dict[str, Any]
+    nbytes: int
+
+
+class InstanceCache:
+    """
+    A thread-safe in-memory cache in front of ``read_instance``, for
+    long-running processes that read the same instances over and over.
+
+    Instances are cached by their absolute path and parse options, and are
+    read again when the size or modification time of the file changes. The
+    least recently used instances are evicted once the arrays of all cached
+    instances take up more than ``max_bytes`` bytes. The cached arrays are
+    read-only, so that the instances can be shared safely across threads;
+    each call returns a new dictionary with the shared arrays. Concurrent
+    reads of the same uncached instance are coalesced into a single read.
+
+    Parameters
+    ----------
+    max_bytes
+        The maximum number of bytes of the arrays of all cached instances.
+        Instances that are larger than this are not cached. The row blocks
+        that lazy edge weights compute on demand are not counted. Defaults
+        to 1GB.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError("Maximum number of bytes must be non-negative.")
+
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes of the arrays of all cached instances.
+        """
+        return self._nbytes
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of reads that returned a cached instance, including reads
+        that waited for a concurrent read of the same instance.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of reads that read the instance file.
+        """
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"InstanceCache(entries={len(self)}, nbytes={self._nbytes}, "
+            f"max_bytes={self._max_bytes})"
+        )
+
+    def clear(self):
+        """
+        Removes all cached instances.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def read_instance(
+        self, path: str | os.PathLike, *args: Any, **kwargs: Any
+    ) -> dict[str, Any]:
+        """
+        Returns the cached instance for the given file and parse options, or
+        reads it with ``read_instance`` and caches it.
+
+        Parameters
+        ----------
+        path
+            The path to the instance file.
+        *args
+            Positional arguments passed to ``read_instance``.
+        **kwargs
+            Keyword arguments passed to ``read_instance``. The ``lazy``
+            argument is not supported.
+
+        Returns
+        -------
+        dict[str, Any]
+            The instance data, whose arrays are read-only.
+        """
+        key = _cache_key(path, args, kwargs)
+        stat = os.stat(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                state = (stat.st_size, stat.st_mtime_ns)
+                if (entry.size, entry.mtime) == state:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return dict(entry.instance)
+
+                self._remove(key)  # the file changed since it was cached
+
+            pending = self._pending.get(key)
+
+            if pending is None:
+                future: Future = Future()
+                self._pending[key] = future
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        if pending is not None:  # another thread is reading the instance
+            return dict(pending.result())
+
+        try:
+            instance = read_instance(path, *args, **kwargs)
+            instance = _read_only(instance)  # type: ignore
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[key]
+
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+            entry = _Entry(
+                stat.st_size, stat.st_mtime_ns, instance, _nbytes(instance)
+            )
+            self._insert(key, entry)
+
+        future.set_result(instance)
+        return dict(instance)
+
+    def _insert(self, key: str, entry: _Entry):
+        if entry.nbytes > self._max_bytes:
+            return
+
+        self._entries[key] = entry
+        self._nbytes += entry.nbytes
+
+        while self._nbytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._nbytes -= entry.nbytes
+
+
+def _cache_key(
+    path: str | os.PathLike, args: tuple, kwargs: dict[str, Any]
+) -> str:
+    """
+    Returns the cache key of the instance file and the given arguments of
+    ``read_instance``, with all defaults filled in.
+    """
+    bound = inspect.signature(read_instance).bind(path, *args, **kwargs)
+    bound.apply_defaults()
+    options = bound.arguments
+
+    if options["lazy"]:
+        raise ValueError("Lazy instances cannot be cached in memory.")
+
+    options["path"] = os.path.abspath(path)
+    options["dtype"] = dtype_key(options["dtype"])
+
+    requested = requested_sections(options["sections"])
+    options["sections"] = None if requested is None else sorted(requested)
+
+    return json.dumps(options, default=str)
+
+
+def _read_only(instance: dict[str, Any]) -> dict[str, Any]:
+    """
+    Marks the arrays of the instance as read-only.
+    """
+    for value in instance.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        elif isinstance(value, LazyEdgeWeight):
+            value.node_coord.flags.writeable = False
+
+    return instance
+
+
+def _nbytes(instance: dict[str, Any]) -> int:
+    """
+    Returns the number of bytes of the distinct arrays of the instance.
+    """
+    arrays = {}
+
+    for value in instance.values():
+        if isinstance(value, LazyEdgeWeight):
+            value = value.node_coord
+
+        if isinstance(value, np.ndarray):
+            arrays[id(value)] = value.nbytes
+
+    return sum(arrays.values())
@@ -1,36 +1,208 @@
 import os
-from typing import Any
+from typing import Any, Iterable
 
+import numpy as np
+import numpy.typing as npt
+
+from vrplib.compression import open_text
 from vrplib.parse import parse_solomon, parse_vrplib
+from vrplib.parse.parse_distances import DEFAULT_MEMORY_LIMIT
+from vrplib.parse.parse_utils import is_auto_dtype
+from vrplib.parse.parse_vrplib import requested_sections
+
+from .disk_cache import default_cache_dir, read_cached
+from .lazy_instance import LazyInstance
 
 
 def read_instance(
     path: str | os.PathLike,
     instance_format: str = "vrplib",
     compute_edge_weights: bool = True,
-) -> dict[str, Any]:
+    lazy_edge_weights: bool = False,
+    dtype: npt.DTypeLike | None = None,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    cache: bool | str | os.PathLike = False,
+    edge_weight_file: str | os.PathLike | None = None,
+    neighbours: int | None = None,
+    sections: Iterable[str] | None = None,
+    lazy: bool = False,
+) -> dict[str, Any] | LazyInstance:
     """
     Reads the instance from the passed-in file path.
 
     Parameters
     ----------
     path
-        The path to the instance file.
+        The path to the instance file. Files compressed with gzip, bz2 or xz
+        are decompressed on the fly.
     instance_format
         The instance format, one of ["vrplib", "solomon"]. Default is "vrplib".
     compute_edge_weights
         Whether to calculate edge weights based on instance specifications
         and node coordinates, if not explicitly provided. Defaults to True.
+    lazy_edge_weights
+        Whether to return the computed edge weights as a ``LazyEdgeWeight``,
+        which computes and caches blocks of rows from the node coordinates on
+        demand, instead of as a dense matrix. Recommended for large instances.
+        Defaults to False.
+    dtype
+        The dtype of the edge weights, e.g., float32 to halve the memory usage
+        or (for rounded edge weight types) int32. If "auto", integer-valued
+        edge weights, such as those of rounded edge weight types, and other
+        integer-valued numeric sections, such as demands and time windows,
+        are stored in the smallest integer dtype (int32 or int64) that holds
+        their values. Defaults to float64 for computed edge weights, and to
+        the parsed data type otherwise.
+    memory_limit
+        The maximum number of bytes of temporary arrays used when computing
+        the edge weights. The edge weights are computed in blocks of rows to
+        stay within this limit. Defaults to 128MB.
+    cache
+        Whether to cache the parsed instance on disk. If True, the cache is
+        stored in a ``.vrplib_cache`` directory next to the instance file. If
+        a path is given, the cache is stored in that directory. Subsequent
+        reads of an unchanged file with the same arguments load the cached
+        instance, whose arrays are memory-mapped in read-only mode. Cannot be
+        combined with ``edge_weight_file``. Defaults to False.
+    edge_weight_file
+        Optional path of a ``.npy`` file for the edge weights of VRPLIB
+        instances with an explicit edge weight section. If given, the instance
+        is read line by line and the edge weights are parsed in chunks
+        directly into this file, which is returned as memory-mapped array.
+        This keeps memory usage low for very large explicit instances.
+        Requires the DIMENSION specification, and is not supported for
+        Solomon instances.
+    neighbours
+        Optional number of nearest neighbours per location. If given, the
+        instance contains the neighbours of each location and their edge
+        weights in compressed sparse row format: the neighbours of location
+        i are ``neighbours[neighbour_indptr[i] : neighbour_indptr[i + 1]]``,
+        sorted by edge weight, with edge weights ``neighbour_weight`` over
+        the same range. For edge weight types based on the node coordinates,
+        the neighbours are searched without computing the dense edge weight
+        matrix, which is then omitted unless ``lazy_edge_weights`` is set.
+        Defaults to None.
+    sections
+        Optional names of the sections to read, e.g., ``["demand",
+        "node_coord"]``. Other sections are skipped without parsing them,
+        and edge weights are only computed if "edge_weight" is one of these
+        sections. Specifications are always read. Defaults to None, in which
+        case all sections are read.
+    lazy
+        Whether to return a ``LazyInstance``, which scans the file once for
+        the specifications and the byte span of each section, and parses a
+        section only when it is first accessed. Only supports VRPLIB
+        instances, and cannot be combined with ``cache``,
+        ``edge_weight_file`` or ``neighbours``. Defaults to False.
 
     Returns
     -------
-    A dictionary that contains the instance data.
+    A dictionary that contains the instance data, or a ``LazyInstance`` if
+    ``lazy`` is set.
     """
-    with open(path, "r") as fi:
+    if instance_format not in ["vrplib", "solomon"]:
+        raise ValueError(f"Format style {instance_format} not known.")
+
+    if lazy:
+        if instance_format != "vrplib":
+            raise ValueError("Lazy reading only supports VRPLIB instances.")
+
+        if cache or edge_weight_file is not None or neighbours is not None:
+            msg = (
+                "Lazy reading cannot be combined with cache, edge_weight_file"
+                " or neighbours."
+            )
+            raise ValueError(msg)
+
+        return LazyInstance(
+            path,
+            compute_edge_weights,
+            lazy_edge_weights,
+            dtype,
+            memory_limit,
+            sections,
+        )
+
+    kwargs: dict[str, Any] = {
+        "compute_edge_weights": compute_edge_weights,
+        "lazy_edge_weights": lazy_edge_weights,
+        "dtype": dtype,
+        "memory_limit": memory_limit,
+        "neighbours": neighbours,
+    }
+
+    if instance_format == "vrplib":
+        kwargs["edge_weight_file"] = edge_weight_file
+    elif edge_weight_file is not None:
+        # Solomon instances have no explicit edge weights to write.
+        msg = "Edge weight files are only supported for VRPLIB instances."
+        raise ValueError(msg)
+
+    requested = requested_sections(sections)
+    kwargs["sections"] = None if requested is None else sorted(requested)
+
+    if cache and edge_weight_file is not None:
+        # A cached instance would not write the edge weights to the file.
+        raise ValueError("Caching cannot be combined with edge_weight_file.")
+
+    if not cache:
+        return _read_instance(path, instance_format, kwargs)
+
+    cache_dir = default_cache_dir(path) if cache is True else cache
+    options = {
+        "instance_format": instance_format,
+        "compute_edge_weights": compute_edge_weights,
+        "lazy_edge_weights": lazy_edge_weights,
+        "dtype": dtype_key(dtype),
+        "neighbours": neighbours,
+        "sections": kwargs["sections"],
+    }
+
+    return read_cached(
+        path,
+        cache_dir,  # type: ignore
+        options,
+        lambda: _read_instance(path, instance_format, kwargs),
+    )
+
+
+def _read_instance(
+    path: str | os.PathLike, instance_format: str, kwargs: dict[str, Any]
+) -> dict[str, Any]:
+    with open_text(path, "r") as fi:
         if instance_format == "vrplib":
-            return parse_vrplib(fi.read(), compute_edge_weights)
+            return parse_vrplib(fi, **kwargs)  # streams the file's lines
 
-        if instance_format == "solomon":
-            return parse_solomon(fi.read(), compute_edge_weights)
+        return _parse_solomon_sections(fi.read(), **kwargs)
 
-        raise ValueError(f"Format style {instance_format} not known.")
+
+def _parse_solomon_sections(
+    text: str, sections: list[str] | None, **kwargs: Any
+) -> dict[str, Any]:
+    """
+    Parses the Solomon instance, and keeps only the given data sections. The
+    name, number of vehicles and capacity are always kept.
+    """
+    if sections is None:
+        return parse_solomon(text, **kwargs)
+
+    if "edge_weight" not in sections:
+        kwargs["compute_edge_weights"] = False
+
+    instance = parse_solomon(text, **kwargs)
+    return {
+        key: value
+        for key, value in instance.items()
+        if key in sections or isinstance(value, (str, int, float))
+    }
+
+
+def dtype_key(dtype: npt.DTypeLike | None) -> str | None:
+    """
+    Returns a string key of the dtype argument, which is the same for all
+    ways to specify the same dtype, e.g., for cache keys.
+    """
+    if dtype is None or is_auto_dtype(dtype):
+        return dtype  # type: ignore
+
+    return str(np.dtype(dtype))
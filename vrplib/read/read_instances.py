@@ -0,0 +1,171 @@
+import glob
+import os
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from vrplib.compression import (
+    COMPRESSION_EXTENSIONS,
+    open_text,
+    strip_compression_suffix,
+)
+
+from .read_instance import read_instance
+from .read_solution import read_solution
+
+
+def read_instances(
+    paths_or_glob: str | os.PathLike | Iterable[str | os.PathLike],
+    workers: int | None = None,
+    executor: str = "process",
+    ordered: bool = True,
+    **kwargs: Any,
+) -> Iterator[dict[str, Any]]:
+    """
+    Reads many instances, and their solutions, in parallel.
+
+    The format of each instance file is detected from its contents. If a
+    solution file with the same name and the ``.sol`` extension exists next
+    to an instance file, then it is read as well. Compressed instance and
+    solution files are supported, e.g., ``X-n101-k25.vrp.gz`` is paired with
+    ``X-n101-k25.sol`` or ``X-n101-k25.sol.gz``. Errors are captured per
+    file, so that one invalid file does not abort the whole batch.
+
+    Parameters
+    ----------
+    paths_or_glob
+        A glob pattern, e.g., ``"/path/to/Vrp-Set-X/*.vrp"``, or an iterable
+        of instance file paths. Patterns with ``**`` also match files in
+        subdirectories. Solution files matched by the pattern are not read
+        as instances.
+    workers
+        The number of workers. Defaults to the number of CPUs.
+    executor
+        The kind of workers, one of ["process", "thread"]. Processes parse
+        files truly in parallel, whereas threads avoid the cost of sending
+        the parsed data between processes. Default is "process".
+    ordered
+        Whether to yield the results in the order of the paths. Otherwise,
+        results are yielded as soon as they are available. Defaults to True.
+    **kwargs
+        Additional keyword arguments passed to ``read_instance``, except for
+        ``instance_format``.
+
+    Yields
+    ------
+    dict[str, Any]
+        A dictionary with the instance ``path``, the ``instance`` data, the
+        ``solution`` data (None if there is no solution file) and the
+        ``error`` (None if the files were read successfully). If an error
+        occurs, the instance and solution are None.
+    """
+    if executor not in ["process", "thread"]:
+        raise ValueError(f"Executor {executor} not known.")
+
+    if workers is not None and workers < 1:
+        raise ValueError("Number of workers must be positive.")
+
+    if isinstance(paths_or_glob, (str, os.PathLike)):
+        pattern = os.fspath(paths_or_glob)
+        paths = sorted(glob.glob(pattern, recursive=True))
+        paths = [path for path in paths if is_instance_file(path)]
+    else:
+        paths = [os.fspath(path) for path in paths_or_glob]
+
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+    with pool:
+        futures = {pool.submit(_read, path, kwargs): path for path in paths}
+
+        try:
+            done = futures if ordered else as_completed(futures)
+            for future in done:
+                yield _result(future, futures[future])
+        finally:  # e.g., when the caller stops iterating early
+            for future in futures:
+                future.cancel()
+
+
+def detect_format(path: str | os.PathLike) -> str:
+    """
+    Detects the format of the instance file, which is "solomon" if the file
+    contains a VEHICLE section header on one of its first lines, and "vrplib"
+    otherwise.
+    """
+    with open_text(path, "r") as fi:
+        for _, line in zip(range(5), fi):
+            if line.strip().upper() == "VEHICLE":
+                return "solomon"
+
+    return "vrplib"
+
+
+def is_instance_file(path: str) -> bool:
+    """
+    Returns whether the path is a file that is not a (compressed) solution.
+    """
+    suffix = strip_compression_suffix(path).suffix
+    return os.path.isfile(path) and suffix != ".sol"
+
+
+def find_solution_file(path: str) -> Path | None:
+    """
+    Returns the path of the solution file that belongs to the instance file,
+    which may be compressed, or None if there is no such file.
+    """
+    sol_path = strip_compression_suffix(path).with_suffix(".sol")
+
+    for ext in ("", *COMPRESSION_EXTENSIONS):
+        candidate = sol_path.with_name(sol_path.name + ext)
+        if candidate.is_file():
+            return candidate
+
+    return None
+
+
+def _read(path: str, kwargs: dict[str, Any]) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "path": path,
+        "instance": None,
+        "solution": None,
+        "error": None,
+    }
+
+    try:
+        fmt = detect_format(path)
+        instance = read_instance(path, instance_format=fmt, **kwargs)
+        sol_path = find_solution_file(path)
+        solution = read_solution(sol_path) if sol_path else None
+    except Exception as error:
+        result["error"] = error
+    else:
+        result["instance"] = instance
+        result["solution"] = solution
+
+    return result
+
+
+def _result(future: Future, path: str) -> dict[str, Any]:
+    """
+    Returns the future's result. Errors that occur outside of reading, e.g.,
+    when a worker process crashes, are captured as well.
+    """
+    try:
+        return future.result()
+    except Exception as error:
+        return {
+            "path": path,
+            "instance": None,
+            "solution": None,
+            "error": error,
+        }
@@ -0,0 +1,57 @@
+import os
+from itertools import islice
+from typing import Any
+
+from vrplib.compression import open_text
+from vrplib.parse.parse_solomon import (
+    is_valid_solomon_instance,
+    parse_solomon_header,
+)
+from vrplib.parse.parse_utils import iter_lines
+from vrplib.parse.parse_vrplib import iter_vrplib
+
+# Number of (non-empty) header lines before the customer data of a Solomon
+# instance.
+_SOLOMON_HEADER_LINES = 6
+
+
+def read_metadata(
+    path: str | os.PathLike, instance_format: str = "vrplib"
+) -> dict[str, Any]:
+    """
+    Reads the metadata of the instance, without reading its data sections.
+    For VRPLIB instances, these are the specifications before the first
+    section, e.g., "type", "dimension", "capacity" and "edge_weight_type".
+    For Solomon instances, these are the name, number of vehicles and
+    vehicle capacity from the header lines. Only the first lines of the file
+    are read, so this is fast also for very large instances.
+
+    Parameters
+    ----------
+    path
+        The path to the instance file. Files compressed with gzip, bz2 or xz
+        are decompressed on the fly.
+    instance_format
+        The instance format, one of ["vrplib", "solomon"]. Default is "vrplib".
+
+    Returns
+    -------
+    A dictionary that contains the instance metadata.
+    """
+    if instance_format not in ["vrplib", "solomon"]:
+        raise ValueError(f"Format style {instance_format} not known.")
+
+    with open_text(path, "r") as fi:
+        if instance_format == "solomon":
+            lines = list(islice(iter_lines(fi), _SOLOMON_HEADER_LINES))
+            is_valid_solomon_instance(lines)
+            return parse_solomon_header(lines)
+
+        metadata = {}
+        for kind, name, value in iter_vrplib(fi):
+            if kind == "section":  # stops reading at the first section
+                break
+
+            metadata[name] = value
+
+        return metadata
@@ -1,22 +1,29 @@
 import os
 from typing import Any
 
+from vrplib.compression import open_text
 from vrplib.parse import parse_solution
 
 
-def read_solution(path: str | os.PathLike) -> dict[str, Any]:
+def read_solution(
+    path: str | os.PathLike, compact_routes: bool = False
+) -> dict[str, Any]:
     """
     Reads the solution from the passed-in file path.
 
     Parameters
     ----------
     path
-        The path to the solution file.
+        The path to the solution file. Files compressed with gzip, bz2 or xz
+        are decompressed on the fly.
+    compact_routes
+        Whether the routes are returned as ``CompactRoutes`` instead of a
+        list of lists. Defaults to False.
 
     Returns
     -------
     A dictionary that contains the solution data.
 
     """
-    with open(path, "r") as fi:
-        return parse_solution(fi.read())
+    with open_text(path, "r") as fi:
+        return parse_solution(fi.read(), compact_routes)
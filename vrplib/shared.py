@@ -0,0 +1,250 @@
+import sys
+import weakref
+from contextlib import suppress
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .parse.distances import LazyEdgeWeight
+
+# Segments attached in this process, by name. Attached segments stay mapped
+# until they are detached, since the arrays of attached instances are views
+# of their memory.
+_ATTACHED: dict[str, SharedMemory] = {}
+
+
+class SharedInstanceHandle(NamedTuple):
+    """
+    A small, picklable reference to an instance in shared memory, which
+    worker processes pass to ``attach_instance``.
+
+    Attributes
+    ----------
+    items
+        The instance items, as ``(key, kind, value)`` tuples. Arrays are of
+        kind "array" with value ``(segment, dtype, shape)``, lazy edge
+        weights are of kind "lazy" with value ``(segment, dtype, shape,
+        edge_weight_type, edge_weight_dtype)`` of their node coordinates,
+        and other values are of kind "value" and stored in the handle.
+    """
+
+    items: tuple[tuple[str, str, Any], ...]
+
+    @property
+    def segments(self) -> list[str]:
+        """
+        The names of the shared memory segments of the instance.
+        """
+        names = [value[0] for _, kind, value in self.items if kind != "value"]
+        return list(dict.fromkeys(names))
+
+
+class SharedInstance:
+    """
+    Publishes the arrays of a parsed instance in shared memory, so that
+    worker processes can use the instance without parsing it again or
+    receiving a pickled copy of it. Each array is copied once into its own
+    shared memory segment; workers attach to the segments with the
+    ``handle`` and get read-only array views without copying.
+
+    The publishing process owns the segments: they are removed when the
+    shared instance is closed, when it is garbage collected, or when the
+    process exits, whichever comes first. Workers that are still attached
+    keep their views, and the memory is released once they detach or exit.
+
+    Parameters
+    ----------
+    instance
+        The instance data, e.g., as returned by ``read_instance``. Lazy edge
+        weights are shared through their node coordinates, and values other
+        than arrays are stored in the handle.
+    """
+
+    def __init__(self, instance: dict[str, Any]):
+        self._segments: dict[int, SharedMemory] = {}
+        self._finalizer = weakref.finalize(self, _unlink, self._segments)
+
+        try:
+            items = [self._item(key, val) for key, val in instance.items()]
+        except BaseException:
+            self.close()
+            raise
+
+        self._handle = SharedInstanceHandle(tuple(items))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SharedInstance(nbytes={self.nbytes})"
+
+    @property
+    def handle(self) -> SharedInstanceHandle:
+        """
+        The handle that workers pass to ``attach_instance``.
+        """
+        return self._handle
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes of the shared memory segments.
+        """
+        return sum(segment.size for segment in self._segments.values())
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the shared memory segments have been removed.
+        """
+        return not self._finalizer.alive
+
+    def close(self):
+        """
+        Removes the shared memory segments. Attaching to the instance is no
+        longer possible afterwards.
+        """
+        self._finalizer()
+
+    def _item(self, key: str, value: Any) -> tuple[str, str, Any]:
+        if isinstance(value, LazyEdgeWeight):
+            spec = self._share(value.node_coord)
+            lazy = (value.edge_weight_type, value.dtype.str)
+            return key, "lazy", (*spec, *lazy)
+
+        if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+            return key, "array", self._share(value)
+
+        return key, "value", value
+
+    def _share(self, array: np.ndarray) -> tuple[str, str, tuple]:
+        """
+        Copies the array into a shared memory segment, unless it was shared
+        already, and returns the segment name, dtype and shape.
+        """
+        if id(array) not in self._segments:
+            # Segments cannot be empty, so we allocate at least one byte.
+            segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+            self._segments[id(array)] = segment
+
+            view = _as_array(segment, array.dtype, array.shape)
+            view[...] = array
+            del view  # releases the segment's buffer
+
+        name = self._segments[id(array)].name
+        return name, array.dtype.str, array.shape
+
+
+def attach_instance(handle: SharedInstanceHandle) -> dict[str, Any]:
+    """
+    Attaches to an instance in shared memory, e.g., in a worker process.
+
+    The arrays of the returned instance are read-only views of the shared
+    memory. Segments that are already attached in this process are reused,
+    so attaching to the same instance again, e.g., in each task of a worker,
+    is cheap. The segments stay attached until ``detach_instance`` is called
+    or the process exits.
+
+    On Python versions before 3.13, only processes started with
+    ``multiprocessing``, which share the resource tracker of the publishing
+    process, should attach to the instance: other processes remove the
+    segments when they exit.
+
+    Parameters
+    ----------
+    handle
+        The handle of the shared instance.
+
+    Returns
+    -------
+    dict[str, Any]
+        The instance data.
+    """
+    instance: dict[str, Any] = {}
+
+    for key, kind, value in handle.items:
+        if kind == "array":
+            instance[key] = _view(*value)
+        elif kind == "lazy":
+            *spec, edge_weight_type, dtype = value
+            coords = _view(*spec)
+            instance[key] = LazyEdgeWeight(coords, edge_weight_type, dtype)
+        else:
+            instance[key] = value
+
+    return instance
+
+
+def detach_instance(handle: SharedInstanceHandle):
+    """
+    Detaches the shared memory segments of the instance from this process.
+    The arrays of the attached instance must not be used anymore.
+
+    Parameters
+    ----------
+    handle
+        The handle of the shared instance.
+
+    Raises
+    ------
+    BufferError
+        When arrays of the attached instance are still referenced.
+    """
+    for name in handle.segments:
+        if name in _ATTACHED:
+            _ATTACHED[name].close()
+            del _ATTACHED[name]
+
+
+def _view(name: str, dtype: str, shape: tuple) -> np.ndarray:
+    """
+    Returns a read-only array view of the shared memory segment.
+    """
+    if name not in _ATTACHED:
+        if sys.version_info >= (3, 13):
+            _ATTACHED[name] = _Segment(name, track=False)
+        else:
+            _ATTACHED[name] = _Segment(name)
+
+    array = _as_array(_ATTACHED[name], np.dtype(dtype), shape)
+    array.flags.writeable = False
+    return array
+
+
+def _as_array(
+    segment: SharedMemory, dtype: np.dtype, shape: tuple
+) -> np.ndarray:
+    """
+    Returns an array view of the segment's memory. Unlike ``np.ndarray``
+    with a ``buffer`` argument, ``np.frombuffer`` keeps the buffer exported
+    while the view exists, so that the segment cannot be closed under it.
+    """
+    count = int(np.prod(shape))
+    array = np.frombuffer(segment.buf, dtype, count)  # type: ignore
+    return array.reshape(shape)
+
+
+class _Segment(SharedMemory):
+    """
+    An attached shared memory segment, which stays mapped while arrays of
+    attached instances still refer to it when it is garbage collected, e.g.,
+    when the process exits.
+    """
+
+    def __del__(self):
+        with suppress(BufferError):
+            super().__del__()
+
+
+def _unlink(segments: dict[int, SharedMemory]):
+    for segment in segments.values():
+        segment.close()
+
+        with suppress(FileNotFoundError):  # e.g., removed by another process
+            segment.unlink()
+
+    segments.clear()
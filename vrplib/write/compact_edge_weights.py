@@ -0,0 +1,192 @@
+from typing import Any
+
+import numpy as np
+
+from vrplib.parse.distances import edge_weight_types, pairwise
+from vrplib.parse.distances.kernels import NUM_TEMPORARIES
+from vrplib.parse.parse_distances import (
+    DEFAULT_MEMORY_LIMIT,
+    EXPLICIT_FORMATS,
+    ROW_FORMATS,
+)
+
+
+def compact_edge_weights(
+    data: dict[str, Any], edge_weight_format: str
+) -> dict[str, Any]:
+    """
+    Rewrites the edge weight section of the instance data in the given edge
+    weight format, and sets the matching "EDGE_WEIGHT_FORMAT" specification.
+    Triangular formats require a symmetric matrix, and those without the
+    diagonal also require a zero diagonal.
+
+    In "auto" mode, the edge weight section is dropped if the edge weights
+    are exactly the distances of a registered edge weight type between the
+    node coordinates, and the matching "EDGE_WEIGHT_TYPE" is set instead.
+    Otherwise, the most compact explicit format is used: "LOWER_ROW" for
+    symmetric matrices with a zero diagonal, "LOWER_DIAG_ROW" for other
+    symmetric matrices, and "FULL_MATRIX" for asymmetric matrices.
+
+    Parameters
+    ----------
+    data
+        The instance data, as passed to ``write_instance``.
+    edge_weight_format
+        One of the explicit edge weight formats in ``EXPLICIT_FORMATS``, or
+        "auto".
+
+    Returns
+    -------
+    dict[str, Any]
+        The instance data with the rewritten edge weight section.
+    """
+    if edge_weight_format != "auto" and edge_weight_format not in (
+        EXPLICIT_FORMATS
+    ):
+        raise ValueError(f"Edge weight format {edge_weight_format} unknown.")
+
+    if "EDGE_WEIGHT_SECTION" not in data:
+        return data
+
+    matrix = np.asarray(data["EDGE_WEIGHT_SECTION"])
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Edge weights must be a square matrix.")
+
+    is_symmetric = np.array_equal(matrix, matrix.T)
+
+    if edge_weight_format == "auto":
+        coords = data.get("NODE_COORD_SECTION")
+        edge_weight_type = _coordinate_type(matrix, coords)
+
+        if edge_weight_type is not None:
+            specs = {"EDGE_WEIGHT_TYPE": edge_weight_type}
+            return _replace(data, specs, None, ("EDGE_WEIGHT_FORMAT",))
+
+        if not is_symmetric:
+            edge_weight_format = "FULL_MATRIX"
+        elif not np.diagonal(matrix).any():
+            edge_weight_format = "LOWER_ROW"
+        else:
+            edge_weight_format = "LOWER_DIAG_ROW"
+
+    if edge_weight_format == "FULL_MATRIX":
+        section: list | np.ndarray = matrix
+    elif not is_symmetric:
+        msg = f"{edge_weight_format} requires symmetric edge weights."
+        raise ValueError(msg)
+    elif "DIAG" not in edge_weight_format and np.diagonal(matrix).any():
+        msg = f"{edge_weight_format} requires a zero diagonal."
+        raise ValueError(msg)
+    else:
+        # For symmetric matrices, column formats are laid out the same as
+        # their corresponding row formats.
+        section = _triangular_rows(matrix, ROW_FORMATS[edge_weight_format])
+
+    specs = {"EDGE_WEIGHT_FORMAT": edge_weight_format}
+    return _replace(data, specs, section)
+
+
+def _coordinate_type(matrix: np.ndarray, coords) -> str | None:
+    """
+    Returns the first registered edge weight type whose distances between
+    the coordinates equal the matrix, or None if there is none.
+    """
+    if coords is None:
+        return None
+
+    coords = np.asarray(coords)
+    if coords.ndim != 2 or len(coords) != len(matrix):
+        return None
+
+    if coords.dtype.kind not in "iuf" or matrix.dtype.kind not in "iuf":
+        return None
+
+    n = len(matrix)
+    block_size = max(
+        DEFAULT_MEMORY_LIMIT // (NUM_TEMPORARIES * 8 * max(n, 1)), 1
+    )
+    candidates = list(edge_weight_types())
+
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        candidates = [
+            edge_weight_type
+            for edge_weight_type in candidates
+            if _matches(matrix[start:end], coords, start, edge_weight_type)
+        ]
+
+        if not candidates:
+            return None
+
+    return candidates[0]
+
+
+def _matches(
+    rows: np.ndarray, coords: np.ndarray, start: int, edge_weight_type: str
+) -> bool:
+    """
+    Returns whether the given rows of the matrix, starting at row ``start``,
+    equal the distances of the edge weight type between the coordinates.
+    Kernels that do not apply to the coordinates, e.g., because these have
+    too few dimensions, do not match.
+    """
+    end = start + len(rows)
+
+    try:
+        block = pairwise(coords[start:end], coords, edge_weight_type)
+    except (IndexError, ValueError):
+        return False
+
+    return np.array_equal(block, rows)
+
+
+def _triangular_rows(matrix: np.ndarray, row_format: str) -> list:
+    """
+    Returns the non-empty rows of the triangular part of the matrix that
+    belongs to the given row format.
+    """
+    n = len(matrix)
+
+    if row_format == "LOWER_ROW":
+        rows = [matrix[idx, :idx] for idx in range(1, n)]
+    elif row_format == "LOWER_DIAG_ROW":
+        rows = [matrix[idx, : idx + 1] for idx in range(n)]
+    elif row_format == "UPPER_ROW":
+        rows = [matrix[idx, idx + 1 :] for idx in range(n - 1)]
+    else:  # UPPER_DIAG_ROW
+        rows = [matrix[idx, idx:] for idx in range(n)]
+
+    return rows
+
+
+def _replace(
+    data: dict[str, Any],
+    specs: dict[str, str],
+    section: list | np.ndarray | None,
+    remove: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    """
+    Returns a copy of the data with the given specifications, which replace
+    existing values or are added before the first section, without the
+    specifications to remove, and with the edge weight section replaced by
+    the given section, or removed if None.
+    """
+    new: dict[str, Any] = {}
+    pending = dict(specs)
+
+    for key, value in data.items():
+        if key in specs or key in remove:
+            if key in pending:
+                new[key] = pending.pop(key)
+            continue
+
+        if not isinstance(value, (str, int, float)):
+            new.update(pending)  # add the new specifications before sections
+            pending.clear()
+
+        if key != "EDGE_WEIGHT_SECTION":
+            new[key] = value
+        elif section is not None:
+            new[key] = section
+
+    return new
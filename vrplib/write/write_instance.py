@@ -1,14 +1,29 @@
 import os
-from typing import TypeVar
+from typing import IO, TypeVar
 
 import numpy as np
 
+from vrplib.compression import open_text
+
+from .compact_edge_weights import compact_edge_weights
+
 _ArrayLike = TypeVar("_ArrayLike", list, tuple, np.ndarray)
 
+# Maximum number of values that are formatted and written at once.
+_CHUNK_SIZE = 2**16
+
+# Integral floats below these limits are formatted by ``str`` as integers
+# with a ".0" suffix, and in scientific notation otherwise.
+_INTEGRAL_LIMITS = {np.float16: 1e3, np.float32: 1e6, np.float64: 1e16}
+
+_POWERS_OF_TEN = 10 ** np.arange(20, dtype=np.uint64)
+
 
 def write_instance(
     path: str | os.PathLike,
     data: dict[str, str | int | float | _ArrayLike],
+    float_format: str | None = None,
+    edge_weight_format: str | None = None,
 ):
     """
     Writes a VRP instance to file following the VRPLIB format [1].
@@ -16,7 +31,8 @@ def write_instance(
     Parameters
     ---------
     path
-        The file path.
+        The file path. The file is compressed if the path has a ".gz", ".bz2",
+        ".xz" or ".lzma" extension.
     data
         A dictionary of keyword-value pairs. For each key-value pair, the
         following rules apply:
@@ -35,6 +51,18 @@ def write_instance(
           elements of the array. One-dimensional arrays are treated as column
           vectors. If name is "EDGE_WEIGHT_SECTION" or "DEPOT_SECTION", then
           the index is not included.
+    float_format
+        Optional printf-style format of the floats in data sections, e.g.,
+        "%.2f". Defaults to None, which formats floats as ``str`` does.
+    edge_weight_format
+        Optional edge weight format in which a square "EDGE_WEIGHT_SECTION"
+        matrix is written, e.g., "LOWER_ROW", which also sets the matching
+        "EDGE_WEIGHT_FORMAT" specification. Triangular formats require a
+        symmetric matrix. If "auto", the section is omitted when the matrix
+        equals the (rounded) Euclidean distances of the node coordinates,
+        setting the matching "EDGE_WEIGHT_TYPE" instead, and the most compact
+        explicit format is used otherwise. Defaults to None, which writes the
+        section as given.
 
     References
     ----------
@@ -44,48 +72,190 @@ def write_instance(
         http://webhotel4.ruc.dk/~keld/research/LKH-3/LKH-3_REPORT.pdf
 
     """
-    with open(path, "w") as fh:
+    if edge_weight_format is not None:
+        data = compact_edge_weights(data, edge_weight_format)
+
+    with open_text(path, "w") as fh:
         for key, value in data.items():
             if isinstance(value, (str, int, float)):
                 fh.write(f"{key}: {value}" + "\n")
             else:
-                fh.write(_format_section(key, value) + "\n")
+                _write_section(fh, key, value, float_format)
 
         fh.write("EOF\n")
 
 
-def _format_section(name: str, data: _ArrayLike) -> str:
+def _write_section(
+    fh: IO[str], name: str, data: _ArrayLike, float_format: str | None
+):
     """
-    Formats a data section.
+    Writes a data section. Numeric arrays are formatted in bulk, and all rows
+    are written in chunks to limit the size of the intermediate strings.
 
     Parameters
     ----------
+    fh
+        The file handle to write to.
     name
         The name of the section.
     data
         The data to be formatted.
-
-    Returns
-    -------
-    str
-        A VRPLIB-formatted data section.
+    float_format
+        Optional printf-style format of the floats.
     """
-    section = [name]
+    fh.write(name + "\n")
     include_idx = name not in ["EDGE_WEIGHT_SECTION", "DEPOT_SECTION"]
 
-    if _is_one_dimensional(data):
-        # Treat 1D arrays as column vectors, so each element is a row.
-        for idx, elt in enumerate(data, 1):
-            prefix = f"{idx}\t" if include_idx else ""
-            section.append(prefix + str(elt))
-    else:
+    if _is_bulk_formattable(data):
+        array = np.asarray(data)
+        array = array.reshape(len(array), -1)  # 1D arrays are column vectors
+        chunk_size = max(_CHUNK_SIZE // array.shape[1], 1)
+
+        for start in range(0, len(array), chunk_size):
+            chunk = array[start : start + chunk_size]
+            first_idx = start + 1 if include_idx else None
+            fh.write(_format_array(chunk, first_idx, float_format))
+
+        return
+
+    if _is_bulk_formattable_rows(data):
+        # Rows of different lengths, e.g., of a triangular edge weight matrix.
         for idx, row in enumerate(data, 1):
-            prefix = f"{idx}\t" if include_idx else ""
-            rest = "\t".join([str(elt) for elt in row])
-            section.append(prefix + rest)
+            first_idx = idx if include_idx else None
+            fh.write(_format_array(row[np.newaxis], first_idx, float_format))
+
+        return
+
+    lines = []
+    for idx, row in enumerate(data, 1):
+        prefix = f"{idx}\t" if include_idx else ""
+
+        if isinstance(row, (list, tuple, np.ndarray)):
+            rest = "\t".join([_format_value(elt, float_format) for elt in row])
+        else:  # 1D data is treated as column vector, so each element is a row
+            rest = _format_value(row, float_format)
+
+        lines.append(prefix + rest + "\n")
+
+        if len(lines) == _CHUNK_SIZE:
+            fh.write("".join(lines))
+            lines = []
+
+    fh.write("".join(lines))
+
+
+def _is_bulk_formattable(data: _ArrayLike) -> bool:
+    return (
+        isinstance(data, np.ndarray)
+        and data.dtype.kind in "iuf"
+        and data.ndim in (1, 2)
+        and data.size > 0
+    )
+
+
+def _is_bulk_formattable_rows(data: _ArrayLike) -> bool:
+    return (
+        isinstance(data, list)
+        and len(data) > 0
+        and all(_is_bulk_formattable(row) and row.ndim == 1 for row in data)
+    )
+
+
+def _format_value(value, float_format: str | None) -> str:
+    if float_format is not None and isinstance(value, (float, np.floating)):
+        return float_format % value
+
+    return str(value)
+
+
+def _format_array(
+    rows: np.ndarray, first_idx: int | None, float_format: str | None
+) -> str:
+    """
+    Formats the given two-dimensional numeric array as tab-separated lines,
+    optionally prefixed by row indices starting at ``first_idx``. The output
+    is the same as formatting each value with ``str`` (or with the float
+    format), but integers and integral floats are formatted in bulk.
+    """
+    idcs = None
+    if first_idx is not None:
+        idcs = np.arange(first_idx, first_idx + len(rows))
+
+    if rows.dtype.kind in "iu" or _is_integral(rows, float_format):
+        suffix = ".0" if rows.dtype.kind == "f" else ""
+        return _format_integers(rows, idcs, suffix)
+
+    if float_format is not None:
+        row_format = "\t".join([float_format] * rows.shape[1])
+        formatted = [row_format % tuple(row) for row in rows.tolist()]
+    elif rows.dtype == np.float64:
+        # Python floats are formatted the same as float64, but faster.
+        formatted = ["\t".join(map(str, row)) for row in rows.tolist()]
+    else:
+        formatted = ["\t".join(map(str, row)) for row in rows]
+
+    if idcs is not None:
+        formatted = [f"{idx}\t{row}" for idx, row in zip(idcs, formatted)]
+
+    return "\n".join(formatted) + "\n"
+
+
+def _is_integral(rows: np.ndarray, float_format: str | None) -> bool:
+    """
+    Checks if the floats are integral values that ``str`` formats as
+    "{integer}.0", rather than in scientific notation.
+    """
+    if float_format is not None or rows.dtype.type not in _INTEGRAL_LIMITS:
+        return False
+
+    limit = _INTEGRAL_LIMITS[rows.dtype.type]
+    with np.errstate(invalid="ignore"):
+        return bool(((np.abs(rows) < limit) & (rows == np.trunc(rows))).all())
+
+
+def _format_integers(
+    rows: np.ndarray, idcs: np.ndarray | None, suffix: str
+) -> str:
+    """
+    Formats the given two-dimensional array of integral values as lines of
+    tab-separated integers, each followed by the given suffix, optionally
+    prefixed by the given indices. The characters are computed digit by digit
+    for all values at once, which avoids formatting each value separately.
+    """
+    neg = np.signbit(rows)
+    if rows.dtype.kind == "f":
+        mag = np.abs(rows).astype(np.uint64)
+    else:  # two's complement negation also handles the minimum int64 value
+        mag = rows.astype(np.uint64)
+        np.negative(mag, out=mag, where=neg)
+
+    suffixes = np.full(rows.shape, len(suffix))
+
+    if idcs is not None:
+        mag = np.column_stack([idcs.astype(np.uint64), mag])
+        neg = np.column_stack([np.zeros(len(idcs), dtype=bool), neg])
+        suffixes = np.column_stack([np.zeros(len(idcs), dtype=int), suffixes])
+
+    num_digits = 1 + np.searchsorted(_POWERS_OF_TEN[1:], mag, side="right")
+    lengths = neg + num_digits + suffixes + 1  # one separator after each value
+    ends = np.cumsum(lengths.ravel())  # positions after each separator
+
+    buffer = np.empty(ends[-1], dtype=np.uint8)
+    seps = np.full(mag.shape, ord("\t"), dtype=np.uint8)
+    seps[:, -1] = ord("\n")
+    buffer[ends - 1] = seps.ravel()
+
+    mag, neg, num_digits = mag.ravel(), neg.ravel(), num_digits.ravel()
+    digit_ends = ends - 1 - suffixes.ravel()  # position after the last digit
+    buffer[(digit_ends - num_digits - 1)[neg]] = ord("-")
 
-    return "\n".join(section)
+    for power, ten_power in enumerate(_POWERS_OF_TEN[: num_digits.max()]):
+        mask = num_digits > power
+        digits = (mag[mask] // ten_power) % 10
+        buffer[digit_ends[mask] - 1 - power] = digits + ord("0")
 
+    has_suffix = suffixes.ravel() > 0
+    for offset, char in enumerate(suffix):
+        buffer[(digit_ends + offset)[has_suffix]] = ord(char)
 
-def _is_one_dimensional(data: _ArrayLike) -> bool:
-    return all(not isinstance(elt, (list, tuple, np.ndarray)) for elt in data)
+    return buffer.tobytes().decode("ascii")
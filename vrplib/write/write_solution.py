@@ -1,10 +1,13 @@
 import os
 from typing import Any
 
+from vrplib.compression import open_text
+from vrplib.parse.compact_routes import CompactRoutes
+
 
 def write_solution(
     path: str | os.PathLike,
-    routes: list[list[int]],
+    routes: list[list[int]] | CompactRoutes,
     data: dict[str, Any] | None = None,
 ):
     """
@@ -13,19 +16,23 @@ def write_solution(
     Parameters
     ----------
     path
-        The file path.
+        The file path. The file is compressed if the path has a ".gz", ".bz2",
+        ".xz" or ".lzma" extension.
     routes
         A list of routes, each route denoting the order in which the customers
-        are visited.
+        are visited, or ``CompactRoutes``.
     data
         Optional data dictionary. Each key-value pair is written to the
         solution file as "{key}: {value}".
     """
+    if isinstance(routes, CompactRoutes):
+        routes = routes.tolist()
+
     for route in routes:
         if len(route) == 0:
             raise ValueError("Empty route in solution.")
 
-    with open(path, "w") as fi:
+    with open_text(path, "w") as fi:
         for idx, route in enumerate(routes, 1):
             text = " ".join([f"Route #{idx}:"] + [str(val) for val in route])
             fi.write(text + "\n")